@@ -0,0 +1,49 @@
+"""add article search vector
+
+Revision ID: 32acdc7d11f9
+Revises: c2fc40a51333
+Create Date: 2026-10-18 19:07:58.691794
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "32acdc7d11f9"
+down_revision: Union[str, None] = "c2fc40a51333"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Names are not stemmed ('simple'), a match on the first name ranks above
+    # one on the last name. Adding a stored column rewrites the table once.
+    op.execute(
+        "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(first_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(last_name, '')), 'B')"
+        ") STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_articles_search_vector",
+            "articles",
+            ["search_vector"],
+            postgresql_using="gin",
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_articles_search_vector",
+            table_name="articles",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+    op.drop_column("articles", "search_vector")
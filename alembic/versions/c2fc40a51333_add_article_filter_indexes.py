@@ -0,0 +1,48 @@
+"""add article filter indexes
+
+Revision ID: c2fc40a51333
+Revises: 24fcd4d656d6
+Create Date: 2026-10-18 19:06:53.870923
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c2fc40a51333"
+down_revision: Union[str, None] = "24fcd4d656d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same columns as the sort keys in app.util.article_query, the trailing id
+# lets keyset pagination continue inside the index
+ARTICLE_INDEXES = {
+    "ix_articles_price_id": ["price", "id"],
+    "ix_articles_last_name_first_name_id": ["last_name", "first_name", "id"],
+}
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, columns in ARTICLE_INDEXES.items():
+            op.create_index(
+                name,
+                "articles",
+                columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in ARTICLE_INDEXES:
+            op.drop_index(
+                name,
+                table_name="articles",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
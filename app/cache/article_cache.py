@@ -0,0 +1,223 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from app.models.dao.article_model_dao import ArticleModelDAO
+from app.models.stats.cache_stats_model import CacheStatsModel
+
+CACHE_CONFIG = {
+    "enabled": True,
+    "max_size": 10000,
+    "ttl": 60.0,
+}
+
+
+class InvalidationLog:
+    # Numbers invalidations so a read can tell whether its id was written while
+    # it loaded. Only the last max_size ids are remembered, a read that began
+    # before the oldest of them counts as outdated for every other id too
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._floor = 0
+        self._ids: OrderedDict[int, int] = OrderedDict()
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def invalidate(self, id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._ids[id] = self._generation
+            self._ids.move_to_end(id)
+            while len(self._ids) > self.max_size:
+                _, self._floor = self._ids.popitem(last=False)
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            self._ids.clear()
+
+    def changed_since(self, id: int, generation: int) -> bool:
+        with self._lock:
+            return self._ids.get(id, self._floor) > generation
+
+
+class ArticleCache(ABC):
+    @abstractmethod
+    def get(self, id: int) -> ArticleModelDAO | None:
+        pass
+
+    # Take the generation before reading the row and pass it to set, the row
+    # is then not cached if the id was invalidated in between
+    @abstractmethod
+    def generation(self) -> int:
+        pass
+
+    @abstractmethod
+    def set(
+        self, id: int, article: ArticleModelDAO, generation: int | None = None
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, id: int) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStatsModel:
+        pass
+
+
+class InMemoryArticleCache(ArticleCache):
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("Cache max_size must be at least 1")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[ArticleModelDAO, float]] = OrderedDict()
+        self._invalidations = InvalidationLog(max_size)
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, id: int) -> ArticleModelDAO | None:
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            article, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[id]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(id)
+            self._hits += 1
+            return article
+
+    def generation(self) -> int:
+        return self._invalidations.generation()
+
+    def set(
+        self, id: int, article: ArticleModelDAO, generation: int | None = None
+    ) -> None:
+        with self._lock:
+            if generation is not None and self._invalidations.changed_since(
+                id, generation
+            ):
+                return
+            self._entries[id] = (article, self._clock() + self.ttl)
+            self._entries.move_to_end(id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, id: int) -> None:
+        with self._lock:
+            self._entries.pop(id, None)
+            self._invalidations.invalidate(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidations.invalidate_all()
+
+    def stats(self) -> CacheStatsModel:
+        with self._lock:
+            return CacheStatsModel(
+                backend="memory",
+                size=len(self._entries),
+                max_size=self.max_size,
+                ttl=self.ttl,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+
+class RedisArticleCache(ArticleCache):
+    # Works with any client exposing the redis-py get/set/delete/scan_iter calls;
+    # size bounds and LRU eviction are left to the server's maxmemory policy.
+    def __init__(self, client, ttl: float = 60.0, prefix: str = "pyshop:article:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        # Only orders reads against writes of this process, other workers
+        # invalidate through the server alone
+        self._invalidations = InvalidationLog()
+
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, id: int) -> ArticleModelDAO | None:
+        payload = self.client.get(self._key(id))
+        if payload is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return ArticleModelDAO.model_validate_json(payload)
+
+    def generation(self) -> int:
+        return self._invalidations.generation()
+
+    def set(
+        self, id: int, article: ArticleModelDAO, generation: int | None = None
+    ) -> None:
+        if generation is not None and self._invalidations.changed_since(id, generation):
+            return
+        self.client.set(
+            self._key(id), article.model_dump_json(), px=int(self.ttl * 1000)
+        )
+        # An invalidation between the check and the write would be lost
+        if generation is not None and self._invalidations.changed_since(id, generation):
+            self.client.delete(self._key(id))
+
+    def delete(self, id: int) -> None:
+        self._invalidations.invalidate(id)
+        self.client.delete(self._key(id))
+
+    def clear(self) -> None:
+        self._invalidations.invalidate_all()
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> CacheStatsModel:
+        return CacheStatsModel(
+            backend="redis",
+            ttl=self.ttl,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=0,
+            expirations=0,
+        )
+
+    def _key(self, id: int) -> str:
+        return f"{self.prefix}{id}"
+
+
+def create_article_cache() -> ArticleCache | None:
+    if not CACHE_CONFIG["enabled"]:
+        return None
+    return InMemoryArticleCache(
+        max_size=CACHE_CONFIG["max_size"], ttl=CACHE_CONFIG["ttl"]
+    )
@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+
+
+class CompressedBodyCache:
+    # Compressed bodies by (ETag, encoding). The ETag hashes the uncompressed
+    # body, so an entry never goes stale, it is only evicted for space
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, etag: str, encoding: str) -> bytes | None:
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((etag, encoding))
+            self.hits += 1
+            return body
+
+    def set(self, etag: str, encoding: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop((etag, encoding), None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[(etag, encoding)] = body
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
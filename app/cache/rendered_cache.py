@@ -0,0 +1,26 @@
+import threading
+from collections import OrderedDict
+
+
+class RenderedResponseCache:
+    # Remembers the encoded body and ETag of an object by identity, so an object
+    # served again from the article cache is not re-serialized or re-hashed.
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key, source) -> tuple[bytes, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not source:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key, source, body: bytes, etag: str) -> None:
+        with self._lock:
+            self._entries[key] = (source, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from app.models.stats.single_flight_stats_model import SingleFlightStatsModel
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    # Concurrent calls with the same key wait for the one already running and
+    # share its result or exception, so a burst of identical reads costs one query
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+        self._requests = 0
+        self._executions = 0
+        self._collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                self._collapsed += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> SingleFlightStatsModel:
+        with self._lock:
+            return SingleFlightStatsModel(
+                requests=self._requests,
+                executions=self._executions,
+                collapsed=self._collapsed,
+                in_flight=len(self._calls),
+            )
+
+
+class AsyncSingleFlight:
+    # The shared call runs as its own task: a caller that gets cancelled, e.g.
+    # by a client disconnect, does not cancel the query the others wait for
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+        self._requests = 0
+        self._executions = 0
+        self._collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args) -> T:
+        self._requests += 1
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+            self._executions += 1
+        else:
+            self._collapsed += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> SingleFlightStatsModel:
+        return SingleFlightStatsModel(
+            requests=self._requests,
+            executions=self._executions,
+            collapsed=self._collapsed,
+            in_flight=len(self._calls),
+        )
@@ -0,0 +1,100 @@
+import argparse
+import sys
+
+from app.database.db_connection import close_pool, create_pool
+from app.services.catalog_service import CatalogService
+from app.util.catalog import (
+    CATALOG_FORMATS,
+    CatalogFormatError,
+    decode_lines,
+    detect_catalog_format,
+    parse_export_columns,
+)
+
+
+def import_command(args: argparse.Namespace) -> int:
+    format = detect_catalog_format(args.format, args.path)
+    pool = create_pool()
+    try:
+        with open(args.path, "rb") as file:
+            result = CatalogService(pool).import_articles(decode_lines(file), format)
+    finally:
+        close_pool(pool)
+
+    print(
+        f"Imported {result.inserted + result.updated} of {result.rows_read} rows "
+        f"({result.inserted} inserted, {result.updated} updated, "
+        f"{result.rows_rejected} rejected) in {result.seconds:.2f}s, "
+        f"{result.rows_read / result.seconds:.0f} rows/s"
+    )
+    for error in result.errors:
+        print(f"line {error.line}: {error.error}", file=sys.stderr)
+    return 0
+
+
+def export_command(args: argparse.Namespace) -> int:
+    columns = parse_export_columns(args.columns)
+    pool = create_pool()
+    try:
+        if args.path == "-":
+            CatalogService(pool).export_articles(
+                sys.stdout.buffer,
+                columns,
+                args.min_price,
+                args.max_price,
+                args.min_id,
+                args.max_id,
+            )
+        else:
+            with open(args.path, "wb") as file:
+                CatalogService(pool).export_articles(
+                    file,
+                    columns,
+                    args.min_price,
+                    args.max_price,
+                    args.min_id,
+                    args.max_id,
+                )
+    finally:
+        close_pool(pool)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import", help="Import a CSV or NDJSON catalog into the articles table"
+    )
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=CATALOG_FORMATS)
+    import_parser.set_defaults(run=import_command)
+
+    export_parser = commands.add_parser(
+        "export", help="Export the articles table as CSV, - writes to stdout"
+    )
+    export_parser.add_argument("path")
+    export_parser.add_argument(
+        "--columns", help="Comma separated subset of the article fields"
+    )
+    export_parser.add_argument("--min-price", type=float)
+    export_parser.add_argument("--max-price", type=float)
+    export_parser.add_argument("--min-id", type=int)
+    export_parser.add_argument("--max-id", type=int)
+    export_parser.set_defaults(run=export_command)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except CatalogFormatError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
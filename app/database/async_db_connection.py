@@ -0,0 +1,47 @@
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+
+from app.database.db_connection import DATABASE_CONFIG, POOL_CONFIG
+from app.database.query_log import InstrumentedAsyncCursor
+from app.models.stats.pool_stats_model import PoolStatsModel
+
+
+def create_async_pool() -> AsyncConnectionPool:
+    kwargs = dict(DATABASE_CONFIG)
+    kwargs["dbname"] = kwargs.pop("database")
+    kwargs["cursor_factory"] = InstrumentedAsyncCursor
+    return AsyncConnectionPool(
+        kwargs=kwargs,
+        min_size=POOL_CONFIG["min_size"],
+        max_size=POOL_CONFIG["max_size"],
+        timeout=POOL_CONFIG["timeout"],
+        check=AsyncConnectionPool.check_connection,
+        open=False,
+    )
+
+
+async def open_async_pool(pool: AsyncConnectionPool) -> None:
+    if pool:
+        await pool.open(wait=False)
+
+
+async def close_async_pool(pool: AsyncConnectionPool) -> None:
+    if pool:
+        await pool.close()
+        logger.info("Async connection pool closed")
+
+
+def async_pool_stats(pool: AsyncConnectionPool) -> PoolStatsModel:
+    stats = pool.get_stats()
+    return PoolStatsModel(
+        min_size=stats["pool_min"],
+        max_size=stats["pool_max"],
+        size=stats["pool_size"],
+        in_use=stats["pool_size"] - stats["pool_available"],
+        idle=stats["pool_available"],
+        waiters=stats["requests_waiting"],
+        checkouts=stats.get("requests_num", 0),
+        timeouts=stats.get("requests_errors", 0),
+        discarded=stats.get("connections_lost", 0),
+        wait_time_total=stats.get("requests_wait_ms", 0) / 1000,
+    )
@@ -1,4 +1,16 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import psycopg2
+import psycopg2.extensions
+from loguru import logger
+
+from app.database.prepared_statements import PreparingConnection
+from app.database.query_log import InstrumentedCursor
+from app.models.stats.pool_stats_model import PoolStatsModel
 
 DATABASE_CONFIG = {
     "user": "python",
@@ -8,6 +20,41 @@ DATABASE_CONFIG = {
     "database": "PyShop",
 }
 
+# Streaming replicas of that database, as comma separated libpq connection
+# strings ("host=replica1 user=python password=python dbname=PyShop"). Reads
+# of the articles service are spread over them, writes go to the primary
+REPLICA_CONFIG = {
+    "dsns": [
+        dsn.strip()
+        for dsn in os.getenv("PYSHOP_REPLICA_DSNS", "").split(",")
+        if dsn.strip()
+    ],
+    # Replicas further behind than this many seconds are taken out of rotation
+    "max_lag": 5.0,
+    "check_interval": 5.0,
+    # Seconds a client reads from the primary after it wrote, 0 turns it off
+    "read_your_writes": 5.0,
+}
+
+# Every checkout checks the connection's local state, which costs no round
+# trip. Only connections idle for health_check_after seconds also get a
+# SELECT 1, so a server restart within that window is noticed by the first
+# query on a connection and not by the checkout
+POOL_CONFIG = {
+    "min_size": 2,
+    "max_size": 10,
+    "timeout": 5.0,
+    "health_check_after": 30.0,
+}
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class PoolClosedError(Exception):
+    pass
+
 
 def create_connection():
     try:
@@ -22,3 +69,223 @@ def close_connection(connection):
     if connection:
         connection.close()
         print("Connection closed")
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        min_size: int = 2,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        health_check_after: float = 30.0,
+        connect=None,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool size must satisfy 0 <= min_size <= max_size >= 1")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self._connect = connect or (
+            lambda: psycopg2.connect(
+                **DATABASE_CONFIG,
+                connection_factory=PreparingConnection,
+                cursor_factory=InstrumentedCursor,
+            )
+        )
+
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def open(self) -> None:
+        with self._condition:
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+
+        for _ in range(max(missing, 0)):
+            try:
+                connection = self._connect()
+            except Exception as e:
+                logger.error(f"Could not open pooled connection: {e}")
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                continue
+            with self._condition:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None):
+        connection = self.checkout(timeout)
+        try:
+            yield connection
+        except BaseException:
+            # Includes GeneratorExit when a streaming consumer stops early
+            self.checkin(connection, rollback=True)
+            raise
+        else:
+            self.checkin(connection)
+
+    def checkout(self, timeout: float | None = None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            connection, idle_since = self._acquire(deadline, timeout)
+            waited = time.monotonic() - started
+
+            if connection is None:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+            elif not self._is_healthy(connection, idle_since):
+                self._discard(connection)
+                continue
+
+            with self._condition:
+                self._checkouts += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            return connection
+
+    def checkin(self, connection, rollback: bool = False) -> None:
+        try:
+            if connection.closed:
+                raise psycopg2.InterfaceError("connection already closed")
+            status = connection.get_transaction_status()
+            if rollback or status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Exception as e:
+            logger.warning(f"Discarding broken pooled connection: {e}")
+            self._discard(connection, in_use=True)
+            return
+
+        with self._condition:
+            self._in_use -= 1
+            if self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+        if self._closed:
+            self._close_quietly(connection)
+
+    def stats(self) -> PoolStatsModel:
+        with self._condition:
+            return PoolStatsModel(
+                min_size=self.min_size,
+                max_size=self.max_size,
+                size=self._size,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                waiters=self._waiters,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                discarded=self._discarded,
+                wait_time_total=self._wait_time_total,
+                wait_time_max=self._wait_time_max,
+            )
+
+    def _acquire(self, deadline: float, timeout: float):
+        with self._condition:
+            self._waiters += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError("Connection pool is closed")
+                    if self._idle:
+                        connection, idle_since = self._idle.pop()
+                        self._in_use += 1
+                        return connection, idle_since
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._in_use += 1
+                        return None, None
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Timed out waiting for a connection after {timeout}s"
+                        )
+                    self._condition.wait(remaining)
+            finally:
+                self._waiters -= 1
+
+    def _is_healthy(self, connection, idle_since: float) -> bool:
+        if connection.closed:
+            return False
+        # libpq reports UNKNOWN once it saw the connection break, an idle
+        # pooled connection is never inside a transaction
+        status = connection.get_transaction_status()
+        if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            logger.warning(f"Pooled connection has transaction status {status}")
+            return False
+        if time.monotonic() - idle_since < self.health_check_after:
+            return True
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            connection.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            return False
+
+    def _discard(self, connection, in_use: bool = True) -> None:
+        with self._condition:
+            self._discarded += 1
+        self._close_quietly(connection)
+        self._release_slot(in_use)
+
+    def _release_slot(self, in_use: bool = True) -> None:
+        with self._condition:
+            self._size -= 1
+            if in_use:
+                self._in_use -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close_quietly(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def create_pool() -> ConnectionPool:
+    return ConnectionPool(**POOL_CONFIG)
+
+
+def close_pool(pool: ConnectionPool) -> None:
+    if pool:
+        pool.close()
+        logger.info("Connection pool closed")
@@ -0,0 +1,242 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+
+from loguru import logger
+
+from app.database.prepared_statements import execute_prepared, execute_prepared_async
+from app.models.stats.group_commit_stats_model import GroupCommitStatsModel
+
+# Opt-in: writes wait up to max_wait seconds for others to share their commit
+GROUP_COMMIT_CONFIG = {
+    "enabled": os.getenv("PYSHOP_GROUP_COMMIT", "off") == "on",
+    "max_batch": 64,
+    "max_wait": 0.005,
+}
+
+
+class GroupCommitClosedError(Exception):
+    pass
+
+
+class _Write:
+    def __init__(self, name: str, params: tuple):
+        self.name = name
+        self.params = params
+        self.done = threading.Event()
+        self.row = None
+        self.error: Exception | None = None
+
+
+class _GroupCommitStats:
+    def __init__(self, max_batch: int, max_wait: float):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.writes = 0
+        self.failed = 0
+        self.largest_batch = 0
+        self.commit_time_total = 0.0
+
+    def record(self, size: int, failed: int, elapsed: float) -> None:
+        self.batches += 1
+        self.writes += size
+        self.failed += failed
+        self.largest_batch = max(self.largest_batch, size)
+        self.commit_time_total += elapsed
+
+    def model(self, pending: int) -> GroupCommitStatsModel:
+        return GroupCommitStatsModel(
+            max_batch=self.max_batch,
+            max_wait=self.max_wait,
+            batches=self.batches,
+            writes=self.writes,
+            failed=self.failed,
+            pending=pending,
+            largest_batch=self.largest_batch,
+            average_batch=self.writes / self.batches if self.batches else 0.0,
+            commit_time_total=self.commit_time_total,
+        )
+
+
+class GroupCommitWriter:
+    # Collects prepared writes from many threads and runs them on one
+    # connection in one transaction, each inside its own savepoint so a
+    # rejected write only fails its own caller
+    _STOP = object()
+
+    def __init__(self, pool, max_batch: int = 64, max_wait: float = 0.005):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = _GroupCommitStats(max_batch, max_wait)
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="group-commit", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, name: str, params: tuple):
+        if self._closed:
+            raise GroupCommitClosedError("Group commit writer is closed")
+        write = _Write(name, params)
+        self._queue.put(write)
+        write.done.wait()
+        if write.error is not None:
+            raise write.error
+        return write.row
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def stats(self) -> GroupCommitStatsModel:
+        with self._lock:
+            return self._stats.model(self._queue.qsize())
+
+    def _run(self) -> None:
+        while True:
+            write = self._queue.get()
+            if write is self._STOP:
+                return
+
+            batch, stopping = [write], False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    write = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if write is self._STOP:
+                    stopping = True
+                    break
+                batch.append(write)
+
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: list[_Write]) -> None:
+        started = time.monotonic()
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                for write in batch:
+                    cursor.execute("SAVEPOINT group_write")
+                    try:
+                        execute_prepared(cursor, write.name, write.params)
+                        write.row = cursor.fetchone()
+                        cursor.execute("RELEASE SAVEPOINT group_write")
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT group_write")
+                        write.error = e
+                connection.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            for write in batch:
+                write.error = e
+
+        with self._lock:
+            self._stats.record(
+                len(batch),
+                sum(1 for write in batch if write.error is not None),
+                time.monotonic() - started,
+            )
+        for write in batch:
+            write.done.set()
+
+
+class AsyncGroupCommitWriter:
+    # The first write of a batch starts a max_wait timer, a full batch is
+    # committed right away. Batches commit concurrently on their own connections
+    def __init__(self, pool, max_batch: int = 64, max_wait: float = 0.005):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: list[tuple[str, tuple, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._commits: set[asyncio.Task] = set()
+        self._stats = _GroupCommitStats(max_batch, max_wait)
+        self._closed = False
+
+    async def submit(self, name: str, params: tuple):
+        if self._closed:
+            raise GroupCommitClosedError("Group commit writer is closed")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((name, params, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def close(self) -> None:
+        self._closed = True
+        self._flush()
+        if self._commits:
+            await asyncio.gather(*self._commits)
+
+    def stats(self) -> GroupCommitStatsModel:
+        return self._stats.model(len(self._pending))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._commit(batch))
+            self._commits.add(task)
+            task.add_done_callback(self._commits.discard)
+
+    async def _commit(self, batch: list[tuple[str, tuple, asyncio.Future]]) -> None:
+        started = time.monotonic()
+        results = []
+        try:
+            async with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                for name, params, _ in batch:
+                    await cursor.execute("SAVEPOINT group_write")
+                    try:
+                        await execute_prepared_async(cursor, name, params)
+                        results.append((await cursor.fetchone(), None))
+                        await cursor.execute("RELEASE SAVEPOINT group_write")
+                    except Exception as e:
+                        await cursor.execute("ROLLBACK TO SAVEPOINT group_write")
+                        results.append((None, e))
+                await connection.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            results = [(None, e)] * len(batch)
+
+        self._stats.record(
+            len(batch),
+            sum(1 for _, error in results if error is not None),
+            time.monotonic() - started,
+        )
+        for (_, _, future), (row, error) in zip(batch, results):
+            # The caller may have been cancelled meanwhile
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(row)
+
+
+def create_group_commit_writer(pool, asynchronous: bool = False):
+    if not GROUP_COMMIT_CONFIG["enabled"]:
+        return None
+    writer = AsyncGroupCommitWriter if asynchronous else GroupCommitWriter
+    return writer(
+        pool,
+        max_batch=GROUP_COMMIT_CONFIG["max_batch"],
+        max_wait=GROUP_COMMIT_CONFIG["max_wait"],
+    )
@@ -0,0 +1,125 @@
+import re
+import threading
+import weakref
+
+import psycopg
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+from loguru import logger
+
+ARTICLE_SELECT = "SELECT id, imageUrl, first_name, last_name, price FROM articles"
+ARTICLE_RETURNING = "RETURNING id, imageUrl, first_name, last_name, price"
+
+# Statements are written with $n placeholders for PREPARE, in parameter order,
+# so the plain %s form for connections without a statement cache is derived
+ARTICLE_STATEMENTS = {
+    "article_exists": "SELECT 1 FROM articles WHERE id = $1",
+    "article_get": f"{ARTICLE_SELECT} WHERE id = $1",
+    "article_get_many": f"{ARTICLE_SELECT} WHERE id = ANY($1)",
+    "article_list": f"{ARTICLE_SELECT} WHERE id > $1 ORDER BY id LIMIT $2",
+    "article_list_all": f"{ARTICLE_SELECT} ORDER BY id",
+    "article_insert": "INSERT INTO articles (first_name, last_name, imageUrl, price) "
+    f"VALUES ($1, $2, $3, $4) {ARTICLE_RETURNING}",
+    "article_update": "UPDATE articles SET first_name = $1, last_name = $2, imageUrl = $3, price = $4 "
+    f"WHERE id = $5 {ARTICLE_RETURNING}",
+    "article_delete": f"DELETE FROM articles WHERE id = $1 {ARTICLE_RETURNING}",
+}
+
+PLAIN_STATEMENTS = {
+    name: re.sub(r"\$\d+", "%s", sql) for name, sql in ARTICLE_STATEMENTS.items()
+}
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def invalidate_prepared_statements() -> int:
+    # Connections drop their prepared statements before the next use, e.g.
+    # after a migration changed the tables they were planned against
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        logger.info(f"Prepared statements invalidated (generation {_generation})")
+        return _generation
+
+
+def prepared_generation() -> int:
+    return _generation
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+        self.prepared_generation = _generation
+
+
+def execute_prepared(cursor, name: str, params: tuple = ()) -> None:
+    connection = cursor.connection
+    if not isinstance(connection, PreparingConnection):
+        cursor.execute(PLAIN_STATEMENTS[name], params or None)
+        return
+
+    # Only a statement that opened the transaction can be rolled back and
+    # retried. Checked before DEALLOCATE ALL, which opens one itself
+    retry = (
+        connection.get_transaction_status()
+        == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    )
+    if connection.prepared_generation != _generation:
+        cursor.execute("DEALLOCATE ALL")
+        connection.prepared.clear()
+        connection.prepared_generation = _generation
+    try:
+        _execute(cursor, connection, name, params)
+    except psycopg2.errors.FeatureNotSupported as e:
+        # "cached plan must not change result type": the table changed since
+        # the statement was prepared, prepare it again
+        if not retry:
+            # The caller's transaction is aborted and fails, e.g. a group
+            # commit savepoint. The statement is dropped by the DEALLOCATE ALL
+            # of the next use, once the transaction is over
+            connection.prepared.discard(name)
+            connection.prepared_generation = -1
+            raise e
+        logger.warning(f"Re-preparing {name}: {e}")
+        connection.rollback()
+        cursor.execute(f"DEALLOCATE {name}")
+        connection.prepared.discard(name)
+        _execute(cursor, connection, name, params)
+
+
+def _execute(cursor, connection: PreparingConnection, name: str, params: tuple):
+    if name not in connection.prepared:
+        cursor.execute(f"PREPARE {name} AS {ARTICLE_STATEMENTS[name]}")
+        connection.prepared.add(name)
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cursor.execute(f"EXECUTE {name}({placeholders})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
+
+
+# psycopg 3 prepares statements itself when asked to and forgets them on
+# DEALLOCATE ALL, only the invalidation generation is tracked per connection
+_async_generations = weakref.WeakKeyDictionary()
+
+
+async def execute_prepared_async(cursor, name: str, params: tuple = ()) -> None:
+    connection = cursor.connection
+    retry = connection.info.transaction_status == psycopg.pq.TransactionStatus.IDLE
+    if _async_generations.get(connection, _generation) != _generation:
+        await cursor.execute("DEALLOCATE ALL")
+    _async_generations[connection] = _generation
+
+    try:
+        await cursor.execute(PLAIN_STATEMENTS[name], params or None, prepare=True)
+    except psycopg.errors.FeatureNotSupported as e:
+        if not retry:
+            _async_generations[connection] = -1
+            raise e
+        logger.warning(f"Re-preparing {name}: {e}")
+        await connection.rollback()
+        await cursor.execute("DEALLOCATE ALL")
+        await cursor.execute(PLAIN_STATEMENTS[name], params or None, prepare=True)
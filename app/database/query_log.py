@@ -0,0 +1,257 @@
+import functools
+import heapq
+import itertools
+import re
+import threading
+import time
+
+import psycopg
+import psycopg2
+import psycopg2.extensions
+from loguru import logger
+
+from app.database.prepared_statements import ARTICLE_STATEMENTS
+from app.models.stats.query_log_model import (
+    QueryLogModel,
+    SlowQueryModel,
+    StatementStatsModel,
+)
+from app.util.metrics import METRICS, Histogram
+
+QUERY_LOG_CONFIG = {
+    "slow_threshold": 0.1,
+    # EXPLAIN ANALYZE runs the statement again, at most once per interval
+    "explain_interval": 10.0,
+    "top_n": 20,
+    "max_statements": 1000,
+}
+
+DB_QUERY_DURATION = METRICS.register(
+    Histogram(
+        "pyshop_db_query_duration_seconds",
+        "Time of single cursor.execute calls by statement kind",
+        ("kind",),
+    )
+)
+
+_WRITES = ("INSERT", "UPDATE", "DELETE", "MERGE", "COPY")
+_WRITE_KEYWORDS = re.compile(rf"\b({'|'.join(_WRITES)})\b", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def statement_kind(statement: str) -> str:
+    # "read" statements are safe to run again under EXPLAIN ANALYZE, "other"
+    # covers PREPARE, SAVEPOINT and the like
+    words = statement.split(None, 2)
+    first = words[0].upper() if words else ""
+    if first == "EXECUTE" and len(words) > 1:
+        prepared = ARTICLE_STATEMENTS.get(words[1].split("(")[0], "")
+        if not prepared:
+            return "other"
+        return statement_kind(prepared)
+    if first in ("SELECT", "WITH"):
+        return "write" if _WRITE_KEYWORDS.search(statement) else "read"
+    if first in _WRITES:
+        return "write"
+    return "other"
+
+
+class QueryLog:
+    def __init__(
+        self,
+        slow_threshold: float = 0.1,
+        explain_interval: float = 10.0,
+        top_n: int = 20,
+        max_statements: int = 1000,
+        clock=time.monotonic,
+    ):
+        self.slow_threshold = slow_threshold
+        self.explain_interval = explain_interval
+        self.top_n = top_n
+        self.max_statements = max_statements
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # statement -> [calls, total time, max time, rows]
+        self._statements: dict[str, list] = {}
+        self._slowest: list[tuple[float, int, SlowQueryModel]] = []
+        self._sequence = itertools.count()
+        self._slow_queries = 0
+        self._last_explain: float | None = None
+
+    def record(
+        self, statement: str, duration: float, rows: int, explainable: bool = False
+    ) -> tuple[bool, bool]:
+        # Returns whether the statement was slow and whether to capture its plan
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None and len(self._statements) < self.max_statements:
+                stats = self._statements[statement] = [0, 0.0, 0.0, 0]
+            if stats is not None:
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] = max(stats[2], duration)
+                stats[3] += max(rows, 0)
+
+            if duration < self.slow_threshold:
+                return False, False
+            self._slow_queries += 1
+            now = self._clock()
+            explain = explainable and (
+                self._last_explain is None
+                or now - self._last_explain >= self.explain_interval
+            )
+            if explain:
+                self._last_explain = now
+            return True, explain
+
+    def slow(
+        self, statement: str, duration: float, rows: int, plan: str | None = None
+    ) -> None:
+        logger.warning(
+            f"Slow query ({duration * 1000:.1f} ms, {rows} rows): {statement}"
+            + (f"\n{plan}" if plan else "")
+        )
+        entry = SlowQueryModel(
+            statement=statement,
+            duration=duration,
+            rows=rows,
+            executed_at=time.time(),
+            plan=plan,
+        )
+        with self._lock:
+            item = (duration, next(self._sequence), entry)
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, item)
+            else:
+                heapq.heappushpop(self._slowest, item)
+
+    def stats(self, limit: int | None = None) -> QueryLogModel:
+        limit = limit or self.top_n
+        with self._lock:
+            slowest = sorted(self._slowest, reverse=True)[:limit]
+            statements = sorted(
+                self._statements.items(), key=lambda item: item[1][1], reverse=True
+            )[:limit]
+            return QueryLogModel(
+                slow_threshold=self.slow_threshold,
+                slow_queries=self._slow_queries,
+                slowest=[entry for _, _, entry in slowest],
+                statements=[
+                    StatementStatsModel(
+                        statement=statement,
+                        calls=calls,
+                        total_time=total_time,
+                        max_time=max_time,
+                        rows=rows,
+                    )
+                    for statement, (calls, total_time, max_time, rows) in statements
+                ],
+            )
+
+
+QUERY_LOG = QueryLog(
+    slow_threshold=QUERY_LOG_CONFIG["slow_threshold"],
+    explain_interval=QUERY_LOG_CONFIG["explain_interval"],
+    top_n=QUERY_LOG_CONFIG["top_n"],
+    max_statements=QUERY_LOG_CONFIG["max_statements"],
+)
+
+
+def _statement_text(query) -> str | None:
+    # Composed statements and the pool's empty health checks are not recorded
+    if isinstance(query, bytes):
+        query = query.decode(errors="replace")
+    if isinstance(query, str):
+        return query.strip() or None
+    return None
+
+
+def _plan_text(rows: list[tuple]) -> str:
+    # A SQL_ASCII database hands text to psycopg 3 as bytes
+    return "\n".join(
+        row[0].decode(errors="replace") if isinstance(row[0], bytes) else row[0]
+        for row in rows
+    )
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    # Default cursor of the pooled psycopg2 connections. Server-side (named)
+    # cursors only declare on execute and are left alone
+    def execute(self, query, vars=None):
+        statement = _statement_text(query)
+        if self.name is not None or statement is None:
+            return super().execute(query, vars)
+
+        started = time.perf_counter()
+        result = super().execute(query, vars)
+        duration = time.perf_counter() - started
+
+        kind = statement_kind(statement)
+        DB_QUERY_DURATION.observe((kind,), duration)
+        slow, explain = QUERY_LOG.record(
+            statement, duration, self.rowcount, kind == "read"
+        )
+        if slow:
+            plan = self._explain() if explain else None
+            QUERY_LOG.slow(statement, duration, self.rowcount, plan)
+        return result
+
+    def _explain(self) -> str | None:
+        # The rows of this cursor are already fetched to the client, a second
+        # cursor can run on the same connection. A savepoint keeps a failing
+        # EXPLAIN from aborting the caller's transaction
+        cursor = psycopg2.extensions.cursor(self.connection)
+        savepoint = not self.connection.autocommit
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT query_log_explain")
+            cursor.execute(b"EXPLAIN (ANALYZE, BUFFERS) " + self.query)
+            plan = _plan_text(cursor.fetchall())
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_log_explain")
+            return plan
+        except Exception as e:
+            # Capturing the plan must never fail the statement it explains
+            logger.warning(f"Could not explain slow query: {e}")
+            if savepoint and not self.connection.closed:
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+                except psycopg2.Error:
+                    pass
+            return None
+        finally:
+            cursor.close()
+
+
+class InstrumentedAsyncCursor(psycopg.AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        statement = _statement_text(query)
+        if statement is None:
+            return await super().execute(query, params, **kwargs)
+
+        started = time.perf_counter()
+        result = await super().execute(query, params, **kwargs)
+        duration = time.perf_counter() - started
+
+        kind = statement_kind(statement)
+        DB_QUERY_DURATION.observe((kind,), duration)
+        slow, explain = QUERY_LOG.record(
+            statement, duration, self.rowcount, kind == "read"
+        )
+        if slow:
+            plan = await self._explain(statement, params) if explain else None
+            QUERY_LOG.slow(statement, duration, self.rowcount, plan)
+        return result
+
+    async def _explain(self, statement: str, params) -> str | None:
+        cursor = psycopg.AsyncCursor(self.connection)
+        try:
+            async with self.connection.transaction():
+                await cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, params)
+                return _plan_text(await cursor.fetchall())
+        except Exception as e:
+            logger.warning(f"Could not explain slow query: {e}")
+            return None
+        finally:
+            await cursor.close()
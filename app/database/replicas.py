@@ -0,0 +1,334 @@
+import contextvars
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.extensions
+from loguru import logger
+
+from app.database.db_connection import (
+    POOL_CONFIG,
+    REPLICA_CONFIG,
+    ConnectionPool,
+    PoolTimeoutError,
+)
+from app.database.prepared_statements import PreparingConnection
+from app.database.query_log import InstrumentedCursor
+from app.models.stats.replica_stats_model import (
+    ReplicaRouterStatsModel,
+    ReplicaStatsModel,
+)
+
+# Seconds since the last replayed transaction, but 0 once the replica replayed
+# all WAL it received, so an idle primary doesn't look like lag
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+PRIMARY_COOKIE = "pyshop_primary_until"
+
+
+class ReadContext:
+    def __init__(self, pinned_until: float = 0.0):
+        self.pinned_until = pinned_until
+        self.wrote = False
+
+
+# Set per request by ReadYourWritesMiddleware, the offload threads see the
+# same object through their copy of the context
+_read_context: contextvars.ContextVar[ReadContext | None] = contextvars.ContextVar(
+    "read_context", default=None
+)
+
+
+# Set by ReplicaRouter when a replica served the read, see replica_read
+_served_by_replica: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "served_by_replica", default=False
+)
+
+
+def replica_read(fn, *args) -> tuple:
+    # Runs fn in a copy of the context and tells whether a replica answered,
+    # such rows may lag the primary and must not outlive the request
+    context = contextvars.copy_context()
+    context.run(_served_by_replica.set, False)
+    result = context.run(fn, *args)
+    return result, context[_served_by_replica]
+
+
+def note_write() -> None:
+    context = _read_context.get()
+    if context is not None:
+        context.wrote = True
+
+
+def pinned_to_primary() -> bool:
+    context = _read_context.get()
+    return context is not None and (context.wrote or context.pinned_until > time.time())
+
+
+class ReadYourWritesMiddleware:
+    # A response to a request that wrote sets a cookie with the end of the
+    # window, while the client sends it back its reads go to the primary.
+    # Unlike a per-process table this holds across workers
+    def __init__(self, app, window: float = 5.0):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # The cookie comes from the client, it never pins longer than a write would
+        context = ReadContext(
+            min(_cookie_pinned_until(scope), time.time() + self.window)
+        )
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and context.wrote:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"set-cookie", cookie.encode()),
+                    ],
+                }
+            await send(message)
+
+        token = _read_context.set(context)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _read_context.reset(token)
+
+
+def _cookie_pinned_until(scope) -> float:
+    for name, value in scope.get("headers", []):
+        if name != b"cookie":
+            continue
+        for pair in value.decode("latin-1").split(";"):
+            key, _, until = pair.strip().partition("=")
+            if key == PRIMARY_COOKIE:
+                try:
+                    return float(until)
+                except ValueError:
+                    return 0.0
+    return 0.0
+
+
+class Replica:
+    def __init__(self, name: str, pool: ConnectionPool):
+        self.name = name
+        self.pool = pool
+        # Until the first check, a replica is not trusted with reads
+        self.healthy = False
+        self.lag: float | None = None
+        self.reads = 0
+        self.failures = 0
+        self.checked_at: float | None = None
+        self.last_error: str | None = None
+
+
+class ReplicaRouter:
+    # Reads go round-robin to the replicas in rotation, the primary serves
+    # them when none is, while the client is pinned, or when a replica fails
+    def __init__(
+        self,
+        primary: ConnectionPool,
+        replicas: list[Replica],
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        read_your_writes: float = 5.0,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_your_writes = read_your_writes
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._primary_reads = 0
+        self._pinned_reads = 0
+        self._fallbacks = 0
+
+    def open(self) -> None:
+        for replica in self.replicas:
+            replica.pool.open()
+        self.check()
+        self._thread = threading.Thread(
+            target=self._check_periodically, name="replica-checks", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for replica in self.replicas:
+            replica.pool.close()
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    cursor.execute(REPLICA_LAG_QUERY)
+                    lag = float(cursor.fetchone()[0])
+            except Exception as e:
+                self._set_health(replica, False, None, str(e).strip())
+                continue
+            if lag > self.max_lag:
+                self._set_health(replica, False, lag, f"{lag:.1f}s behind the primary")
+            else:
+                self._set_health(replica, True, lag)
+
+    @contextmanager
+    def connection(self):
+        pinned = pinned_to_primary()
+        replica = None if pinned else self._next_replica()
+        fallback = False
+        if replica is not None:
+            try:
+                connection = replica.pool.checkout()
+            except PoolTimeoutError:
+                # Busy, not broken: it stays in rotation
+                replica, fallback = None, True
+            except Exception as e:
+                self._fail(replica, e)
+                replica, fallback = None, True
+
+        if replica is None:
+            with self._lock:
+                self._primary_reads += 1
+                self._pinned_reads += pinned
+                self._fallbacks += fallback
+            with self.primary.connection() as connection:
+                yield connection
+            return
+
+        _served_by_replica.set(True)
+        try:
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            replica.pool.checkin(connection, rollback=True)
+            self._fail(replica, e)
+            raise
+        except BaseException:
+            replica.pool.checkin(connection, rollback=True)
+            raise
+        else:
+            replica.pool.checkin(connection)
+
+    def stats(self) -> ReplicaRouterStatsModel:
+        with self._lock:
+            replicas = [
+                ReplicaStatsModel(
+                    name=replica.name,
+                    healthy=replica.healthy,
+                    lag=replica.lag,
+                    reads=replica.reads,
+                    failures=replica.failures,
+                    checked_at=replica.checked_at,
+                    last_error=replica.last_error,
+                )
+                for replica in self.replicas
+            ]
+            return ReplicaRouterStatsModel(
+                max_lag=self.max_lag,
+                read_your_writes=self.read_your_writes,
+                healthy=sum(replica.healthy for replica in replicas),
+                replica_reads=sum(replica.reads for replica in replicas),
+                primary_reads=self._primary_reads,
+                pinned_reads=self._pinned_reads,
+                fallbacks=self._fallbacks,
+                replicas=replicas,
+            )
+
+    def _next_replica(self) -> Replica | None:
+        with self._lock:
+            start = next(self._next)
+            for offset in range(len(self.replicas)):
+                replica = self.replicas[(start + offset) % len(self.replicas)]
+                if replica.healthy:
+                    replica.reads += 1
+                    return replica
+        return None
+
+    def _fail(self, replica: Replica, error: Exception) -> None:
+        # Out of rotation until the next check finds it healthy again
+        with self._lock:
+            replica.failures += 1
+        self._set_health(replica, False, replica.lag, str(error).strip())
+
+    def _set_health(
+        self,
+        replica: Replica,
+        healthy: bool,
+        lag: float | None,
+        error: str | None = None,
+    ) -> None:
+        with self._lock:
+            was_healthy = replica.healthy
+            replica.healthy = healthy
+            replica.lag = lag
+            replica.checked_at = time.time()
+            if error:
+                replica.last_error = error
+        if was_healthy and not healthy:
+            logger.warning(f"Replica {replica.name} out of rotation: {error}")
+        elif healthy and not was_healthy:
+            logger.info(f"Replica {replica.name} in rotation")
+
+    def _check_periodically(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+
+def replica_name(dsn: str) -> str:
+    # Host, port and database only, the DSN may hold a password
+    params = psycopg2.extensions.parse_dsn(dsn)
+    return (
+        f"{params.get('host', 'localhost')}:{params.get('port', '5432')}"
+        f"/{params.get('dbname', '')}"
+    )
+
+
+def create_replica_router(primary: ConnectionPool) -> ReplicaRouter | None:
+    if not REPLICA_CONFIG["dsns"]:
+        return None
+    replicas = [
+        Replica(
+            replica_name(dsn),
+            ConnectionPool(
+                **POOL_CONFIG,
+                connect=lambda dsn=dsn: psycopg2.connect(
+                    dsn,
+                    connection_factory=PreparingConnection,
+                    cursor_factory=InstrumentedCursor,
+                ),
+            ),
+        )
+        for dsn in REPLICA_CONFIG["dsns"]
+    ]
+    return ReplicaRouter(
+        primary,
+        replicas,
+        max_lag=REPLICA_CONFIG["max_lag"],
+        check_interval=REPLICA_CONFIG["check_interval"],
+        read_your_writes=REPLICA_CONFIG["read_your_writes"],
+    )
@@ -1,133 +1,380 @@
-import json
-
 from loguru import logger
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
-from app.models.dao.article_model_dao import ArticlesModelDAO, ArticleModelDAO
+from app.cache.rendered_cache import RenderedResponseCache
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticlesModelDAO,
+    ArticleModelDAO,
+)
 from app.models.dto.article_model_dto import (
-    ArticlesModelDTO,
+    ArticleLookupResultModelDTO,
     ArticleModelDTO,
     ArticleModelDTOEndpoint,
+    BulkArticleResultModelDTO,
+    BulkArticlesResultModelDTO,
 )
 from app.util.converter import (
-    convert_articles_model_dao_to_articles_model_dto,
     convert_article_model_dto_endpoint_to_article_model_dao,
     convert_article_model_dao_to_article_model_dto,
+    dump_article_row,
+    dump_article_rows,
+    dump_articles_page,
+    validate_article_rows,
+)
+from app.util.etag import etag_matches, make_etag
+from app.util.responses import ModelResponse, dump_model
+from app.util.article_query import (
+    ARTICLE_SORTS,
+    SEARCH_CONFIG,
+    article_sort_key,
+    build_search_terms,
 )
+from app.util.cursor import (
+    InvalidCursorError,
+    decode_article_cursor,
+    decode_keyset_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+)
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
 
 
 class ArticleHandler:
     def __init__(self, service):
         self.service = service
+        self.rendered = RenderedResponseCache()
 
-    def get_articles_handler(self) -> JSONResponse:
+    def get_articles_handler(
+        self,
+        limit: int | None = None,
+        after: str | None = None,
+        if_none_match: str | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> Response:
         try:
-            articles: ArticlesModelDAO = self.service.get_all_articles()
-
-            if articles is not None and len(articles) > 0:
-                articles: ArticlesModelDTO = (
-                    convert_articles_model_dao_to_articles_model_dto(articles)
-                )
-                return JSONResponse(
-                    content=json.loads(articles.model_dump_json()), status_code=200
+            if filters is None or filters == ArticleFilterDAO():
+                after_id = decode_article_cursor(after) if after else None
+                articles: ArticlesModelDAO = self.service.get_all_articles(
+                    self._page_size(limit), after_id
                 )
+                return self._articles_response(articles, limit, if_none_match)
 
-            logger.warning("No articles found")
-            return JSONResponse(
-                content={"message": "No articles found"}, status_code=404
+            sort_columns = ARTICLE_SORTS[filters.sort]
+            after_key = decode_keyset_cursor(after, sort_columns) if after else None
+            articles: ArticlesModelDAO = self.service.get_all_articles(
+                self._page_size(limit), after_key, filters
             )
+            return self._articles_response(articles, limit, if_none_match, filters.sort)
+
+        except InvalidCursorError as e:
+            return self._bad_request(str(e))
 
         except Exception as e:
-            logger.error(f"An error occurred while retrieving articles: {e}")
-            return JSONResponse(
-                content={"message": "Internal Server Error"}, status_code=500
+            return self._internal_server_error("retrieving articles", e)
+
+    def search_articles_handler(
+        self,
+        q: str,
+        limit: int = 20,
+        after: str | None = None,
+        if_none_match: str | None = None,
+    ) -> Response:
+        try:
+            terms = build_search_terms(q)
+            if terms is None:
+                return self._bad_request("Search query has no words")
+
+            offset = decode_offset_cursor(after) if after else 0
+            limit = max(min(limit, SEARCH_CONFIG["max_results"] - offset), 0)
+            articles: ArticlesModelDAO = (
+                self.service.search_articles(terms, self._page_size(limit), offset)
+                if limit > 0
+                else []
             )
+            return self._search_response(articles, limit, offset, if_none_match)
+
+        except InvalidCursorError as e:
+            return self._bad_request(str(e))
+
+        except Exception as e:
+            return self._internal_server_error("searching articles", e)
+
+    def stream_articles_handler(self, format: str = "ndjson") -> StreamingResponse:
+        try:
+            batches = self.service.iter_articles()
+            first_batch = next(batches, None)
+        except Exception as e:
+            return self._internal_server_error("streaming articles", e)
+
+        def body():
+            yield self._stream_start(format)
+            if first_batch is not None:
+                yield self._encode_batch(first_batch, format, first=True)
+                try:
+                    for batch in batches:
+                        yield self._encode_batch(batch, format, first=False)
+                except Exception as e:
+                    logger.error(f"An error occurred while streaming articles: {e}")
+                    raise
+            yield self._stream_end(format)
 
-    def get_article_handler(self, id: int) -> JSONResponse:
+        return StreamingResponse(body(), media_type=STREAM_MEDIA_TYPES[format])
+
+    def get_article_handler(
+        self, id: int, if_none_match: str | None = None
+    ) -> Response:
         try:
             article: ArticleModelDAO = self.service.get_article(id)
-            if article is not None:
-                article: ArticleModelDTO = (
-                    convert_article_model_dao_to_article_model_dto(article)
-                )
-                return JSONResponse(
-                    content=json.loads(article.model_dump_json()), status_code=200
-                )
+            return self._article_response(article, if_none_match)
 
-            logger.warning("Article not found")
-            return JSONResponse(
-                content={"message": "Article not found"}, status_code=404
-            )
+        except Exception as e:
+            return self._internal_server_error("retrieving article", e)
+
+    def lookup_articles_handler(self, ids: list[int]) -> Response:
+        try:
+            # Duplicates are looked up and returned once, in first requested order
+            ids = list(dict.fromkeys(ids))
+            articles: dict[int, ArticleModelDAO] = self.service.get_articles(ids)
+            return self._lookup_response(ids, articles)
 
         except Exception as e:
-            logger.error(f"An error occurred while retrieving article: {e}")
-            return JSONResponse(
-                content={"message": "Internal Server Error"}, status_code=500
-            )
+            return self._internal_server_error("looking up articles", e)
 
-    def create_article_handler(self, article: ArticleModelDTOEndpoint) -> JSONResponse:
+    def create_article_handler(self, article: ArticleModelDTOEndpoint) -> Response:
         try:
-            if (
-                article.first_name is not None
-                and article.last_name is not None
-                and article.price is not None
-            ):
-                self.service.create_article(
+            if self._is_complete(article):
+                stored: ArticleModelDAO = self.service.create_article(
                     convert_article_model_dto_endpoint_to_article_model_dao(article)
                 )
-                return JSONResponse(
-                    content=json.loads(article.model_dump_json()), status_code=200
-                )
+                return self._stored_article_response(stored)
 
-            logger.warning("Bad Request")
-            return JSONResponse(content={"message": "Bad Request"}, status_code=400)
+            return self._bad_request()
 
         except Exception as e:
-            logger.error(f"An error occurred while creating article: {e}")
-            return JSONResponse(
-                content={"message": "Internal Server Error"}, status_code=500
+            return self._internal_server_error("creating article", e)
+
+    def create_articles_handler(
+        self, articles: list[ArticleModelDTOEndpoint]
+    ) -> Response:
+        try:
+            if not articles:
+                return self._bad_request("No articles given")
+
+            complete = [
+                index
+                for index, article in enumerate(articles)
+                if self._is_complete(article)
+            ]
+            inserted = (
+                self.service.create_articles(
+                    [
+                        convert_article_model_dto_endpoint_to_article_model_dao(
+                            articles[index]
+                        )
+                        for index in complete
+                    ]
+                )
+                if complete
+                else []
             )
+            return self._bulk_response(len(articles), complete, inserted)
+
+        except Exception as e:
+            return self._internal_server_error("creating articles", e)
 
     def update_article_handler(
         self, id: int, article: ArticleModelDTOEndpoint
-    ) -> JSONResponse:
+    ) -> Response:
         try:
-            if (
-                article.first_name is not None
-                and article.last_name is not None
-                and article.price is not None
-            ):
-                self.service.update_article(
+            if self._is_complete(article):
+                stored: ArticleModelDAO = self.service.update_article(
                     id, convert_article_model_dto_endpoint_to_article_model_dao(article)
                 )
-                return JSONResponse(
-                    content=json.loads(article.model_dump_json()), status_code=200
-                )
+                return self._stored_article_response(stored)
 
-            logger.warning("Bad Request")
-            return JSONResponse(content={"message": "Bad Request"}, status_code=400)
+            return self._bad_request()
 
         except Exception as e:
-            logger.error(f"An error occurred while updating article: {e}")
-            return JSONResponse(
-                content={"message": "Internal Server Error"}, status_code=500
-            )
+            return self._internal_server_error("updating article", e)
 
     def delete_article_handler(self, id: int) -> JSONResponse:
         try:
-            if self.service.exists_article_with_id(id):
-                self.service.delete_article(id)
-                return JSONResponse(
-                    content={"message": "Article deleted successfully!"},
-                    status_code=200,
+            deleted: ArticleModelDAO = self.service.delete_article(id)
+            return self._deleted_response(deleted is not None)
+
+        except Exception as e:
+            return self._internal_server_error("deleting article", e)
+
+    @staticmethod
+    def _page_size(limit: int | None) -> int | None:
+        # One extra row tells whether another page follows without a count query
+        return limit + 1 if limit is not None else None
+
+    @staticmethod
+    def _articles_response(
+        articles: ArticlesModelDAO | None,
+        limit: int | None = None,
+        if_none_match: str | None = None,
+        sort: str = "id",
+    ) -> Response:
+        if articles is not None and len(articles) > 0:
+            has_next = limit is not None and len(articles) > limit
+            rows = validate_article_rows(
+                articles[:limit], getattr(articles, "columns", None)
+            )
+            next = encode_cursor(article_sort_key(rows[-1], sort)) if has_next else None
+            body = dump_articles_page(rows, next)
+            return ArticleHandler._conditional_response(
+                body, make_etag(body), if_none_match
+            )
+
+        logger.warning("No articles found")
+        return JSONResponse(content={"message": "No articles found"}, status_code=404)
+
+    @staticmethod
+    def _search_response(
+        articles: ArticlesModelDAO,
+        limit: int,
+        offset: int,
+        if_none_match: str | None = None,
+    ) -> Response:
+        # Unlike listing, no match is an empty page and not a 404. Nothing is
+        # ranked past max_results, so no page follows it
+        has_next = (
+            len(articles) > limit and offset + limit < SEARCH_CONFIG["max_results"]
+        )
+        rows = validate_article_rows(
+            articles[:limit], getattr(articles, "columns", None)
+        )
+        next = encode_cursor({"offset": offset + limit}) if has_next else None
+        body = dump_articles_page(rows, next)
+        return ArticleHandler._conditional_response(
+            body, make_etag(body), if_none_match
+        )
+
+    @staticmethod
+    def _stream_start(format: str) -> bytes:
+        return b'{"articles":[' if format == "json" else b""
+
+    @staticmethod
+    def _stream_end(format: str) -> bytes:
+        return b"]}" if format == "json" else b""
+
+    @staticmethod
+    def _encode_batch(rows: ArticlesModelDAO, format: str, first: bool) -> bytes:
+        articles = validate_article_rows(rows)
+        if format == "json":
+            # Strip the brackets so batches join into one array
+            return (b"" if first else b",") + dump_article_rows(articles)[1:-1]
+        return b"".join(dump_article_row(article) + b"\n" for article in articles)
+
+    def _article_response(
+        self, article: ArticleModelDAO | None, if_none_match: str | None = None
+    ) -> Response:
+        if article is not None:
+            rendered = self.rendered.get(article.id, article)
+            if rendered is None:
+                article_dto: ArticleModelDTO = (
+                    convert_article_model_dao_to_article_model_dto(article)
                 )
+                body = dump_model(article_dto)
+                rendered = body, make_etag(body)
+                self.rendered.set(article.id, article, *rendered)
+            return self._conditional_response(*rendered, if_none_match)
 
-            return JSONResponse(
-                content={"message": "Article not found"}, status_code=404
+        logger.warning("Article not found")
+        return JSONResponse(content={"message": "Article not found"}, status_code=404)
+
+    @staticmethod
+    def _conditional_response(
+        body: bytes, etag: str, if_none_match: str | None
+    ) -> Response:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(
+            content=body,
+            status_code=200,
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+
+    @staticmethod
+    def _stored_article_response(article: ArticleModelDAO | None) -> Response:
+        if article is not None:
+            return ModelResponse(
+                content=convert_article_model_dao_to_article_model_dto(article),
+                status_code=200,
             )
 
-        except Exception as e:
-            logger.error(f"An error occurred while deleting article: {e}")
+        logger.warning("Article not found")
+        return JSONResponse(content={"message": "Article not found"}, status_code=404)
+
+    @staticmethod
+    def _lookup_response(
+        ids: list[int], articles: dict[int, ArticleModelDAO]
+    ) -> Response:
+        return ModelResponse(
+            content=ArticleLookupResultModelDTO(
+                articles=[
+                    convert_article_model_dao_to_article_model_dto(articles[id])
+                    for id in ids
+                    if id in articles
+                ],
+                missing=[id for id in ids if id not in articles],
+            ),
+            status_code=200,
+        )
+
+    @staticmethod
+    def _bulk_response(
+        total: int, complete: list[int], inserted: list[ArticleInsertResultDAO]
+    ) -> Response:
+        results = [
+            BulkArticleResultModelDTO(index=index, error="Bad Request")
+            for index in range(total)
+        ]
+        for index, result in zip(complete, inserted):
+            results[index] = BulkArticleResultModelDTO(
+                index=index, id=result.id, error=result.error
+            )
+
+        created = sum(1 for result in results if result.id is not None)
+        return ModelResponse(
+            content=BulkArticlesResultModelDTO(
+                created=created, failed=total - created, results=results
+            ),
+            status_code=200,
+        )
+
+    @staticmethod
+    def _deleted_response(deleted: bool) -> JSONResponse:
+        if deleted:
             return JSONResponse(
-                content={"message": "Internal Server Error"}, status_code=500
+                content={"message": "Article deleted successfully!"},
+                status_code=200,
             )
+
+        return JSONResponse(content={"message": "Article not found"}, status_code=404)
+
+    @staticmethod
+    def _is_complete(article: ArticleModelDTOEndpoint) -> bool:
+        return (
+            article.first_name is not None
+            and article.last_name is not None
+            and article.price is not None
+        )
+
+    @staticmethod
+    def _bad_request(message: str = "Bad Request") -> JSONResponse:
+        logger.warning(message)
+        return JSONResponse(content={"message": message}, status_code=400)
+
+    @staticmethod
+    def _internal_server_error(action: str, error: Exception) -> JSONResponse:
+        logger.error(f"An error occurred while {action}: {error}")
+        return JSONResponse(
+            content={"message": "Internal Server Error"}, status_code=500
+        )
@@ -0,0 +1,191 @@
+from loguru import logger
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from app.handlers.article_handler import ArticleHandler, STREAM_MEDIA_TYPES
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticlesModelDAO,
+    ArticleModelDAO,
+)
+from app.models.dto.article_model_dto import ArticleModelDTOEndpoint
+from app.util.converter import convert_article_model_dto_endpoint_to_article_model_dao
+from app.util.article_query import (
+    ARTICLE_SORTS,
+    SEARCH_CONFIG,
+    build_search_terms,
+)
+from app.util.cursor import (
+    InvalidCursorError,
+    decode_article_cursor,
+    decode_keyset_cursor,
+    decode_offset_cursor,
+)
+
+
+class AsyncArticleHandler(ArticleHandler):
+    async def get_articles_handler(
+        self,
+        limit: int | None = None,
+        after: str | None = None,
+        if_none_match: str | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> Response:
+        try:
+            if filters is None or filters == ArticleFilterDAO():
+                after_id = decode_article_cursor(after) if after else None
+                articles: ArticlesModelDAO = await self.service.get_all_articles(
+                    self._page_size(limit), after_id
+                )
+                return self._articles_response(articles, limit, if_none_match)
+
+            sort_columns = ARTICLE_SORTS[filters.sort]
+            after_key = decode_keyset_cursor(after, sort_columns) if after else None
+            articles: ArticlesModelDAO = await self.service.get_all_articles(
+                self._page_size(limit), after_key, filters
+            )
+            return self._articles_response(articles, limit, if_none_match, filters.sort)
+
+        except InvalidCursorError as e:
+            return self._bad_request(str(e))
+
+        except Exception as e:
+            return self._internal_server_error("retrieving articles", e)
+
+    async def search_articles_handler(
+        self,
+        q: str,
+        limit: int = 20,
+        after: str | None = None,
+        if_none_match: str | None = None,
+    ) -> Response:
+        try:
+            terms = build_search_terms(q)
+            if terms is None:
+                return self._bad_request("Search query has no words")
+
+            offset = decode_offset_cursor(after) if after else 0
+            limit = max(min(limit, SEARCH_CONFIG["max_results"] - offset), 0)
+            articles: ArticlesModelDAO = (
+                await self.service.search_articles(
+                    terms, self._page_size(limit), offset
+                )
+                if limit > 0
+                else []
+            )
+            return self._search_response(articles, limit, offset, if_none_match)
+
+        except InvalidCursorError as e:
+            return self._bad_request(str(e))
+
+        except Exception as e:
+            return self._internal_server_error("searching articles", e)
+
+    async def stream_articles_handler(
+        self, format: str = "ndjson"
+    ) -> StreamingResponse:
+        try:
+            batches = self.service.iter_articles()
+            first_batch = await anext(batches, None)
+        except Exception as e:
+            return self._internal_server_error("streaming articles", e)
+
+        async def body():
+            yield self._stream_start(format)
+            if first_batch is not None:
+                yield self._encode_batch(first_batch, format, first=True)
+                try:
+                    async for batch in batches:
+                        yield self._encode_batch(batch, format, first=False)
+                except Exception as e:
+                    logger.error(f"An error occurred while streaming articles: {e}")
+                    raise
+            yield self._stream_end(format)
+
+        return StreamingResponse(body(), media_type=STREAM_MEDIA_TYPES[format])
+
+    async def get_article_handler(
+        self, id: int, if_none_match: str | None = None
+    ) -> Response:
+        try:
+            article: ArticleModelDAO = await self.service.get_article(id)
+            return self._article_response(article, if_none_match)
+
+        except Exception as e:
+            return self._internal_server_error("retrieving article", e)
+
+    async def lookup_articles_handler(self, ids: list[int]) -> Response:
+        try:
+            # Duplicates are looked up and returned once, in first requested order
+            ids = list(dict.fromkeys(ids))
+            articles: dict[int, ArticleModelDAO] = await self.service.get_articles(ids)
+            return self._lookup_response(ids, articles)
+
+        except Exception as e:
+            return self._internal_server_error("looking up articles", e)
+
+    async def create_article_handler(
+        self, article: ArticleModelDTOEndpoint
+    ) -> Response:
+        try:
+            if self._is_complete(article):
+                stored: ArticleModelDAO = await self.service.create_article(
+                    convert_article_model_dto_endpoint_to_article_model_dao(article)
+                )
+                return self._stored_article_response(stored)
+
+            return self._bad_request()
+
+        except Exception as e:
+            return self._internal_server_error("creating article", e)
+
+    async def create_articles_handler(
+        self, articles: list[ArticleModelDTOEndpoint]
+    ) -> Response:
+        try:
+            if not articles:
+                return self._bad_request("No articles given")
+
+            complete = [
+                index
+                for index, article in enumerate(articles)
+                if self._is_complete(article)
+            ]
+            inserted = (
+                await self.service.create_articles(
+                    [
+                        convert_article_model_dto_endpoint_to_article_model_dao(
+                            articles[index]
+                        )
+                        for index in complete
+                    ]
+                )
+                if complete
+                else []
+            )
+            return self._bulk_response(len(articles), complete, inserted)
+
+        except Exception as e:
+            return self._internal_server_error("creating articles", e)
+
+    async def update_article_handler(
+        self, id: int, article: ArticleModelDTOEndpoint
+    ) -> Response:
+        try:
+            if self._is_complete(article):
+                stored: ArticleModelDAO = await self.service.update_article(
+                    id, convert_article_model_dto_endpoint_to_article_model_dao(article)
+                )
+                return self._stored_article_response(stored)
+
+            return self._bad_request()
+
+        except Exception as e:
+            return self._internal_server_error("updating article", e)
+
+    async def delete_article_handler(self, id: int) -> JSONResponse:
+        try:
+            deleted: ArticleModelDAO = await self.service.delete_article(id)
+            return self._deleted_response(deleted is not None)
+
+        except Exception as e:
+            return self._internal_server_error("deleting article", e)
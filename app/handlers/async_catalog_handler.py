@@ -0,0 +1,66 @@
+from typing import BinaryIO
+
+from loguru import logger
+from starlette.responses import Response
+
+from app.handlers.catalog_handler import CatalogHandler
+from app.models.dao.catalog_model_dao import CatalogImportResultDAO
+from app.util.catalog import (
+    CatalogFormatError,
+    decode_lines,
+    detect_catalog_format,
+    parse_export_columns,
+)
+
+
+class AsyncCatalogHandler(CatalogHandler):
+    async def import_articles_handler(
+        self, file: BinaryIO, format: str | None = None, filename: str | None = None
+    ) -> Response:
+        try:
+            format = detect_catalog_format(format, filename)
+            result: CatalogImportResultDAO = await self.service.import_articles(
+                decode_lines(file), format
+            )
+            return self._import_response(result)
+
+        except CatalogFormatError as e:
+            return self._bad_request(str(e))
+
+        except UnicodeDecodeError:
+            return self._bad_request("Catalog is not UTF-8 encoded")
+
+        except Exception as e:
+            return self._internal_server_error("importing articles", e)
+
+    async def export_articles_handler(
+        self,
+        columns: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_id: int | None = None,
+        max_id: int | None = None,
+    ) -> Response:
+        try:
+            chunks = self.service.export_articles(
+                parse_export_columns(columns), min_price, max_price, min_id, max_id
+            )
+            first_chunk = await anext(chunks, None)
+
+        except CatalogFormatError as e:
+            return self._bad_request(str(e))
+
+        except Exception as e:
+            return self._internal_server_error("exporting articles", e)
+
+        async def body():
+            if first_chunk is not None:
+                yield first_chunk
+                try:
+                    async for chunk in chunks:
+                        yield chunk
+                except Exception as e:
+                    logger.error(f"An error occurred while exporting articles: {e}")
+                    raise
+
+        return self._export_response(body())
@@ -0,0 +1,133 @@
+from typing import BinaryIO
+
+from loguru import logger
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from app.models.dao.catalog_model_dao import CatalogImportResultDAO
+from app.models.dto.catalog_model_dto import (
+    CatalogImportResultModelDTO,
+    CatalogRowErrorModelDTO,
+)
+from app.util.catalog import (
+    CatalogFormatError,
+    CopyPipe,
+    decode_lines,
+    detect_catalog_format,
+    parse_export_columns,
+)
+from app.util.offload import StreamLimit, create_stream_limit
+from app.util.responses import ModelResponse
+
+
+class CatalogHandler:
+    def __init__(self, service, streams: StreamLimit | None = None):
+        self.service = service
+        self.streams = streams or create_stream_limit()
+
+    def import_articles_handler(
+        self, file: BinaryIO, format: str | None = None, filename: str | None = None
+    ) -> Response:
+        try:
+            format = detect_catalog_format(format, filename)
+            result: CatalogImportResultDAO = self.service.import_articles(
+                decode_lines(file), format
+            )
+            return self._import_response(result)
+
+        except CatalogFormatError as e:
+            return self._bad_request(str(e))
+
+        except UnicodeDecodeError:
+            return self._bad_request("Catalog is not UTF-8 encoded")
+
+        except Exception as e:
+            return self._internal_server_error("importing articles", e)
+
+    def export_articles_handler(
+        self,
+        columns: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_id: int | None = None,
+        max_id: int | None = None,
+    ) -> Response:
+        try:
+            selected = parse_export_columns(columns)
+            # copy_expert blocks until the whole table is written, so it runs
+            # on a stream thread and the response reads from the pipe
+            pipe = CopyPipe()
+            self.streams.submit(
+                self._export_into, pipe, selected, min_price, max_price, min_id, max_id
+            )
+            chunks = iter(pipe)
+            first_chunk = next(chunks, None)
+
+        except CatalogFormatError as e:
+            return self._bad_request(str(e))
+
+        except Exception as e:
+            return self._internal_server_error("exporting articles", e)
+
+        def body():
+            try:
+                if first_chunk is not None:
+                    yield first_chunk
+                    yield from chunks
+            except Exception as e:
+                logger.error(f"An error occurred while exporting articles: {e}")
+                raise
+            finally:
+                pipe.close()
+
+        return self._export_response(body())
+
+    def _export_into(self, pipe: CopyPipe, *args) -> None:
+        try:
+            self.service.export_articles(pipe, *args)
+            pipe.finish()
+        except Exception as e:
+            pipe.finish(e)
+
+    @staticmethod
+    def _export_response(body) -> StreamingResponse:
+        return StreamingResponse(
+            body,
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="articles.csv"'},
+        )
+
+    @staticmethod
+    def _import_response(result: CatalogImportResultDAO) -> Response:
+        imported = result.inserted + result.updated
+        logger.info(
+            f"Imported {imported} of {result.rows_read} catalog rows in "
+            f"{result.seconds:.2f}s, {result.rows_rejected} rejected"
+        )
+        return ModelResponse(
+            content=CatalogImportResultModelDTO(
+                rows_read=result.rows_read,
+                rows_imported=imported,
+                rows_rejected=result.rows_rejected,
+                inserted=result.inserted,
+                updated=result.updated,
+                seconds=round(result.seconds, 3),
+                rows_per_second=round(result.rows_read / result.seconds, 1),
+                errors=[
+                    CatalogRowErrorModelDTO(line=error.line, error=error.error)
+                    for error in result.errors
+                ],
+            ),
+            status_code=200,
+        )
+
+    @staticmethod
+    def _bad_request(message: str) -> JSONResponse:
+        logger.warning(message)
+        return JSONResponse(content={"message": message}, status_code=400)
+
+    @staticmethod
+    def _internal_server_error(action: str, error: Exception) -> JSONResponse:
+        logger.error(f"An error occurred while {action}: {error}")
+        return JSONResponse(
+            content={"message": "Internal Server Error"}, status_code=500
+        )
@@ -1,22 +1,73 @@
+import inspect
+import os
 import sys
-from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Literal
 
 from http import HTTPStatus
 
-from fastapi import FastAPI
+from fastapi import Body, FastAPI, Header, Query, UploadFile
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
-from app.database.db_connection import close_connection, create_connection
+from app.cache.article_cache import create_article_cache
+from app.cache.single_flight import AsyncSingleFlight, SingleFlight
+from app.database.async_db_connection import (
+    async_pool_stats,
+    close_async_pool,
+    create_async_pool,
+    open_async_pool,
+)
+from app.database.db_connection import REPLICA_CONFIG, close_pool, create_pool
+from app.database.group_commit import GROUP_COMMIT_CONFIG, create_group_commit_writer
+from app.database.prepared_statements import invalidate_prepared_statements
+from app.database.query_log import QUERY_LOG
+from app.database.replicas import ReadYourWritesMiddleware, create_replica_router
 from app.handlers.article_handler import ArticleHandler
+from app.handlers.async_article_handler import AsyncArticleHandler
+from app.handlers.async_catalog_handler import AsyncCatalogHandler
+from app.handlers.catalog_handler import CatalogHandler
+from app.models.dao.article_model_dao import ArticleFilterDAO
 from app.models.error.error_model import ErrorResponseModel
+from app.models.stats.cache_stats_model import CacheStatsModel
+from app.models.stats.compression_stats_model import CompressionStatsModel
+from app.models.stats.group_commit_stats_model import GroupCommitStatsModel
+from app.models.stats.offload_stats_model import OffloadStatsModel
+from app.models.stats.stream_stats_model import StreamStatsModel
+from app.models.stats.pool_stats_model import PoolStatsModel
+from app.models.stats.query_log_model import QueryLogModel
+from app.models.stats.replica_stats_model import ReplicaRouterStatsModel
+from app.models.stats.single_flight_stats_model import SingleFlightStatsModel
 from app.services.articles_service import ArticlesService
+from app.util.compression import CompressionMiddleware, create_response_compressor
+from app.util.offload import (
+    AdmittedResponse,
+    OffloadRejectedError,
+    OFFLOAD_CONFIG,
+    create_offload,
+    create_stream_limit,
+)
+from app.util.metrics import (
+    METRICS,
+    METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    StatsCollector,
+)
+from app.util.responses import ModelResponse
+from app.services.async_articles_service import AsyncArticlesService
+from app.services.async_catalog_service import AsyncCatalogService
+from app.services.catalog_service import CatalogService
+from app.storage.factory import STORAGE_CONFIG, create_article_storage
 from app.models.dto.article_model_dto import (
+    ArticleLookupModelDTO,
+    ArticleLookupResultModelDTO,
     ArticleModelDTO,
     ArticlesModelDTO,
     ArticleModelDTOEndpoint,
+    BulkArticlesResultModelDTO,
 )
+from app.models.dto.catalog_model_dto import CatalogImportResultModelDTO
 
 origins = [
     "http://localhost",
@@ -26,17 +77,90 @@ origins = [
 logger.add(
     sys.stderr, format="{time} {level} {message}", filter="my_module", level="INFO"
 )
+# "sync" runs the psycopg2 service on a thread-safe pool, "async" the psycopg 3 one
+SERVICE_MODE = os.getenv("PYSHOP_SERVICE_MODE", "sync")
+# The memory and sqlite backends run the sync service without a database server
+POSTGRES_STORAGE = STORAGE_CONFIG["backend"] == "postgres"
+if SERVICE_MODE == "async" and not POSTGRES_STORAGE:
+    raise ValueError("The async service mode needs the postgres storage backend")
+
+pool = create_pool()
+async_pool = create_async_pool() if SERVICE_MODE == "async" else None
+# Replicas serve the reads of the sync service, the async one stays on the primary
+replicas = create_replica_router(pool) if POSTGRES_STORAGE and not async_pool else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if async_pool:
+        await open_async_pool(async_pool)
+    elif POSTGRES_STORAGE:
+        pool.open()
+    if replicas:
+        replicas.open()
+    yield
+    if group_commit:
+        await resolve(group_commit.close())
+    if offload:
+        offload.close()
+    if write_offload:
+        write_offload.close()
+    if streams:
+        streams.close()
+    if article_storage:
+        article_storage.close()
+    if replicas:
+        replicas.close()
+    await close_async_pool(async_pool)
+    close_pool(pool)
+
+
 app = FastAPI(
     title="PyShop API",
     description="This is a very fancy project",
     version="0.3.1",
     openapi_prefix="/api",
+    lifespan=lifespan,
+)
+article_cache = create_article_cache()
+group_commit = (
+    create_group_commit_writer(async_pool or pool, bool(async_pool))
+    if POSTGRES_STORAGE
+    else None
+)
+# Streamed sync responses hold a connection until their body is sent
+streams = create_stream_limit() if not async_pool else None
+if async_pool:
+    article_storage = None
+    article_service = AsyncArticlesService(
+        async_pool, article_cache, AsyncSingleFlight(), group_commit
+    )
+    article_handler = AsyncArticleHandler(article_service)
+    catalog_handler = AsyncCatalogHandler(
+        AsyncCatalogService(async_pool, article_cache)
+    )
+else:
+    article_storage = create_article_storage(pool, group_commit, replicas)
+    article_service = ArticlesService(
+        pool, article_cache, SingleFlight(), group_commit, article_storage
+    )
+    article_handler = ArticleHandler(article_service)
+    # Import and export stream through COPY and stay on Postgres
+    catalog_handler = (
+        CatalogHandler(CatalogService(pool, article_cache), streams)
+        if POSTGRES_STORAGE
+        else None
+    )
+# Blocking handlers of the sync mode run here, with as many threads as the
+# pool has connections, async handlers don't need them
+offload = create_offload() if not async_pool else None
+# Group commit writes wait for their batch without holding a connection. They
+# get threads enough to fill one and an admission limit of their own
+write_offload = (
+    create_offload(GROUP_COMMIT_CONFIG["max_batch"])
+    if group_commit and not async_pool
+    else None
 )
-connection = create_connection()
-cursor = connection.cursor()
-article_service = ArticlesService(connection)
-article_handler = ArticleHandler(article_service)
-executor = ThreadPoolExecutor(max_workers=2)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +169,58 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if replicas and REPLICA_CONFIG["read_your_writes"] > 0:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window=REPLICA_CONFIG["read_your_writes"]
+    )
+compressor = create_response_compressor()
+if compressor:
+    app.add_middleware(CompressionMiddleware, compressor=compressor)
+# Added last so it wraps everything else
+app.add_middleware(MetricsMiddleware)
+
+METRICS.register(
+    StatsCollector(
+        "pyshop_pool",
+        "Database connection pool",
+        lambda: async_pool_stats(async_pool) if async_pool else pool.stats(),
+    )
+)
+if offload is not None:
+    METRICS.register(
+        StatsCollector("pyshop_offload", "Blocking handler threads", offload.stats)
+    )
+if write_offload is not None:
+    METRICS.register(
+        StatsCollector(
+            "pyshop_write_offload", "Group commit write threads", write_offload.stats
+        )
+    )
+if streams is not None:
+    METRICS.register(
+        StatsCollector("pyshop_streams", "Streamed responses", streams.stats)
+    )
+METRICS.register(
+    StatsCollector(
+        "pyshop_single_flight",
+        "Coalesced article reads",
+        lambda: article_service.single_flight.stats(),
+    )
+)
+if article_cache is not None:
+    METRICS.register(
+        StatsCollector("pyshop_cache", "Article cache", article_cache.stats)
+    )
+if compressor is not None:
+    METRICS.register(
+        StatsCollector("pyshop_compression", "Response compression", compressor.stats)
+    )
+if replicas is not None:
+    METRICS.register(StatsCollector("pyshop_replicas", "Read replicas", replicas.stats))
+if group_commit is not None:
+    METRICS.register(
+        StatsCollector("pyshop_group_commit", "Group commit writer", group_commit.stats)
+    )
 
 # TODO: Fix up the get_article-service                                  -> DONE
 
@@ -64,6 +240,52 @@ app.add_middleware(
 # So that the dependencies of the project are isolated from the system dependencies. This way, the project can be run on any machine without having to worry about the dependencies.
 
 
+async def resolve(response):
+    if inspect.isawaitable(response):
+        return await response
+    return response
+
+
+async def handle(handler, *args, write: bool = False, stream: bool = False) -> Response:
+    # Async handlers run on the event loop, blocking ones on the offload threads.
+    # A streamed response keeps its stream slot until the body is sent
+    if async_pool:
+        return await handler(*args)
+    try:
+        if stream:
+            streams.admit()
+        try:
+            response = await (
+                write_offload if write and write_offload else offload
+            ).run(handler, *args)
+        except BaseException:
+            if stream:
+                streams.release()
+            raise
+    except OffloadRejectedError as e:
+        logger.warning(f"Rejected request: {e}")
+        return JSONResponse(
+            content={"message": "Service Unavailable"},
+            status_code=503,
+            headers={"Retry-After": str(OFFLOAD_CONFIG["retry_after"])},
+        )
+    if not stream:
+        return response
+    if isinstance(response, StreamingResponse):
+        return AdmittedResponse(response, streams.release)
+    streams.release()
+    return response
+
+
+def catalog_not_supported() -> JSONResponse:
+    return JSONResponse(
+        content={
+            "message": f"The catalog is not available on the {STORAGE_CONFIG['backend']} storage"
+        },
+        status_code=501,
+    )
+
+
 @app.get(
     "/health",
     name="Health Check",
@@ -77,15 +299,86 @@ async def health_endpoint() -> str:
 @app.get(
     "/articles",
     name="Get all articles",
-    description="Get all articles from the database",
+    description="Get a page of articles, optionally filtered by price range and last name and "
+    "sorted by id, price or name (last, then first name). Continue with the returned next cursor, "
+    "which is only valid for the same filters and sort. "
+    "With stream=ndjson or stream=json the whole catalog is streamed in batches instead",
     responses={
-        200: {"model": ArticlesModelDTO},
+        200: {
+            "model": ArticlesModelDTO,
+            "content": {"application/x-ndjson": {}},
+        },
+        304: {"description": "Not modified since the given ETag"},
+        400: {"description": "Invalid cursor", "model": ErrorResponseModel},
         404: {"description": "Articles not found", "model": ErrorResponseModel},
         500: {"description": "Internal Server Error", "model": ErrorResponseModel},
     },
 )
-async def get_articles_endpoint() -> JSONResponse:
-    return article_handler.get_articles_handler()
+async def get_articles_endpoint(
+    limit: int = Query(100, ge=1, le=1000),
+    after: str | None = None,
+    stream: Literal["ndjson", "json"] | None = None,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    last_name: str | None = Query(None, max_length=255),
+    sort: Literal["id", "price", "name"] = "id",
+    order: Literal["asc", "desc"] = "asc",
+    if_none_match: str | None = Header(None),
+) -> Response:
+    if stream:
+        return await handle(
+            article_handler.stream_articles_handler, stream, stream=True
+        )
+    filters = ArticleFilterDAO(
+        min_price=min_price,
+        max_price=max_price,
+        last_name=last_name,
+        sort=sort,
+        order=order,
+    )
+    return await handle(
+        article_handler.get_articles_handler, limit, after, if_none_match, filters
+    )
+
+
+@app.post(
+    "/articles/lookup",
+    name="Look up articles by id",
+    description="Fetch up to 1000 articles by id in one call. Found articles keep the requested "
+    "order, ids without an article are listed in missing",
+    responses={
+        200: {"model": ArticleLookupResultModelDTO},
+        422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
+        500: {"description": "Internal Server Error", "model": ErrorResponseModel},
+    },
+)
+async def lookup_articles_endpoint(lookup: ArticleLookupModelDTO) -> Response:
+    return await handle(article_handler.lookup_articles_handler, lookup.ids)
+
+
+@app.get(
+    "/articles/search",
+    name="Search articles",
+    description="Full-text search over first and last names, best matches first. Every word "
+    "must match the start of a name word. At most 1000 matches are ranked, continue with "
+    "the returned next cursor",
+    responses={
+        200: {"model": ArticlesModelDTO},
+        304: {"description": "Not modified since the given ETag"},
+        400: {"description": "Invalid query or cursor", "model": ErrorResponseModel},
+        422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
+        500: {"description": "Internal Server Error", "model": ErrorResponseModel},
+    },
+)
+async def search_articles_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = None,
+    if_none_match: str | None = Header(None),
+) -> Response:
+    return await handle(
+        article_handler.search_articles_handler, q, limit, after, if_none_match
+    )
 
 
 @app.get(
@@ -94,52 +387,135 @@ async def get_articles_endpoint() -> JSONResponse:
     description="Get a specific article from the database",
     responses={
         200: {"model": ArticleModelDTO},
+        304: {"description": "Not modified since the given ETag"},
         404: {"description": "Article not found", "model": ErrorResponseModel},
         422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
         500: {"description": "Internal Server Error", "model": ErrorResponseModel},
     },
 )
-async def get_article_endpoint(id: int) -> JSONResponse:
-    return article_handler.get_article_handler(id)
+async def get_article_endpoint(
+    id: int, if_none_match: str | None = Header(None)
+) -> Response:
+    return await handle(article_handler.get_article_handler, id, if_none_match)
 
 
 @app.post(
     "/article",
     name="Create an article",
-    description="Create an article and add it to the database",
+    description="Create an article and add it to the database, returns the stored article with its id",
     responses={
         200: {
             "description": "Article created successfully!",
-            "model": ArticleModelDTOEndpoint,
+            "model": ArticleModelDTO,
         },
         400: {"description": "Bad Request", "model": ErrorResponseModel},
         422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
         500: {"description": "Internal Server Error", "model": ErrorResponseModel},
     },
 )
-async def create_article_endpoint(article: ArticleModelDTOEndpoint) -> JSONResponse:
-    future = executor.submit(article_handler.create_article_handler, article)
-    return future.result()
+async def create_article_endpoint(article: ArticleModelDTOEndpoint) -> Response:
+    return await handle(article_handler.create_article_handler, article, write=True)
+
+
+@app.post(
+    "/articles/bulk",
+    name="Create articles in bulk",
+    description="Create up to 10000 articles in one transaction and report the id or error per item",
+    responses={
+        200: {"model": BulkArticlesResultModelDTO},
+        400: {"description": "Bad Request", "model": ErrorResponseModel},
+        422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
+        500: {"description": "Internal Server Error", "model": ErrorResponseModel},
+    },
+)
+async def create_articles_bulk_endpoint(
+    articles: list[ArticleModelDTOEndpoint] = Body(..., max_length=10000)
+) -> Response:
+    return await handle(article_handler.create_articles_handler, articles)
+
+
+@app.get(
+    "/articles/export",
+    name="Export the catalog",
+    description="Stream the catalog as CSV with a header row, straight from the database. "
+    "columns takes a comma separated subset of the article fields",
+    responses={
+        200: {"content": {"text/csv": {}}},
+        400: {"description": "Unknown columns", "model": ErrorResponseModel},
+        422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
+        500: {"description": "Internal Server Error", "model": ErrorResponseModel},
+        501: {
+            "description": "Not on this storage backend",
+            "model": ErrorResponseModel,
+        },
+    },
+)
+async def export_articles_endpoint(
+    columns: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_id: int | None = None,
+    max_id: int | None = None,
+) -> Response:
+    if catalog_handler is None:
+        return catalog_not_supported()
+    return await handle(
+        catalog_handler.export_articles_handler,
+        columns,
+        min_price,
+        max_price,
+        min_id,
+        max_id,
+        stream=True,
+    )
+
+
+@app.post(
+    "/articles/import",
+    name="Import the catalog",
+    description="Stream a CSV (with header row) or NDJSON file of articles into the database. "
+    "Rows with an id replace the stored article, rows without one are added. "
+    "The format is taken from the file extension unless given",
+    responses={
+        200: {"model": CatalogImportResultModelDTO},
+        400: {"description": "Unknown format or encoding", "model": ErrorResponseModel},
+        422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
+        500: {"description": "Internal Server Error", "model": ErrorResponseModel},
+        501: {
+            "description": "Not on this storage backend",
+            "model": ErrorResponseModel,
+        },
+    },
+)
+async def import_articles_endpoint(
+    file: UploadFile, format: Literal["csv", "ndjson"] | None = None
+) -> Response:
+    if catalog_handler is None:
+        return catalog_not_supported()
+    return await handle(
+        catalog_handler.import_articles_handler, file.file, format, file.filename
+    )
 
 
 @app.put(
     "/article/{id}",
     name="Update an article",
-    description="Update an article in the database",
+    description="Update an article in the database, returns the stored article",
     responses={
         200: {
             "description": "Article updated successfully!",
-            "model": ArticleModelDTOEndpoint,
+            "model": ArticleModelDTO,
         },
         400: {"description": "Bad Request", "model": ErrorResponseModel},
+        404: {"description": "Article not found", "model": ErrorResponseModel},
         422: {"description": "Unprocessable Entity", "model": ErrorResponseModel},
         500: {"description": "Internal Server Error", "model": ErrorResponseModel},
     },
 )
 async def update_article_endpoint(
     id: int, article: ArticleModelDTOEndpoint
-) -> JSONResponse:
-    return article_handler.update_article_handler(id, article)
+) -> Response:
+    return await handle(article_handler.update_article_handler, id, article, write=True)
 
 
 @app.delete(
@@ -157,7 +533,7 @@ async def update_article_endpoint(
     },
 )
 async def delete_article_endpoint(id: int) -> JSONResponse:
-    return article_handler.delete_article_handler(id)
+    return await handle(article_handler.delete_article_handler, id)
 
 
 @app.get(
@@ -169,5 +545,185 @@ async def delete_article_endpoint(id: int) -> JSONResponse:
     },
 )
 async def close_endpoint() -> HTTPStatus:
-    close_connection(connection)
+    await close_async_pool(async_pool)
+    close_pool(pool)
+    if replicas:
+        replicas.close()
     return HTTPStatus.OK
+
+
+@app.post(
+    "/prepared-statements/invalidate",
+    name="Invalidate prepared statements",
+    description="Make every pooled connection drop its prepared article statements "
+    "before the next use, e.g. after a migration",
+    responses={200: {"description": "New statement generation", "model": dict}},
+)
+async def invalidate_prepared_statements_endpoint() -> JSONResponse:
+    return JSONResponse(
+        content={"generation": invalidate_prepared_statements()}, status_code=200
+    )
+
+
+@app.get(
+    "/metrics",
+    name="Metrics",
+    description="Request, service, pool and executor metrics in the Prometheus text format",
+    responses={200: {"content": {METRICS_CONTENT_TYPE: {}}}},
+)
+async def metrics_endpoint() -> Response:
+    return Response(content=METRICS.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get(
+    "/debug/slow-queries",
+    name="Slow queries",
+    description="List the slowest statements since startup, with EXPLAIN (ANALYZE, BUFFERS) "
+    "output where one was captured, and the statements with the most total time",
+    responses={200: {"model": QueryLogModel}},
+)
+async def slow_queries_endpoint(limit: int = Query(20, ge=1, le=100)) -> Response:
+    return ModelResponse(content=QUERY_LOG.stats(limit), status_code=200)
+
+
+@app.get(
+    "/pool/stats",
+    name="Connection pool statistics",
+    description="Get the utilization of the database connection pool",
+    responses={200: {"model": PoolStatsModel}},
+)
+async def pool_stats_endpoint() -> Response:
+    if async_pool:
+        return ModelResponse(content=async_pool_stats(async_pool), status_code=200)
+    return ModelResponse(content=pool.stats(), status_code=200)
+
+
+@app.get(
+    "/cache/stats",
+    name="Article cache statistics",
+    description="Get hit, miss and eviction counters of the article cache",
+    responses={
+        200: {"model": CacheStatsModel},
+        404: {"description": "Article cache disabled", "model": ErrorResponseModel},
+    },
+)
+async def cache_stats_endpoint() -> Response:
+    if article_cache is None:
+        return JSONResponse(
+            content={"message": "Article cache disabled"}, status_code=404
+        )
+    return ModelResponse(content=article_cache.stats(), status_code=200)
+
+
+@app.get(
+    "/compression/stats",
+    name="Response compression statistics",
+    description="Get the negotiated encodings, compressed bytes and the compressed body cache",
+    responses={
+        200: {"model": CompressionStatsModel},
+        404: {"description": "Compression disabled", "model": ErrorResponseModel},
+    },
+)
+async def compression_stats_endpoint() -> Response:
+    if compressor is None:
+        return JSONResponse(
+            content={"message": "Compression disabled"}, status_code=404
+        )
+    return ModelResponse(content=compressor.stats(), status_code=200)
+
+
+@app.get(
+    "/replicas/stats",
+    name="Read replica statistics",
+    description="Get health, lag and read counts of the read replicas",
+    responses={
+        200: {"model": ReplicaRouterStatsModel},
+        404: {"description": "No read replicas", "model": ErrorResponseModel},
+    },
+)
+async def replica_stats_endpoint() -> Response:
+    if replicas is None:
+        return JSONResponse(
+            content={"message": "No read replicas configured"}, status_code=404
+        )
+    return ModelResponse(content=replicas.stats(), status_code=200)
+
+
+@app.get(
+    "/group-commit/stats",
+    name="Group commit statistics",
+    description="Get batch sizes and commit times of the group commit writer",
+    responses={
+        200: {"model": GroupCommitStatsModel},
+        404: {"description": "Group commit disabled", "model": ErrorResponseModel},
+    },
+)
+async def group_commit_stats_endpoint() -> Response:
+    if group_commit is None:
+        return JSONResponse(
+            content={"message": "Group commit disabled"}, status_code=404
+        )
+    return ModelResponse(content=group_commit.stats(), status_code=200)
+
+
+@app.get(
+    "/offload/stats",
+    name="Offload statistics",
+    description="Get the queue depth and rejections of the threads running blocking handlers",
+    responses={
+        200: {"model": OffloadStatsModel},
+        404: {"description": "Async mode", "model": ErrorResponseModel},
+    },
+)
+async def offload_stats_endpoint() -> Response:
+    if offload is None:
+        return JSONResponse(
+            content={"message": "Handlers run on the event loop in async mode"},
+            status_code=404,
+        )
+    return ModelResponse(content=offload.stats(), status_code=200)
+
+
+@app.get(
+    "/offload/writes/stats",
+    name="Write offload statistics",
+    description="Get the queue depth and rejections of the threads running group commit writes",
+    responses={
+        200: {"model": OffloadStatsModel},
+        404: {"description": "Group commit disabled", "model": ErrorResponseModel},
+    },
+)
+async def write_offload_stats_endpoint() -> Response:
+    if write_offload is None:
+        return JSONResponse(
+            content={"message": "Group commit disabled"}, status_code=404
+        )
+    return ModelResponse(content=write_offload.stats(), status_code=200)
+
+
+@app.get(
+    "/offload/streams/stats",
+    name="Stream statistics",
+    description="Get the open and rejected streamed responses and exports",
+    responses={
+        200: {"model": StreamStatsModel},
+        404: {"description": "Async mode", "model": ErrorResponseModel},
+    },
+)
+async def stream_stats_endpoint() -> Response:
+    if streams is None:
+        return JSONResponse(
+            content={"message": "Streams hold no offload threads in async mode"},
+            status_code=404,
+        )
+    return ModelResponse(content=streams.stats(), status_code=200)
+
+
+@app.get(
+    "/single-flight/stats",
+    name="Request coalescing statistics",
+    description="Get how many article reads were collapsed into a query already in flight",
+    responses={200: {"model": SingleFlightStatsModel}},
+)
+async def single_flight_stats_endpoint() -> Response:
+    return ModelResponse(content=article_service.single_flight.stats(), status_code=200)
@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Iterable, Literal, Optional
 
 from pydantic import BaseModel
 
+ARTICLE_COLUMNS = ("id", "imageUrl", "first_name", "last_name", "price")
+
 
 class ArticleModelDAO(BaseModel):
     id: int
@@ -13,3 +15,23 @@ class ArticleModelDAO(BaseModel):
 
 class ArticlesModelDAO(BaseModel):
     articles: list[ArticleModelDAO]
+
+
+class ArticleFilterDAO(BaseModel):
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    last_name: Optional[str] = None
+    sort: Literal["id", "price", "name"] = "id"
+    order: Literal["asc", "desc"] = "asc"
+
+
+class ArticleInsertResultDAO(BaseModel):
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ArticleRows(list):
+    # Raw result rows together with the column names of the cursor description
+    def __init__(self, rows: Iterable = (), columns: Iterable[str] = ARTICLE_COLUMNS):
+        super().__init__(rows)
+        self.columns = tuple(columns)
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class CatalogRowErrorDAO(BaseModel):
+    line: int
+    error: str
+
+
+class CatalogImportResultDAO(BaseModel):
+    rows_read: int
+    rows_rejected: int
+    inserted: int
+    updated: int
+    seconds: float
+    errors: list[CatalogRowErrorDAO]
@@ -1,6 +1,7 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
 
 
 class ArticleModelDTO(BaseModel):
@@ -20,3 +21,40 @@ class ArticleModelDTOEndpoint(BaseModel):
 
 class ArticlesModelDTO(BaseModel):
     articles: list[ArticleModelDTO]
+    next: Optional[str] = None
+
+
+class ArticleLookupModelDTO(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+
+class ArticleLookupResultModelDTO(BaseModel):
+    articles: list[ArticleModelDTO]
+    missing: list[int]
+
+
+class BulkArticleResultModelDTO(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkArticlesResultModelDTO(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkArticleResultModelDTO]
+
+
+# Plain-dict mirrors of ArticleModelDTO/ArticlesModelDTO for batch validation of
+# result sets; they serialize to the same JSON without per-row model instances.
+class ArticleRowDTO(TypedDict):
+    id: int
+    imageUrl: Optional[str]
+    first_name: str
+    last_name: str
+    price: float
+
+
+class ArticlesPageDTO(TypedDict):
+    articles: list[ArticleRowDTO]
+    next: Optional[str]
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.dto.article_model_dto import ArticleModelDTOEndpoint
+
+
+class ArticleImportRowDTO(ArticleModelDTOEndpoint):
+    # Endpoint rules plus an optional id to upsert on and the column widths,
+    # so a bad row is rejected on its own instead of aborting the whole COPY
+    id: Optional[int] = Field(None, gt=0)
+    imageUrl: Optional[str] = Field("", max_length=255)
+    first_name: str = Field(..., max_length=255)
+    last_name: str = Field(..., max_length=255)
+
+
+class CatalogRowErrorModelDTO(BaseModel):
+    line: int
+    error: str
+
+
+class CatalogImportResultModelDTO(BaseModel):
+    rows_read: int
+    rows_imported: int
+    rows_rejected: int
+    inserted: int
+    updated: int
+    seconds: float
+    rows_per_second: float
+    errors: list[CatalogRowErrorModelDTO]
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CacheStatsModel(BaseModel):
+    backend: str
+    size: Optional[int] = None
+    max_size: Optional[int] = None
+    ttl: Optional[float] = None
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
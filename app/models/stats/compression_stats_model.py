@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class CompressionStatsModel(BaseModel):
+    encodings: list[str]
+    levels: dict[str, int]
+    min_size: int
+    responses: int
+    streams: int
+    bytes_in: int
+    bytes_out: int
+    cache_size: int
+    cache_bytes: int
+    cache_max_bytes: int
+    cache_hits: int
+    cache_misses: int
+    cache_evictions: int
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class GroupCommitStatsModel(BaseModel):
+    max_batch: int
+    max_wait: float
+    batches: int
+    writes: int
+    failed: int
+    pending: int
+    largest_batch: int
+    average_batch: float
+    commit_time_total: float
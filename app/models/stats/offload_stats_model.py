@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class OffloadStatsModel(BaseModel):
+    workers: int
+    queue_size: int
+    running: int
+    queued: int
+    peak: int
+    submitted: int
+    completed: int
+    rejected: int
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PoolStatsModel(BaseModel):
+    min_size: int
+    max_size: int
+    size: int
+    in_use: int
+    idle: int
+    waiters: int
+    checkouts: int
+    timeouts: int
+    discarded: int
+    wait_time_total: float
+    wait_time_max: Optional[float] = None
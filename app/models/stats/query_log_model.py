@@ -0,0 +1,26 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SlowQueryModel(BaseModel):
+    statement: str
+    duration: float
+    rows: int
+    executed_at: float
+    plan: Optional[str] = None
+
+
+class StatementStatsModel(BaseModel):
+    statement: str
+    calls: int
+    total_time: float
+    max_time: float
+    rows: int
+
+
+class QueryLogModel(BaseModel):
+    slow_threshold: float
+    slow_queries: int
+    slowest: list[SlowQueryModel]
+    statements: list[StatementStatsModel]
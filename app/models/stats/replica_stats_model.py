@@ -0,0 +1,24 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ReplicaStatsModel(BaseModel):
+    name: str
+    healthy: bool
+    lag: Optional[float] = None
+    reads: int
+    failures: int
+    checked_at: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class ReplicaRouterStatsModel(BaseModel):
+    max_lag: float
+    read_your_writes: float
+    healthy: int
+    replica_reads: int
+    primary_reads: int
+    pinned_reads: int
+    fallbacks: int
+    replicas: list[ReplicaStatsModel]
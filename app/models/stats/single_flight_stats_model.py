@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class SingleFlightStatsModel(BaseModel):
+    requests: int
+    executions: int
+    collapsed: int
+    in_flight: int
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class StreamStatsModel(BaseModel):
+    limit: int
+    open: int
+    peak: int
+    admitted: int
+    completed: int
+    rejected: int
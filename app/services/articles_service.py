@@ -1,94 +1,196 @@
-from app.models.dao.article_model_dao import ArticlesModelDAO, ArticleModelDAO
+from typing import Iterator
+
+from app.cache.article_cache import ArticleCache
+from app.cache.single_flight import SingleFlight
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticlesModelDAO,
+    ArticleModelDAO,
+)
+from app.database.group_commit import GroupCommitWriter
+from app.database.replicas import pinned_to_primary, replica_read
+from app.storage.article_storage import ArticleStorage
+from app.storage.postgres_storage import PostgresArticleStorage
+from app.util.metrics import timed
+from app.util.converter import convert_row_to_article_model_dao
 
 
 class ArticlesService:
-    def __init__(self, connection):
-        self.connection = connection
+    def __init__(
+        self,
+        pool,
+        cache: ArticleCache | None = None,
+        single_flight: SingleFlight | None = None,
+        writer: GroupCommitWriter | None = None,
+        storage: ArticleStorage | None = None,
+    ):
+        self.pool = pool
+        self.cache = cache
+        self.single_flight = single_flight
+        self.storage = storage or (
+            PostgresArticleStorage(pool, writer) if pool else None
+        )
 
+    @timed("articles")
     def exists_article_with_id(self, id: int) -> bool:
-        if self.connection:
+        if self.storage:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute("SELECT * FROM articles WHERE id = %s", (id,))
-                if cursor.fetchone():
-                    return True
-                return False
+                return self.storage.exists(id)
             except Exception:
                 return False
 
-    def get_all_articles(self) -> ArticlesModelDAO | None:
-        if self.connection:
+    @timed("articles")
+    def get_all_articles(
+        self,
+        limit: int | None = None,
+        after: int | tuple | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> ArticlesModelDAO | None:
+        if self.storage:
+            try:
+                return self._coalesce(
+                    ("articles", limit, after, filters and filters.model_dump_json()),
+                    self.storage.list_page,
+                    limit,
+                    after,
+                    filters,
+                )
+            except Exception as e:
+                raise e
+
+    @timed("articles")
+    def search_articles(
+        self, terms: str, limit: int, offset: int = 0
+    ) -> ArticlesModelDAO | None:
+        if self.storage:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute("SELECT * FROM articles")
-                return cursor.fetchall()
+                return self.storage.search(terms, limit, offset)
             except Exception as e:
                 raise e
 
+    def iter_articles(self, batch_size: int = 1000) -> Iterator[ArticlesModelDAO]:
+        if self.storage:
+            yield from self.storage.iter_batches(batch_size)
+
+    @timed("articles")
     def get_article(self, id: int) -> ArticleModelDAO | None:
-        if self.connection:
+        if self.storage:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute("SELECT * FROM articles WHERE id = %s", (id,))
-                article_data = cursor.fetchone()
+                if self._cached():
+                    article = self.cache.get(id)
+                    if article is not None:
+                        return article
 
-                if article_data is None:
-                    return None
+                return self._coalesce(("article", id), self._load_article, id)
+            except Exception as e:
+                raise e
 
-                article_dict = dict(
-                    zip(
-                        ["id", "imageUrl", "first_name", "last_name", "price"],
-                        article_data,
-                    )
-                )
-                article = ArticleModelDAO(**article_dict)
-                return article
+    def _load_article(self, id: int) -> ArticleModelDAO | None:
+        # Taken before the read, a write that lands meanwhile keeps the row
+        # it replaced out of the cache
+        generation = self.cache.generation() if self.cache else None
+        row, from_replica = replica_read(self.storage.get, id)
+        article = convert_row_to_article_model_dao(row)
+        # A replica may still return the row a write just replaced
+        if article is not None and self.cache and not from_replica:
+            self.cache.set(id, article, generation)
+        return article
+
+    @timed("articles")
+    def get_articles(self, ids: list[int]) -> dict[int, ArticleModelDAO]:
+        if self.storage:
+            try:
+                articles = {}
+                if self._cached():
+                    for id in ids:
+                        article = self.cache.get(id)
+                        if article is not None:
+                            articles[id] = article
+
+                misses = [id for id in ids if id not in articles]
+                if misses:
+                    generation = self.cache.generation() if self.cache else None
+                    rows, from_replica = replica_read(self.storage.get_many, misses)
+                    for row in rows:
+                        article = convert_row_to_article_model_dao(row, rows.columns)
+                        articles[article.id] = article
+                        if self.cache and not from_replica:
+                            self.cache.set(article.id, article, generation)
+                return articles
             except Exception as e:
                 raise e
 
-    def create_article(self, article: ArticleModelDAO) -> None:
-        if self.connection:
+    @timed("articles")
+    def create_article(self, article: ArticleModelDAO) -> ArticleModelDAO:
+        if self.storage:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute(
-                    "INSERT INTO articles (first_name, last_name, imageUrl, price) VALUES (%s, %s, %s, %s)",
+                article_data = self.storage.insert(
                     (
                         article.first_name,
                         article.last_name,
                         article.imageUrl,
                         article.price,
-                    ),
+                    )
                 )
-                cursor.connection.commit()
-                return cursor.rowcount
+                return convert_row_to_article_model_dao(article_data)
             except Exception as e:
                 raise e
 
-    def update_article(self, id: int, article: ArticleModelDAO) -> None:
-        if self.connection:
+    @timed("articles")
+    def create_articles(
+        self, articles: list[ArticleModelDAO], page_size: int = 1000
+    ) -> list[ArticleInsertResultDAO]:
+        if self.storage:
+            values = [
+                (article.first_name, article.last_name, article.imageUrl, article.price)
+                for article in articles
+            ]
             try:
-                cursor = self.connection.cursor()
-                cursor.execute(
-                    "UPDATE articles SET first_name = %s, last_name = %s, imageUrl = %s, price = %s WHERE id = %s",
+                return self.storage.insert_many(values, page_size)
+            except Exception as e:
+                raise e
+
+    @timed("articles")
+    def update_article(
+        self, id: int, article: ArticleModelDAO
+    ) -> ArticleModelDAO | None:
+        if self.storage:
+            try:
+                article_data = self.storage.update(
+                    id,
                     (
                         article.first_name,
                         article.last_name,
                         article.imageUrl,
                         article.price,
-                        id,
                     ),
                 )
-                cursor.connection.commit()
-                return cursor.rowcount
+                if self.cache:
+                    self.cache.delete(id)
+                return convert_row_to_article_model_dao(article_data)
             except Exception as e:
                 raise e
 
-    def delete_article(self, id: int) -> None:
-        if self.connection:
+    @timed("articles")
+    def delete_article(self, id: int) -> ArticleModelDAO | None:
+        if self.storage:
             try:
-                cursor = self.connection.cursor()
-                cursor.execute("DELETE FROM articles WHERE id = %s", (id,))
-                cursor.connection.commit()
-                return cursor.rowcount
+                article_data = self.storage.delete(id)
+                if self.cache:
+                    self.cache.delete(id)
+                return convert_row_to_article_model_dao(article_data)
             except Exception as e:
                 raise e
+
+    def _cached(self) -> bool:
+        # A client pinned to the primary after a write reads around the cache
+        # too, only rows read from the primary are cached
+        return self.cache is not None and not pinned_to_primary()
+
+    def _coalesce(self, key: tuple, fn, *args):
+        # Identical reads in flight at the same time share one query, reads
+        # pinned to the primary don't join replica reads
+        if self.single_flight is None:
+            return fn(*args)
+        return self.single_flight.do((*key, pinned_to_primary()), fn, *args)
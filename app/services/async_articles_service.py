@@ -0,0 +1,304 @@
+from typing import AsyncIterator
+
+import psycopg
+
+from app.cache.article_cache import ArticleCache
+from app.cache.single_flight import AsyncSingleFlight
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticleRows,
+    ArticlesModelDAO,
+    ArticleModelDAO,
+)
+from app.database.group_commit import AsyncGroupCommitWriter
+from app.database.prepared_statements import execute_prepared_async
+from app.util.article_query import (
+    SEARCH_CONFIG,
+    SEARCH_QUERY,
+    build_articles_query,
+)
+from app.util.metrics import timed
+from app.util.converter import (
+    columns_from_description,
+    convert_row_to_article_model_dao,
+)
+
+
+class AsyncArticlesService:
+    def __init__(
+        self,
+        pool,
+        cache: ArticleCache | None = None,
+        single_flight: AsyncSingleFlight | None = None,
+        writer: AsyncGroupCommitWriter | None = None,
+    ):
+        self.pool = pool
+        self.cache = cache
+        self.single_flight = single_flight
+        self.writer = writer
+
+    @timed("articles")
+    async def exists_article_with_id(self, id: int) -> bool:
+        if self.pool:
+            try:
+                async with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    await execute_prepared_async(cursor, "article_exists", (id,))
+                    if await cursor.fetchone():
+                        return True
+                    return False
+            except Exception:
+                return False
+
+    @timed("articles")
+    async def get_all_articles(
+        self,
+        limit: int | None = None,
+        after: int | tuple | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> ArticlesModelDAO | None:
+        if self.pool:
+            try:
+                return await self._coalesce(
+                    ("articles", limit, after, filters and filters.model_dump_json()),
+                    self._query_articles,
+                    limit,
+                    after,
+                    filters,
+                )
+            except Exception as e:
+                raise e
+
+    async def _query_articles(
+        self,
+        limit: int | None,
+        after: int | tuple | None,
+        filters: ArticleFilterDAO | None,
+    ) -> ArticlesModelDAO:
+        async with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            if filters is not None:
+                # after is the keyset of the sort columns here
+                await cursor.execute(*build_articles_query(filters, limit, after))
+            elif limit is None:
+                await execute_prepared_async(cursor, "article_list_all")
+            else:
+                await execute_prepared_async(
+                    cursor, "article_list", (after or 0, limit)
+                )
+            return ArticleRows(
+                await cursor.fetchall(),
+                columns_from_description(cursor.description),
+            )
+
+    @timed("articles")
+    async def search_articles(
+        self, terms: str, limit: int, offset: int = 0
+    ) -> ArticlesModelDAO | None:
+        if self.pool:
+            try:
+                async with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    await cursor.execute(
+                        SEARCH_QUERY,
+                        (terms, SEARCH_CONFIG["max_results"], limit, offset),
+                    )
+                    return ArticleRows(
+                        await cursor.fetchall(),
+                        columns_from_description(cursor.description),
+                    )
+            except Exception as e:
+                raise e
+
+    async def iter_articles(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[ArticlesModelDAO]:
+        if self.pool:
+            async with self.pool.connection() as connection:
+                async with connection.cursor(name="articles_stream") as cursor:
+                    cursor.itersize = batch_size
+                    await cursor.execute(
+                        "SELECT id, imageUrl, first_name, last_name, price FROM articles ORDER BY id"
+                    )
+                    while rows := await cursor.fetchmany(batch_size):
+                        yield ArticleRows(
+                            rows, columns_from_description(cursor.description)
+                        )
+
+    @timed("articles")
+    async def get_article(self, id: int) -> ArticleModelDAO | None:
+        if self.pool:
+            try:
+                if self.cache:
+                    article = self.cache.get(id)
+                    if article is not None:
+                        return article
+
+                return await self._coalesce(("article", id), self._load_article, id)
+            except Exception as e:
+                raise e
+
+    async def _load_article(self, id: int) -> ArticleModelDAO | None:
+        generation = self.cache.generation() if self.cache else None
+        async with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            await execute_prepared_async(cursor, "article_get", (id,))
+            article_data = await cursor.fetchone()
+
+        article = convert_row_to_article_model_dao(article_data)
+        if article is not None and self.cache:
+            self.cache.set(id, article, generation)
+        return article
+
+    @timed("articles")
+    async def get_articles(self, ids: list[int]) -> dict[int, ArticleModelDAO]:
+        if self.pool:
+            try:
+                articles = {}
+                if self.cache:
+                    for id in ids:
+                        article = self.cache.get(id)
+                        if article is not None:
+                            articles[id] = article
+
+                misses = [id for id in ids if id not in articles]
+                if misses:
+                    generation = self.cache.generation() if self.cache else None
+                    async with self.pool.connection() as connection:
+                        cursor = connection.cursor()
+                        await execute_prepared_async(
+                            cursor, "article_get_many", (misses,)
+                        )
+                        rows = await cursor.fetchall()
+                        columns = columns_from_description(cursor.description)
+
+                    for row in rows:
+                        article = convert_row_to_article_model_dao(row, columns)
+                        articles[article.id] = article
+                        if self.cache:
+                            self.cache.set(article.id, article, generation)
+                return articles
+            except Exception as e:
+                raise e
+
+    @timed("articles")
+    async def create_article(self, article: ArticleModelDAO) -> ArticleModelDAO:
+        if self.pool:
+            try:
+                article_data = await self._write(
+                    "article_insert",
+                    (
+                        article.first_name,
+                        article.last_name,
+                        article.imageUrl,
+                        article.price,
+                    ),
+                )
+                return convert_row_to_article_model_dao(article_data)
+            except Exception as e:
+                raise e
+
+    @timed("articles")
+    async def create_articles(
+        self, articles: list[ArticleModelDAO], page_size: int = 1000
+    ) -> list[ArticleInsertResultDAO]:
+        if self.pool:
+            values = [
+                (article.first_name, article.last_name, article.imageUrl, article.price)
+                for article in articles
+            ]
+            try:
+                async with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        ids = []
+                        for start in range(0, len(values), page_size):
+                            page = values[start : start + page_size]
+                            await cursor.execute(
+                                "INSERT INTO articles (first_name, last_name, imageUrl, price) VALUES "
+                                + ", ".join(["(%s, %s, %s, %s)"] * len(page))
+                                + " RETURNING id",
+                                [value for row in page for value in row],
+                            )
+                            ids.extend(row[0] for row in await cursor.fetchall())
+                        await connection.commit()
+                        return [ArticleInsertResultDAO(id=id) for id in ids]
+                    except (psycopg.DataError, psycopg.IntegrityError):
+                        await connection.rollback()
+
+                    # Some row was rejected: retry row by row in one transaction,
+                    # with a savepoint per row so the others still get inserted
+                    results = []
+                    for row in values:
+                        await cursor.execute("SAVEPOINT bulk_article")
+                        try:
+                            await cursor.execute(
+                                "INSERT INTO articles (first_name, last_name, imageUrl, price) VALUES (%s, %s, %s, %s) RETURNING id",
+                                row,
+                            )
+                            results.append(
+                                ArticleInsertResultDAO(id=(await cursor.fetchone())[0])
+                            )
+                            await cursor.execute("RELEASE SAVEPOINT bulk_article")
+                        except (psycopg.DataError, psycopg.IntegrityError) as e:
+                            await cursor.execute("ROLLBACK TO SAVEPOINT bulk_article")
+                            results.append(ArticleInsertResultDAO(error=str(e).strip()))
+                    await connection.commit()
+                    return results
+            except Exception as e:
+                raise e
+
+    @timed("articles")
+    async def update_article(
+        self, id: int, article: ArticleModelDAO
+    ) -> ArticleModelDAO | None:
+        if self.pool:
+            try:
+                article_data = await self._write(
+                    "article_update",
+                    (
+                        article.first_name,
+                        article.last_name,
+                        article.imageUrl,
+                        article.price,
+                        id,
+                    ),
+                )
+                if self.cache:
+                    self.cache.delete(id)
+                return convert_row_to_article_model_dao(article_data)
+            except Exception as e:
+                raise e
+
+    @timed("articles")
+    async def delete_article(self, id: int) -> ArticleModelDAO | None:
+        if self.pool:
+            try:
+                async with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    await execute_prepared_async(cursor, "article_delete", (id,))
+                    article_data = await cursor.fetchone()
+                    await connection.commit()
+                    if self.cache:
+                        self.cache.delete(id)
+                    return convert_row_to_article_model_dao(article_data)
+            except Exception as e:
+                raise e
+
+    async def _coalesce(self, key: tuple, fn, *args):
+        # Identical reads in flight at the same time share one query
+        if self.single_flight is None:
+            return await fn(*args)
+        return await self.single_flight.do(key, fn, *args)
+
+    async def _write(self, name: str, params: tuple):
+        # With a group commit writer the write shares its transaction with others
+        if self.writer is not None:
+            return await self.writer.submit(name, params)
+        async with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            await execute_prepared_async(cursor, name, params)
+            row = await cursor.fetchone()
+            await connection.commit()
+            return row
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import AsyncIterator, Iterable
+
+from app.cache.article_cache import ArticleCache
+from app.models.dao.article_model_dao import ARTICLE_COLUMNS
+from app.models.dao.catalog_model_dao import CatalogImportResultDAO
+from app.services.catalog_service import (
+    CREATE_STAGING_TABLE,
+    MERGE_STAGING_TABLE,
+    SYNC_ID_SEQUENCE,
+    import_result,
+    log_export,
+)
+from app.util.catalog import (
+    CATALOG_CONFIG,
+    CatalogReader,
+    build_export_query,
+    export_statement,
+    read_batch,
+    staging_row,
+)
+
+COPY_INTO_STAGING_TABLE = (
+    "COPY articles_import (id, imageUrl, first_name, last_name, price) FROM STDIN"
+)
+
+
+class AsyncCatalogService:
+    def __init__(self, pool, cache: ArticleCache | None = None):
+        self.pool = pool
+        self.cache = cache
+
+    async def import_articles(
+        self, lines: Iterable[str], format: str
+    ) -> CatalogImportResultDAO:
+        if self.pool:
+            reader = CatalogReader(lines, format)
+            rows = iter(reader)
+            try:
+                async with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    await cursor.execute(CREATE_STAGING_TABLE)
+                    async with cursor.copy(COPY_INTO_STAGING_TABLE) as copy:
+                        # Reading the upload and validating rows blocks, it
+                        # runs on a worker thread a batch at a time
+                        while batch := await asyncio.to_thread(
+                            read_batch, rows, CATALOG_CONFIG["copy_batch_size"]
+                        ):
+                            for row in batch:
+                                await copy.write_row(staging_row(row))
+                    await cursor.execute(MERGE_STAGING_TABLE)
+                    inserted, updated = await cursor.fetchone()
+                    await cursor.execute(SYNC_ID_SEQUENCE)
+                    await connection.commit()
+                    if self.cache:
+                        self.cache.clear()
+                    return import_result(reader, inserted, updated)
+            except Exception as e:
+                raise e
+
+    async def export_articles(
+        self,
+        columns: tuple[str, ...] = ARTICLE_COLUMNS,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_id: int | None = None,
+        max_id: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        if self.pool:
+            query, params = build_export_query(
+                columns, min_price, max_price, min_id, max_id
+            )
+            started = time.monotonic()
+            async with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                async with cursor.copy(export_statement(query), params) as copy:
+                    # COPY hands out one row at a time, send larger chunks
+                    chunk = bytearray()
+                    async for data in copy:
+                        chunk += data
+                        if len(chunk) >= CATALOG_CONFIG["export_chunk_size"]:
+                            yield bytes(chunk)
+                            chunk.clear()
+                    if chunk:
+                        yield bytes(chunk)
+                log_export(cursor.rowcount, time.monotonic() - started)
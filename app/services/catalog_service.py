@@ -0,0 +1,135 @@
+import time
+from typing import BinaryIO, Iterable
+
+import psycopg2
+from loguru import logger
+
+from app.cache.article_cache import ArticleCache
+from app.database.replicas import note_write
+from app.models.dao.article_model_dao import ARTICLE_COLUMNS
+from app.models.dao.catalog_model_dao import CatalogImportResultDAO
+from app.util.catalog import (
+    CatalogReader,
+    CopyStream,
+    build_export_query,
+    export_statement,
+)
+
+CREATE_STAGING_TABLE = (
+    "CREATE TEMP TABLE articles_import (seq bigserial, id integer, imageUrl varchar(255), "
+    "first_name varchar(255), last_name varchar(255), price float) ON COMMIT DROP"
+)
+
+COPY_INTO_STAGING_TABLE = (
+    "COPY articles_import (id, imageUrl, first_name, last_name, price) FROM STDIN "
+    "WITH (FORMAT csv, FORCE_NOT_NULL (imageUrl, first_name, last_name))"
+)
+
+# One upsert for the whole import: rows with an id replace the stored article
+# (the last one wins if an id repeats), rows without an id get a new one
+MERGE_STAGING_TABLE = """
+WITH staged AS (
+    SELECT * FROM (
+        SELECT DISTINCT ON (id) * FROM articles_import WHERE id IS NOT NULL ORDER BY id, seq DESC
+    ) AS with_id
+    UNION ALL
+    SELECT * FROM articles_import WHERE id IS NULL
+), merged AS (
+    INSERT INTO articles (id, imageUrl, first_name, last_name, price)
+    SELECT COALESCE(id, nextval(pg_get_serial_sequence('articles', 'id'))), imageUrl, first_name, last_name, price
+    FROM staged ORDER BY seq
+    ON CONFLICT (id) DO UPDATE SET
+        imageUrl = EXCLUDED.imageUrl,
+        first_name = EXCLUDED.first_name,
+        last_name = EXCLUDED.last_name,
+        price = EXCLUDED.price
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged
+"""
+
+# Explicit ids bypass the sequence, move it past them so later inserts don't collide
+SYNC_ID_SEQUENCE = (
+    "SELECT setval(pg_get_serial_sequence('articles', 'id'), max(id)) FROM articles "
+    "HAVING max(id) > COALESCE(pg_sequence_last_value("
+    "pg_get_serial_sequence('articles', 'id')::regclass), 0)"
+)
+
+
+class CatalogService:
+    def __init__(self, pool, cache: ArticleCache | None = None):
+        self.pool = pool
+        self.cache = cache
+
+    def import_articles(
+        self, lines: Iterable[str], format: str
+    ) -> CatalogImportResultDAO:
+        if self.pool:
+            reader = CatalogReader(lines, format)
+            try:
+                with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    cursor.execute(CREATE_STAGING_TABLE)
+                    stream = CopyStream(reader)
+                    try:
+                        cursor.copy_expert(COPY_INTO_STAGING_TABLE, stream)
+                    except psycopg2.Error:
+                        if stream.error:
+                            raise stream.error
+                        raise
+                    cursor.execute(MERGE_STAGING_TABLE)
+                    inserted, updated = cursor.fetchone()
+                    cursor.execute(SYNC_ID_SEQUENCE)
+                    connection.commit()
+                    note_write()
+                    if self.cache:
+                        self.cache.clear()
+                    return import_result(reader, inserted, updated)
+            except Exception as e:
+                raise e
+
+    def export_articles(
+        self,
+        file: BinaryIO,
+        columns: tuple[str, ...] = ARTICLE_COLUMNS,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_id: int | None = None,
+        max_id: int | None = None,
+    ) -> int:
+        if self.pool:
+            query, params = build_export_query(
+                columns, min_price, max_price, min_id, max_id
+            )
+            started = time.monotonic()
+            try:
+                with self.pool.connection() as connection:
+                    cursor = connection.cursor()
+                    cursor.copy_expert(
+                        export_statement(cursor.mogrify(query, params).decode()), file
+                    )
+                    rows = cursor.rowcount
+                log_export(rows, time.monotonic() - started)
+                return rows
+            except Exception as e:
+                raise e
+
+
+def log_export(rows: int, seconds: float) -> None:
+    logger.info(
+        f"Exported {rows} articles in {seconds:.2f}s "
+        f"({rows / max(seconds, 1e-9):.0f} rows/s)"
+    )
+
+
+def import_result(
+    reader: CatalogReader, inserted: int, updated: int
+) -> CatalogImportResultDAO:
+    return CatalogImportResultDAO(
+        rows_read=reader.rows_read,
+        rows_rejected=reader.rows_rejected,
+        inserted=inserted,
+        updated=updated,
+        seconds=reader.elapsed(),
+        errors=reader.errors,
+    )
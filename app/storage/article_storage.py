@@ -0,0 +1,115 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Iterator
+
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticleRows,
+)
+
+# Rows are tuples in ARTICLE_COLUMNS order, values are (first_name,
+# last_name, imageUrl, price) as in the article_insert statement
+ArticleRow = tuple
+ArticleValues = tuple[str, str, str | None, float]
+
+# The varchar(255) limit of the articles table, for backends without one
+MAX_TEXT_LENGTH = 255
+
+# ts_rank weights of the A (first name) and B (last name) labels
+SEARCH_WEIGHTS = (1.0, 0.4)
+
+
+class ArticleDataError(ValueError):
+    pass
+
+
+class ArticleStorage(ABC):
+    @abstractmethod
+    def exists(self, id: int) -> bool:
+        pass
+
+    @abstractmethod
+    def list_page(
+        self,
+        limit: int | None = None,
+        after: int | tuple | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> ArticleRows:
+        pass
+
+    @abstractmethod
+    def search(self, terms: str, limit: int, offset: int = 0) -> ArticleRows:
+        pass
+
+    @abstractmethod
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[ArticleRows]:
+        pass
+
+    @abstractmethod
+    def get(self, id: int) -> ArticleRow | None:
+        pass
+
+    @abstractmethod
+    def get_many(self, ids: list[int]) -> ArticleRows:
+        pass
+
+    @abstractmethod
+    def insert(self, values: ArticleValues) -> ArticleRow:
+        pass
+
+    @abstractmethod
+    def insert_many(
+        self, values: list[ArticleValues], page_size: int = 1000
+    ) -> list[ArticleInsertResultDAO]:
+        pass
+
+    @abstractmethod
+    def update(self, id: int, values: ArticleValues) -> ArticleRow | None:
+        pass
+
+    @abstractmethod
+    def delete(self, id: int) -> ArticleRow | None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def article_row(id: int, values: ArticleValues) -> ArticleRow:
+    first_name, last_name, image_url, price = values
+    return (id, image_url, first_name, last_name, price)
+
+
+def search_prefixes(terms: str) -> list[str]:
+    # terms is the to_tsquery form of build_search_terms: "word:* & word:*"
+    return [term.removesuffix(":*") for term in terms.split(" & ") if term]
+
+
+def search_words(row: ArticleRow) -> tuple[list[str], list[str]]:
+    # The words of the first and last name, as the simple text search
+    # configuration splits them
+    return tuple(re.findall(r"\w+", (name or "").lower()) for name in row[2:4])
+
+
+def search_rank(names: tuple[list[str], list[str]], prefixes: list[str]) -> float:
+    # Every prefix has to start a word of the first or last name. 0 means no match
+    rank = 0.0
+    for prefix in prefixes:
+        weights = [
+            weight
+            for words, weight in zip(names, SEARCH_WEIGHTS)
+            if any(word.startswith(prefix) for word in words)
+        ]
+        if not weights:
+            return 0.0
+        rank += max(weights)
+    return rank
+
+
+def check_values(values: ArticleValues) -> None:
+    for value in values[:3]:
+        if value is not None and len(value) > MAX_TEXT_LENGTH:
+            raise ArticleDataError(
+                f"value too long for type character varying({MAX_TEXT_LENGTH})"
+            )
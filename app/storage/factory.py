@@ -0,0 +1,34 @@
+import os
+
+from app.database.group_commit import GroupCommitWriter
+from app.database.replicas import ReplicaRouter
+from app.storage.article_storage import ArticleStorage
+from app.storage.memory_storage import InMemoryArticleStorage
+from app.storage.postgres_storage import PostgresArticleStorage
+from app.storage.sqlite_storage import SqliteArticleStorage
+
+STORAGE_CONFIG = {
+    # postgres, memory or sqlite. Only postgres keeps the catalog import and
+    # export, the async service mode and group commit
+    "backend": os.getenv("PYSHOP_STORAGE", "postgres"),
+    "sqlite_path": os.getenv("PYSHOP_SQLITE_PATH", ":memory:"),
+}
+
+STORAGE_BACKENDS = ("postgres", "memory", "sqlite")
+
+
+def create_article_storage(
+    pool,
+    writer: GroupCommitWriter | None = None,
+    replicas: ReplicaRouter | None = None,
+) -> ArticleStorage:
+    backend = STORAGE_CONFIG["backend"]
+    if backend == "postgres":
+        return PostgresArticleStorage(pool, writer, replicas)
+    if backend == "memory":
+        return InMemoryArticleStorage()
+    if backend == "sqlite":
+        return SqliteArticleStorage(STORAGE_CONFIG["sqlite_path"])
+    raise ValueError(
+        f"Unknown storage backend {backend!r}, expected one of {STORAGE_BACKENDS}"
+    )
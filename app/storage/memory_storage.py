@@ -0,0 +1,151 @@
+import bisect
+import heapq
+import itertools
+import threading
+from typing import Iterator
+
+from app.models.dao.article_model_dao import (
+    ARTICLE_COLUMNS,
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticleRows,
+)
+from app.storage.article_storage import (
+    ArticleDataError,
+    ArticleRow,
+    ArticleStorage,
+    ArticleValues,
+    article_row,
+    check_values,
+    search_prefixes,
+    search_rank,
+    search_words,
+)
+from app.util.article_query import ARTICLE_SORTS, SEARCH_CONFIG
+
+_COLUMN_INDEX = {column: index for index, column in enumerate(ARTICLE_COLUMNS)}
+
+
+class InMemoryArticleStorage(ArticleStorage):
+    # Articles live in a dict, a sorted id list serves the id ordered pages.
+    # Nothing survives a restart, it measures the app without database cost
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: dict[int, ArticleRow] = {}
+        self._ids: list[int] = []
+        # Name words per id, split once on write instead of on every search
+        self._words: dict[int, tuple[list[str], list[str]]] = {}
+        self._sequence = itertools.count(1)
+
+    def exists(self, id: int) -> bool:
+        return id in self._rows
+
+    def list_page(
+        self,
+        limit: int | None = None,
+        after: int | tuple | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> ArticleRows:
+        with self._lock:
+            if filters is None:
+                start = bisect.bisect_right(self._ids, after or 0)
+                end = None if limit is None else start + limit
+                ids = self._ids[start:end]
+                return ArticleRows([self._rows[id] for id in ids])
+            rows = [row for row in self._rows.values() if _matches(row, filters)]
+
+        indexes = [_COLUMN_INDEX[column] for column in ARTICLE_SORTS[filters.sort]]
+        descending = filters.order == "desc"
+        keyed = [(tuple(row[index] for index in indexes), row) for row in rows]
+        if after is not None:
+            after = tuple(after)
+            keyed = [
+                item
+                for item in keyed
+                if (item[0] < after if descending else item[0] > after)
+            ]
+        # Keys end with the id, so they are unique and rows are never compared
+        if limit is None:
+            keyed.sort(key=lambda item: item[0], reverse=descending)
+        elif descending:
+            keyed = heapq.nlargest(limit, keyed, key=lambda item: item[0])
+        else:
+            keyed = heapq.nsmallest(limit, keyed, key=lambda item: item[0])
+        return ArticleRows([row for _, row in keyed])
+
+    def search(self, terms: str, limit: int, offset: int = 0) -> ArticleRows:
+        prefixes = search_prefixes(terms)
+        with self._lock:
+            ids = list(self._ids)
+        matches = []
+        for id in ids:
+            words = self._words.get(id)
+            rank = search_rank(words, prefixes) if words else 0.0
+            if rank:
+                matches.append((rank, self._rows[id]))
+                if len(matches) == SEARCH_CONFIG["max_results"]:
+                    break
+        matches.sort(key=lambda match: (-match[0], match[1][0]))
+        return ArticleRows([row for _, row in matches[offset : offset + limit]])
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[ArticleRows]:
+        with self._lock:
+            ids = list(self._ids)
+        for start in range(0, len(ids), batch_size):
+            rows = [self._rows.get(id) for id in ids[start : start + batch_size]]
+            yield ArticleRows([row for row in rows if row is not None])
+
+    def get(self, id: int) -> ArticleRow | None:
+        return self._rows.get(id)
+
+    def get_many(self, ids: list[int]) -> ArticleRows:
+        return ArticleRows(
+            [self._rows[id] for id in dict.fromkeys(ids) if id in self._rows]
+        )
+
+    def insert(self, values: ArticleValues) -> ArticleRow:
+        check_values(values)
+        with self._lock:
+            id = next(self._sequence)
+            row = self._rows[id] = article_row(id, values)
+            self._words[id] = search_words(row)
+            # New ids are always the largest
+            self._ids.append(id)
+            return row
+
+    def insert_many(
+        self, values: list[ArticleValues], page_size: int = 1000
+    ) -> list[ArticleInsertResultDAO]:
+        results = []
+        for row in values:
+            try:
+                results.append(ArticleInsertResultDAO(id=self.insert(row)[0]))
+            except ArticleDataError as e:
+                results.append(ArticleInsertResultDAO(error=str(e)))
+        return results
+
+    def update(self, id: int, values: ArticleValues) -> ArticleRow | None:
+        check_values(values)
+        with self._lock:
+            if id not in self._rows:
+                return None
+            row = self._rows[id] = article_row(id, values)
+            self._words[id] = search_words(row)
+            return row
+
+    def delete(self, id: int) -> ArticleRow | None:
+        with self._lock:
+            row = self._rows.pop(id, None)
+            if row is not None:
+                del self._words[id]
+                del self._ids[bisect.bisect_left(self._ids, id)]
+            return row
+
+
+def _matches(row: ArticleRow, filters: ArticleFilterDAO) -> bool:
+    price, last_name = row[4], row[3]
+    return (
+        (filters.min_price is None or price >= filters.min_price)
+        and (filters.max_price is None or price <= filters.max_price)
+        and (filters.last_name is None or last_name == filters.last_name)
+    )
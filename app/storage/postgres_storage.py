@@ -0,0 +1,167 @@
+from typing import Iterator
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from app.database.group_commit import GroupCommitWriter
+from app.database.prepared_statements import execute_prepared
+from app.database.replicas import ReplicaRouter, note_write
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticleRows,
+)
+from app.storage.article_storage import ArticleRow, ArticleStorage, ArticleValues
+from app.util.article_query import (
+    SEARCH_CONFIG,
+    SEARCH_QUERY,
+    build_articles_query,
+)
+from app.util.converter import columns_from_description
+
+
+class PostgresArticleStorage(ArticleStorage):
+    def __init__(
+        self,
+        pool,
+        writer: GroupCommitWriter | None = None,
+        replicas: ReplicaRouter | None = None,
+    ):
+        self.pool = pool
+        self.writer = writer
+        self.replicas = replicas
+
+    def exists(self, id: int) -> bool:
+        with self._read_connection() as connection:
+            cursor = connection.cursor()
+            execute_prepared(cursor, "article_exists", (id,))
+            if cursor.fetchone():
+                return True
+            return False
+
+    def list_page(
+        self,
+        limit: int | None = None,
+        after: int | tuple | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> ArticleRows:
+        with self._read_connection() as connection:
+            cursor = connection.cursor()
+            if filters is not None:
+                # after is the keyset of the sort columns here
+                cursor.execute(*build_articles_query(filters, limit, after))
+            elif limit is None:
+                execute_prepared(cursor, "article_list_all")
+            else:
+                execute_prepared(cursor, "article_list", (after or 0, limit))
+            return ArticleRows(
+                cursor.fetchall(), columns_from_description(cursor.description)
+            )
+
+    def search(self, terms: str, limit: int, offset: int = 0) -> ArticleRows:
+        with self._read_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                SEARCH_QUERY,
+                (terms, SEARCH_CONFIG["max_results"], limit, offset),
+            )
+            return ArticleRows(
+                cursor.fetchall(),
+                columns_from_description(cursor.description),
+            )
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[ArticleRows]:
+        with self._read_connection() as connection:
+            cursor = connection.cursor(name="articles_stream")
+            cursor.itersize = batch_size
+            cursor.execute(
+                "SELECT id, imageUrl, first_name, last_name, price FROM articles ORDER BY id"
+            )
+            while rows := cursor.fetchmany(batch_size):
+                yield ArticleRows(rows, columns_from_description(cursor.description))
+            cursor.close()
+
+    def get(self, id: int) -> ArticleRow | None:
+        with self._read_connection() as connection:
+            cursor = connection.cursor()
+            execute_prepared(cursor, "article_get", (id,))
+            return cursor.fetchone()
+
+    def get_many(self, ids: list[int]) -> ArticleRows:
+        with self._read_connection() as connection:
+            cursor = connection.cursor()
+            execute_prepared(cursor, "article_get_many", (ids,))
+            return ArticleRows(
+                cursor.fetchall(), columns_from_description(cursor.description)
+            )
+
+    def insert(self, values: ArticleValues) -> ArticleRow:
+        return self._write("article_insert", values)
+
+    def insert_many(
+        self, values: list[ArticleValues], page_size: int = 1000
+    ) -> list[ArticleInsertResultDAO]:
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                rows = execute_values(
+                    cursor,
+                    "INSERT INTO articles (first_name, last_name, imageUrl, price) VALUES %s RETURNING id",
+                    values,
+                    page_size=page_size,
+                    fetch=True,
+                )
+                connection.commit()
+                note_write()
+                return [ArticleInsertResultDAO(id=row[0]) for row in rows]
+            except (psycopg2.DataError, psycopg2.IntegrityError):
+                connection.rollback()
+
+            # Some row was rejected: retry row by row in one transaction,
+            # with a savepoint per row so the others still get inserted
+            results = []
+            for row in values:
+                cursor.execute("SAVEPOINT bulk_article")
+                try:
+                    cursor.execute(
+                        "INSERT INTO articles (first_name, last_name, imageUrl, price) VALUES (%s, %s, %s, %s) RETURNING id",
+                        row,
+                    )
+                    results.append(ArticleInsertResultDAO(id=cursor.fetchone()[0]))
+                    cursor.execute("RELEASE SAVEPOINT bulk_article")
+                except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_article")
+                    results.append(ArticleInsertResultDAO(error=str(e).strip()))
+            connection.commit()
+            note_write()
+            return results
+
+    def update(self, id: int, values: ArticleValues) -> ArticleRow | None:
+        return self._write("article_update", (*values, id))
+
+    def delete(self, id: int) -> ArticleRow | None:
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            execute_prepared(cursor, "article_delete", (id,))
+            article_data = cursor.fetchone()
+            connection.commit()
+            note_write()
+            return article_data
+
+    def _read_connection(self):
+        if self.replicas is None:
+            return self.pool.connection()
+        return self.replicas.connection()
+
+    def _write(self, name: str, params: tuple):
+        # With a group commit writer the write shares its transaction with others
+        if self.writer is not None:
+            row = self.writer.submit(name, params)
+        else:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                execute_prepared(cursor, name, params)
+                row = cursor.fetchone()
+                connection.commit()
+        note_write()
+        return row
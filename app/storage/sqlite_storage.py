@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+from typing import Iterator
+
+from app.database.prepared_statements import ARTICLE_SELECT
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticleRows,
+)
+from app.storage.article_storage import (
+    ArticleDataError,
+    ArticleRow,
+    ArticleStorage,
+    ArticleValues,
+    article_row,
+    check_values,
+    search_prefixes,
+    search_rank,
+    search_words,
+)
+from app.util.article_query import SEARCH_CONFIG, build_articles_query
+
+# The indexes back the same sorts as the Postgres ones
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    imageUrl TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    price REAL
+);
+CREATE INDEX IF NOT EXISTS ix_articles_price_id ON articles (price, id);
+CREATE INDEX IF NOT EXISTS ix_articles_name_id ON articles (last_name, first_name, id);
+"""
+
+SQLITE_INSERT = (
+    "INSERT INTO articles (first_name, last_name, imageUrl, price) VALUES (?, ?, ?, ?)"
+)
+
+
+class SqliteArticleStorage(ArticleStorage):
+    # One connection shared by all threads, sqlite serializes writes anyway
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SQLITE_SCHEMA)
+
+    def exists(self, id: int) -> bool:
+        return self._fetchone("SELECT 1 FROM articles WHERE id = ?", (id,)) is not None
+
+    def list_page(
+        self,
+        limit: int | None = None,
+        after: int | tuple | None = None,
+        filters: ArticleFilterDAO | None = None,
+    ) -> ArticleRows:
+        if filters is not None:
+            query, params = build_articles_query(filters, limit, after)
+            return self._fetchall(query.replace("%s", "?"), params)
+        if limit is None:
+            return self._fetchall(f"{ARTICLE_SELECT} ORDER BY id")
+        return self._fetchall(
+            f"{ARTICLE_SELECT} WHERE id > ? ORDER BY id LIMIT ?", (after or 0, limit)
+        )
+
+    def search(self, terms: str, limit: int, offset: int = 0) -> ArticleRows:
+        # LIKE narrows the rows down, search_rank decides on word prefixes
+        prefixes = search_prefixes(terms)
+        conditions = " AND ".join(
+            ["lower(first_name || ' ' || last_name) LIKE ?"] * len(prefixes)
+        )
+        candidates = self._fetchall(
+            f"{ARTICLE_SELECT} WHERE {conditions} ORDER BY id",
+            [f"%{prefix}%" for prefix in prefixes],
+        )
+        matches = []
+        for row in candidates:
+            rank = search_rank(search_words(row), prefixes)
+            if rank:
+                matches.append((rank, row))
+                if len(matches) == SEARCH_CONFIG["max_results"]:
+                    break
+        matches.sort(key=lambda match: (-match[0], match[1][0]))
+        return ArticleRows([row for _, row in matches[offset : offset + limit]])
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[ArticleRows]:
+        # Keyset pages, so no cursor stays open while the caller consumes them
+        after = 0
+        while rows := self.list_page(batch_size, after):
+            yield rows
+            after = rows[-1][0]
+
+    def get(self, id: int) -> ArticleRow | None:
+        return self._fetchone(f"{ARTICLE_SELECT} WHERE id = ?", (id,))
+
+    def get_many(self, ids: list[int]) -> ArticleRows:
+        return self._fetchall(
+            f"{ARTICLE_SELECT} WHERE id IN ({', '.join(['?'] * len(ids))})", ids
+        )
+
+    def insert(self, values: ArticleValues) -> ArticleRow:
+        check_values(values)
+        with self._lock, self._connection:
+            id = self._connection.execute(SQLITE_INSERT, values).lastrowid
+        return article_row(id, values)
+
+    def insert_many(
+        self, values: list[ArticleValues], page_size: int = 1000
+    ) -> list[ArticleInsertResultDAO]:
+        # One transaction, rejected rows don't stop the others
+        results = []
+        with self._lock, self._connection:
+            for row in values:
+                try:
+                    check_values(row)
+                except ArticleDataError as e:
+                    results.append(ArticleInsertResultDAO(error=str(e)))
+                    continue
+                id = self._connection.execute(SQLITE_INSERT, row).lastrowid
+                results.append(ArticleInsertResultDAO(id=id))
+        return results
+
+    def update(self, id: int, values: ArticleValues) -> ArticleRow | None:
+        check_values(values)
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE articles SET first_name = ?, last_name = ?, imageUrl = ?, price = ? "
+                "WHERE id = ?",
+                (*values, id),
+            ).rowcount
+        return article_row(id, values) if updated else None
+
+    def delete(self, id: int) -> ArticleRow | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                f"{ARTICLE_SELECT} WHERE id = ?", (id,)
+            ).fetchone()
+            if row is not None:
+                self._connection.execute("DELETE FROM articles WHERE id = ?", (id,))
+        return row
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _fetchone(self, query: str, params=()) -> ArticleRow | None:
+        with self._lock:
+            return self._connection.execute(query, params).fetchone()
+
+    def _fetchall(self, query: str, params=()) -> ArticleRows:
+        with self._lock:
+            return ArticleRows(self._connection.execute(query, params).fetchall())
@@ -0,0 +1,85 @@
+import re
+
+from app.database.prepared_statements import ARTICLE_SELECT
+from app.models.dao.article_model_dao import ArticleFilterDAO
+
+# Sort keys end with the id so the order is total and can be continued with
+# a keyset cursor; each one is backed by a B-tree index of the same columns
+ARTICLE_SORTS = {
+    "id": ("id",),
+    "price": ("price", "id"),
+    "name": ("last_name", "first_name", "id"),
+}
+
+SEARCH_CONFIG = {
+    "max_results": 1000,
+    "max_terms": 8,
+}
+
+# Matches are collected through the GIN index first and capped, so ranking
+# never has to look at more than max_results rows however common the words are.
+# The cap keeps the matches with the lowest ids, like the other storages, so
+# every page ranks the same rows
+SEARCH_QUERY = """
+WITH query AS (
+    SELECT to_tsquery('simple', %s) AS terms
+), matches AS (
+    SELECT id, imageUrl, first_name, last_name, price, search_vector
+    FROM articles, query
+    WHERE search_vector @@ query.terms
+    ORDER BY id
+    LIMIT %s
+)
+SELECT id, imageUrl, first_name, last_name, price FROM matches, query
+ORDER BY ts_rank(search_vector, query.terms) DESC, id
+LIMIT %s OFFSET %s
+"""
+
+
+def build_articles_query(
+    filters: ArticleFilterDAO, limit: int | None = None, after: tuple | None = None
+) -> tuple[str, list]:
+    sort_columns = ARTICLE_SORTS[filters.sort]
+    direction = "DESC" if filters.order == "desc" else "ASC"
+
+    conditions, params = [], []
+    for condition, value in (
+        ("price >= %s", filters.min_price),
+        ("price <= %s", filters.max_price),
+        ("last_name = %s", filters.last_name),
+    ):
+        if value is not None:
+            conditions.append(condition)
+            params.append(value)
+
+    if after is not None:
+        # Row comparison so Postgres can start the index scan at the cursor
+        conditions.append(
+            f"({', '.join(sort_columns)}) {'<' if direction == 'DESC' else '>'} "
+            f"({', '.join(['%s'] * len(sort_columns))})"
+        )
+        params.extend(after)
+
+    query = ARTICLE_SELECT
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+    query += " ORDER BY " + ", ".join(
+        f"{column} {direction}" for column in sort_columns
+    )
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    return query, params
+
+
+def article_sort_key(row: dict, sort: str) -> dict:
+    return {column: row[column] for column in ARTICLE_SORTS[sort]}
+
+
+def build_search_terms(q: str) -> str | None:
+    # Only word characters reach to_tsquery, every word matches as a prefix
+    words = re.findall(r"\w+", q.lower())[: SEARCH_CONFIG["max_terms"]]
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
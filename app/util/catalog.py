@@ -0,0 +1,280 @@
+import codecs
+import csv
+import io
+import itertools
+import json
+import queue
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator
+
+from loguru import logger
+from pydantic import ValidationError
+
+from app.models.dao.article_model_dao import ARTICLE_COLUMNS
+from app.models.dao.catalog_model_dao import CatalogRowErrorDAO
+from app.models.dto.catalog_model_dto import ArticleImportRowDTO
+
+CATALOG_FORMATS = ("csv", "ndjson")
+CATALOG_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson"}
+
+CATALOG_CONFIG = {
+    "max_reported_errors": 100,
+    "progress_every": 100000,
+    "copy_batch_size": 1000,
+    "export_chunk_size": 64 * 1024,
+    "export_queue_size": 16,
+}
+
+
+class CatalogFormatError(ValueError):
+    pass
+
+
+def detect_catalog_format(format: str | None, filename: str | None = None) -> str:
+    if format is None and filename and "." in filename:
+        format = CATALOG_EXTENSIONS.get(filename.rsplit(".", 1)[-1].lower())
+    if format not in CATALOG_FORMATS:
+        raise CatalogFormatError(
+            f"Unknown catalog format, expected one of {', '.join(CATALOG_FORMATS)}"
+        )
+    return format
+
+
+def parse_export_columns(columns: str | None) -> tuple[str, ...]:
+    if not columns:
+        return ARTICLE_COLUMNS
+    selected = tuple(column.strip() for column in columns.split(",") if column.strip())
+    unknown = [column for column in selected if column not in ARTICLE_COLUMNS]
+    if unknown or not selected:
+        raise CatalogFormatError(
+            f"Unknown export columns {', '.join(unknown)}, "
+            f"expected any of {', '.join(ARTICLE_COLUMNS)}"
+        )
+    return selected
+
+
+def build_export_query(
+    columns: tuple[str, ...] = ARTICLE_COLUMNS,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_id: int | None = None,
+    max_id: int | None = None,
+) -> tuple[str, list]:
+    # Column names only ever come from ARTICLE_COLUMNS, the alias keeps the
+    # camel case header that the import expects
+    if any(column not in ARTICLE_COLUMNS for column in columns):
+        raise CatalogFormatError("Unknown export columns")
+    select = ", ".join(f'{column} AS "{column}"' for column in columns)
+
+    conditions, params = [], []
+    for condition, value in (
+        ("price >= %s", min_price),
+        ("price <= %s", max_price),
+        ("id >= %s", min_id),
+        ("id <= %s", max_id),
+    ):
+        if value is not None:
+            conditions.append(condition)
+            params.append(value)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    return f"SELECT {select} FROM articles{where} ORDER BY id", params
+
+
+def export_statement(query: str) -> str:
+    return f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)"
+
+
+def decode_lines(file: BinaryIO) -> Iterator[str]:
+    # Decodes line by line, a leading byte order mark is dropped
+    return codecs.iterdecode(file, "utf-8-sig")
+
+
+class CatalogReader:
+    def __init__(
+        self,
+        lines: Iterable[str],
+        format: str,
+        max_reported_errors: int = CATALOG_CONFIG["max_reported_errors"],
+        progress_every: int = CATALOG_CONFIG["progress_every"],
+    ):
+        self.lines = lines
+        self.format = format
+        self.max_reported_errors = max_reported_errors
+        self.progress_every = progress_every
+
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self.errors: list[CatalogRowErrorDAO] = []
+        self.started = time.monotonic()
+
+    def __iter__(self) -> Iterator[tuple]:
+        for line, record in self._records():
+            self.rows_read += 1
+            if self.rows_read % self.progress_every == 0:
+                logger.info(
+                    f"Read {self.rows_read} catalog rows "
+                    f"({self.rows_read / self.elapsed():.0f} rows/s)"
+                )
+
+            try:
+                if isinstance(record, json.JSONDecodeError):
+                    raise ValueError(f"Invalid JSON: {record}")
+                if not isinstance(record, dict):
+                    raise ValueError("Row is not an object")
+                row = ArticleImportRowDTO.model_validate(record)
+            except ValidationError as e:
+                self._reject(line, self._format_validation_error(e))
+                continue
+            except ValueError as e:
+                self._reject(line, str(e))
+                continue
+
+            yield (row.id, row.imageUrl, row.first_name, row.last_name, row.price)
+
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started, 1e-9)
+
+    def _records(self) -> Iterator[tuple[int, object]]:
+        if self.format == "csv":
+            reader = csv.DictReader(self.lines)
+            for record in reader:
+                # Empty numeric cells count as missing instead of invalid
+                yield reader.line_num, {
+                    column: value
+                    for column, value in record.items()
+                    if column is not None
+                    and not (value == "" and column in ("id", "price"))
+                }
+            return
+
+        for line, text in enumerate(self.lines, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except json.JSONDecodeError as e:
+                yield line, e
+
+    def _reject(self, line: int, error: str) -> None:
+        self.rows_rejected += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append(CatalogRowErrorDAO(line=line, error=error))
+
+    @staticmethod
+    def _format_validation_error(error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+
+
+def read_batch(rows: Iterator[tuple], size: int) -> list[tuple]:
+    return list(itertools.islice(rows, size))
+
+
+def staging_row(row: tuple) -> tuple:
+    # What FORCE_NOT_NULL makes of the CSV COPY: a missing text is stored as ''
+    id, image_url, first_name, last_name, price = row
+    return (id, image_url or "", first_name or "", last_name or "", price)
+
+
+class CopyStream(io.TextIOBase):
+    # File-like view for psycopg2's copy_expert: rows are encoded as CSV in
+    # small batches while COPY reads, so the upload never sits in memory whole
+    def __init__(
+        self, rows: Iterable[tuple], batch_size: int = CATALOG_CONFIG["copy_batch_size"]
+    ):
+        self.rows = iter(rows)
+        self.batch_size = batch_size
+        self.pending = ""
+        self.error: Exception | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.pending) < size:
+            try:
+                chunk = self._encode_batch()
+            except Exception as e:
+                # copy_expert only reports a failed read() as a database error
+                self.error = e
+                raise
+            if not chunk:
+                break
+            self.pending += chunk
+
+        if size < 0:
+            size = len(self.pending)
+        chunk, self.pending = self.pending[:size], self.pending[size:]
+        return chunk
+
+    def _encode_batch(self) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for _, row in zip(range(self.batch_size), self.rows):
+            writer.writerow(row)
+        return buffer.getvalue()
+
+
+class CopyPipeClosedError(Exception):
+    pass
+
+
+class CopyPipe:
+    # Write target for psycopg2's copy_expert running in another thread. COPY
+    # pushes one row per write, they are joined into larger chunks and handed
+    # over through a bounded queue, so a slow reader throttles the export
+    # instead of the whole table piling up in memory
+    _END = object()
+
+    def __init__(
+        self,
+        chunk_size: int = CATALOG_CONFIG["export_chunk_size"],
+        max_chunks: int = CATALOG_CONFIG["export_queue_size"],
+    ):
+        self.chunk_size = chunk_size
+        self.chunks = queue.Queue(max_chunks)
+        self.pending = bytearray()
+        self.closed = threading.Event()
+        self.error: Exception | None = None
+
+    def write(self, data: bytes) -> int:
+        self.pending += data
+        if len(self.pending) >= self.chunk_size:
+            self._put(bytes(self.pending))
+            self.pending.clear()
+        return len(data)
+
+    def finish(self, error: Exception | None = None) -> None:
+        try:
+            if error is None and self.pending:
+                self._put(bytes(self.pending))
+            self.error = error
+            self._put(self._END)
+        except CopyPipeClosedError:
+            pass
+
+    def close(self) -> None:
+        # Called by the reader, makes the next write abort the COPY
+        self.closed.set()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.chunks.get()
+            if chunk is self._END:
+                if self.error:
+                    raise self.error
+                return
+            yield chunk
+
+    def _put(self, item) -> None:
+        while not self.closed.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise CopyPipeClosedError("Export reader went away")
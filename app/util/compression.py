@@ -0,0 +1,330 @@
+import threading
+import zlib
+from typing import Callable
+
+import anyio.to_thread
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.cache.compressed_cache import CompressedBodyCache
+from app.models.stats.compression_stats_model import CompressionStatsModel
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Encodings in the server's order of preference, brotli and zstd are used when
+# their packages are installed. Levels trade CPU for size, bodies smaller than
+# min_size go out as they are. Compressing offload_size bytes or more runs on
+# a worker thread so the event loop keeps serving
+COMPRESSION_CONFIG = {
+    "enabled": True,
+    "encodings": ["zstd", "br", "gzip"],
+    "levels": {"zstd": 3, "br": 4, "gzip": 6},
+    "min_size": 1024,
+    "offload_size": 64 * 1024,
+    "cache_max_bytes": 32 * 1024 * 1024,
+}
+
+COMPRESSIBLE_TYPES = {"application/json", "application/x-ndjson", "text/csv"}
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+COMPRESSORS: dict[str, Callable] = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def negotiate_encoding(accept_encoding: str | None, encodings: list[str]) -> str | None:
+    # The highest q-value wins, ties go to the server's order
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(body) + compressor.finish()
+
+
+class CompressedStream:
+    # Flushes after every chunk, a streamed page reaches the client as soon as
+    # it was read instead of when the compressor's window fills
+    def __init__(self, owner: "ResponseCompressor", encoding: str):
+        self.owner = owner
+        self._compressor = COMPRESSORS[encoding](owner.levels[encoding])
+
+    async def compress(self, chunk: bytes, last: bool) -> bytes:
+        compressed = await self.owner._run(self._compress, chunk, last)
+        self.owner._count(len(chunk), len(compressed))
+        return compressed
+
+    def _compress(self, chunk: bytes, last: bool) -> bytes:
+        compressed = self._compressor.compress(chunk)
+        return compressed + (
+            self._compressor.finish() if last else self._compressor.flush()
+        )
+
+
+class ResponseCompressor:
+    def __init__(
+        self,
+        encodings: list[str],
+        levels: dict[str, int],
+        min_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        cache: CompressedBodyCache | None = None,
+    ):
+        unknown = [encoding for encoding in encodings if encoding not in COMPRESSORS]
+        if unknown:
+            raise ValueError(f"Unsupported content encodings: {', '.join(unknown)}")
+
+        self.encodings = encodings
+        self.levels = {encoding: levels[encoding] for encoding in encodings}
+        self.min_size = min_size
+        self.offload_size = offload_size
+        self.cache = cache or CompressedBodyCache()
+        self._lock = threading.Lock()
+
+        self._responses = 0
+        self._streams = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def negotiate(self, accept_encoding: str | None) -> str | None:
+        return negotiate_encoding(accept_encoding, self.encodings)
+
+    async def compress(self, body: bytes, encoding: str, etag: str | None) -> bytes:
+        # Bodies with an ETag are compressed once per encoding and reused
+        compressed = self.cache.get(etag, encoding) if etag else None
+        if compressed is None:
+            compressed = await self._run(
+                compress_body, body, encoding, self.levels[encoding]
+            )
+            if etag:
+                self.cache.set(etag, encoding, compressed)
+        with self._lock:
+            self._responses += 1
+        self._count(len(body), len(compressed))
+        return compressed
+
+    def stream(self, encoding: str) -> CompressedStream:
+        with self._lock:
+            self._streams += 1
+        return CompressedStream(self, encoding)
+
+    def stats(self) -> CompressionStatsModel:
+        with self._lock:
+            return CompressionStatsModel(
+                encodings=self.encodings,
+                levels=self.levels,
+                min_size=self.min_size,
+                responses=self._responses,
+                streams=self._streams,
+                bytes_in=self._bytes_in,
+                bytes_out=self._bytes_out,
+                cache_size=self.cache.size,
+                cache_bytes=self.cache.bytes,
+                cache_max_bytes=self.cache.max_bytes,
+                cache_hits=self.cache.hits,
+                cache_misses=self.cache.misses,
+                cache_evictions=self.cache.evictions,
+            )
+
+    async def _run(self, fn: Callable[..., bytes], data: bytes, *args) -> bytes:
+        # zlib, brotli and zstd release the GIL while they compress
+        if len(data) >= self.offload_size:
+            return await anyio.to_thread.run_sync(fn, data, *args)
+        return fn(data, *args)
+
+    def _count(self, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+
+
+class CompressionMiddleware:
+    # Plain ASGI middleware that compresses JSON, NDJSON and CSV bodies in the
+    # best encoding the client accepts. Streamed responses are compressed
+    # chunk by chunk, whole bodies are looked up by ETag first
+    def __init__(self, app, compressor: ResponseCompressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = (
+            self.compressor.negotiate(Headers(scope=scope).get("accept-encoding"))
+            if scope["method"] != "HEAD"
+            else None
+        )
+        start = None
+        stream = None
+
+        async def send_compressed(message):
+            nonlocal start, stream
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # Caches must keep the encodings apart, even when this one
+                # goes out uncompressed or not modified
+                if message["status"] == 304:
+                    headers.add_vary_header("Accept-Encoding")
+                if not self._compressible(headers):
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None or message["status"] == 204:
+                    await send(message)
+                    return
+                start = message
+                return
+
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                if body or not more_body:
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": await stream.compress(body, last=not more_body),
+                            "more_body": more_body,
+                        }
+                    )
+                return
+
+            headers = MutableHeaders(scope=start)
+            size = len(body) if not more_body else headers.get("content-length")
+            if size is not None and int(size) < self.compressor.min_size:
+                await send(start)
+                await send(message)
+                start = None
+                return
+
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The compressed bytes differ from the ones the ETag names
+                headers["ETag"] = "W/" + etag
+            if more_body:
+                stream = self.compressor.stream(encoding)
+                del headers["content-length"]
+                await send(start)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": await stream.compress(body, last=False),
+                        "more_body": True,
+                    }
+                )
+                return
+
+            compressed = await self.compressor.compress(body, encoding, etag)
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+            start = None
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(headers: MutableHeaders) -> bool:
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in COMPRESSIBLE_TYPES and "content-encoding" not in headers
+
+
+def create_response_compressor() -> ResponseCompressor | None:
+    if not COMPRESSION_CONFIG["enabled"]:
+        return None
+    encodings = [
+        encoding
+        for encoding in COMPRESSION_CONFIG["encodings"]
+        if encoding in COMPRESSORS
+    ]
+    missing = set(COMPRESSION_CONFIG["encodings"]) - set(encodings)
+    if missing:
+        logger.info(
+            f"Compression without {', '.join(sorted(missing))}, "
+            "the packages are not installed"
+        )
+    return ResponseCompressor(
+        encodings,
+        COMPRESSION_CONFIG["levels"],
+        COMPRESSION_CONFIG["min_size"],
+        COMPRESSION_CONFIG["offload_size"],
+        CompressedBodyCache(COMPRESSION_CONFIG["cache_max_bytes"]),
+    )
@@ -1,33 +1,100 @@
+from collections.abc import Mapping
+from typing import Iterable
+
 from loguru import logger
+from pydantic import TypeAdapter
 
-from app.models.dao.article_model_dao import ArticlesModelDAO, ArticleModelDAO
+from app.models.dao.article_model_dao import (
+    ARTICLE_COLUMNS,
+    ArticlesModelDAO,
+    ArticleModelDAO,
+)
 from app.models.dto.article_model_dto import (
     ArticlesModelDTO,
     ArticleModelDTO,
     ArticleModelDTOEndpoint,
+    ArticleRowDTO,
+    ArticlesPageDTO,
 )
 
+FIELD_BY_COLUMN = {field.lower(): field for field in ArticleModelDTO.model_fields}
+ARTICLE_ROW_ADAPTER = TypeAdapter(ArticleRowDTO)
+ARTICLE_ROWS_ADAPTER = TypeAdapter(list[ArticleRowDTO])
+ARTICLES_PAGE_ADAPTER = TypeAdapter(ArticlesPageDTO)
+
+
+def columns_from_description(description) -> tuple[str, ...]:
+    # Postgres folds unquoted identifiers, so imageUrl comes back as imageurl
+    return tuple(
+        FIELD_BY_COLUMN.get(column[0].lower(), column[0]) for column in description
+    )
+
+
+def rows_to_dicts(rows: Iterable, columns: Iterable[str] | None = None) -> list[dict]:
+    columns = tuple(columns or getattr(rows, "columns", None) or ARTICLE_COLUMNS)
+    return [
+        row if isinstance(row, Mapping) else dict(zip(columns, row)) for row in rows
+    ]
+
+
+def validate_article_rows(
+    rows: Iterable, columns: Iterable[str] | None = None
+) -> list[ArticleRowDTO]:
+    try:
+        return ARTICLE_ROWS_ADAPTER.validate_python(rows_to_dicts(rows, columns))
+    except Exception as e:
+        logger.error(f"Error validating article rows: {e}")
+        raise e
+
+
+def dump_articles_page(articles: list[ArticleRowDTO], next: str | None = None) -> bytes:
+    return ARTICLES_PAGE_ADAPTER.dump_json({"articles": articles, "next": next})
+
+
+def dump_article_rows(articles: list[ArticleRowDTO]) -> bytes:
+    return ARTICLE_ROWS_ADAPTER.dump_json(articles)
+
+
+def dump_article_row(article: ArticleRowDTO) -> bytes:
+    return ARTICLE_ROW_ADAPTER.dump_json(article)
+
 
 def convert_articles_model_dao_to_articles_model_dto(
-    articles_dao: ArticlesModelDAO,
+    articles_dao: ArticlesModelDAO, columns: Iterable[str] | None = None
 ) -> ArticlesModelDTO | None:
     try:
-        articles_dto = ArticlesModelDTO(articles=[])
-        for article_dao in articles_dao:
-            article_dto = ArticleModelDTO(
-                id=article_dao[0],
-                imageUrl=article_dao[1],
-                first_name=article_dao[2],
-                last_name=article_dao[3],
-                price=article_dao[4],
-            )
-            articles_dto.articles.append(article_dto)
-        return articles_dto
+        return ArticlesModelDTO.model_validate(
+            {"articles": rows_to_dicts(articles_dao, columns)}
+        )
     except Exception as e:
         logger.error(f"Error converting articles model dao to articles model dto: {e}")
         raise e
 
 
+def convert_list_to_article_model_dto(
+    article_list: Iterable, columns: Iterable[str] | None = None
+) -> ArticleModelDTO | None:
+    try:
+        return ArticleModelDTO.model_validate(
+            dict(zip(columns or ARTICLE_COLUMNS, article_list))
+        )
+    except Exception as e:
+        logger.error(f"Error converting list to article model dto: {e}")
+        raise e
+
+
+def convert_row_to_article_model_dao(
+    row: Iterable | None, columns: Iterable[str] | None = None
+) -> ArticleModelDAO | None:
+    if row is None:
+        return None
+    try:
+        return ArticleModelDAO(**dict(zip(columns or ARTICLE_COLUMNS, row)))
+    except Exception as e:
+        logger.error(f"Error converting row to article model dao: {e}")
+        raise e
+
+
 def convert_article_model_dao_to_article_model_dto(
     article_dao: ArticleModelDAO,
 ) -> ArticleModelDTO | None:
@@ -0,0 +1,50 @@
+import base64
+import json
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(values: dict) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(values, dict):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def decode_article_cursor(cursor: str) -> int:
+    values = decode_cursor(cursor)
+    after_id = values.get("id")
+    if not isinstance(after_id, int) or isinstance(after_id, bool):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return after_id
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    offset = decode_cursor(cursor).get("offset")
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return offset
+
+
+def decode_keyset_cursor(cursor: str, columns: tuple[str, ...]) -> tuple:
+    # One value per sort column, the id always comes last as the tie breaker
+    values = decode_cursor(cursor)
+    key = tuple(values.get(column) for column in columns)
+    for column, value in zip(columns, key):
+        if isinstance(value, bool) or not isinstance(
+            value, int if column == "id" else (int, float, str)
+        ):
+            raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return key
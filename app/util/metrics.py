@@ -0,0 +1,277 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from pydantic import BaseModel
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Sharded:
+    # Every thread records into its own dict, keyed by the tuple of label
+    # values, so the hot path takes no lock. Shards are only summed on scrape
+    def __init__(self, name: str, help: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append(values)
+            return values
+
+    def _snapshots(self) -> list[list[tuple]]:
+        with self._lock:
+            shards = list(self._shards)
+        return [list(shard.items()) for shard in shards]
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> Iterable[tuple[str, tuple, float]]:
+        totals: dict[tuple, float] = {}
+        for items in self._snapshots():
+            for labels, value in items:
+                totals[labels] = totals.get(labels, 0) + value
+        for labels, value in totals.items():
+            yield self.name, _label_pairs(self.labels, labels), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def add(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, amount)
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...],
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, labels: tuple, value: float) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # One count per bucket, one for +Inf, then the sum
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> Iterable[tuple[str, tuple, float]]:
+        totals: dict[tuple, list] = {}
+        for items in self._snapshots():
+            for labels, series in items:
+                total = totals.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    total[index] += value
+
+        for labels, series in totals.items():
+            pairs = _label_pairs(self.labels, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                yield f"{self.name}_bucket", pairs + (("le", bound),), cumulative
+            yield f"{self.name}_sum", pairs, series[-1]
+            yield f"{self.name}_count", pairs, cumulative
+
+
+class StatsCollector:
+    # Publishes every numeric field of a stats model as a gauge on scrape
+    kind = "gauge"
+
+    def __init__(self, prefix: str, help: str, stats: Callable[[], BaseModel]):
+        self.prefix = prefix
+        self.help = help
+        self.stats = stats
+
+    def collect_families(self) -> Iterable[tuple[str, str, str, list]]:
+        for field, value in self.stats().model_dump().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield f"{self.prefix}_{field}", f"{self.help}: {field}", self.kind, [
+                    (f"{self.prefix}_{field}", (), value)
+                ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: list = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            if isinstance(metric, StatsCollector):
+                families = metric.collect_families()
+            else:
+                families = [
+                    (metric.name, metric.help, metric.kind, list(metric.collect()))
+                ]
+            for name, help, kind, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for sample, labels, value in samples:
+                    lines.append(f"{sample}{_format_labels(labels)} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_pairs(names: tuple[str, ...], values: tuple) -> tuple:
+    return tuple(zip(names, values))
+
+
+def _format_labels(pairs: tuple) -> str:
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{name}="{_escape(_format(value))}"' for name, value in pairs)
+        + "}"
+    )
+
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = MetricsRegistry()
+
+HTTP_REQUESTS = METRICS.register(
+    Counter(
+        "pyshop_http_requests_total",
+        "HTTP requests by route and status code",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUEST_DURATION = METRICS.register(
+    Histogram(
+        "pyshop_http_request_duration_seconds",
+        "Time until the response was sent, by route",
+        ("method", "route"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = METRICS.register(
+    Gauge(
+        "pyshop_http_requests_in_flight",
+        "HTTP requests being handled",
+        ("method",),
+    )
+)
+SERVICE_DURATION = METRICS.register(
+    Histogram(
+        "pyshop_service_duration_seconds",
+        "Time spent in service methods, database round trips included",
+        ("service", "method"),
+    )
+)
+
+
+def timed(service: str) -> Callable:
+    # Records the duration of a service method, coroutine or plain function
+    def decorator(fn):
+        labels = (service, fn.__name__)
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    SERVICE_DURATION.observe(labels, time.perf_counter() - started)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                SERVICE_DURATION.observe(labels, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware: the route template is only known once the router
+    # matched, it is read from the scope after the response went out
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.add((method,), 1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.add((method,), -1)
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.observe((method, path), time.perf_counter() - started)
+            HTTP_REQUESTS.inc((method, path, status))
@@ -0,0 +1,178 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from starlette.responses import Response
+
+from app.database.db_connection import POOL_CONFIG
+from app.models.stats.offload_stats_model import OffloadStatsModel
+from app.models.stats.stream_stats_model import StreamStatsModel
+
+T = TypeVar("T")
+
+# Threads beyond the pool size would only wait for a connection, and the
+# queue stays short so an overloaded server answers 503 instead of timing out.
+# Streamed bodies keep a connection until their last chunk, they may take half
+# of the pool so short requests still get the rest
+OFFLOAD_CONFIG = {
+    "workers": POOL_CONFIG["max_size"],
+    "queue_size": 4 * POOL_CONFIG["max_size"],
+    "streams": max(1, POOL_CONFIG["max_size"] // 2),
+    "retry_after": 1,
+}
+
+
+class OffloadRejectedError(Exception):
+    pass
+
+
+class Offload:
+    # Runs blocking calls on worker threads without blocking the event loop.
+    # At most workers + queue_size calls are admitted, the rest are rejected
+    def __init__(self, workers: int = 10, queue_size: int = 40):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="offload"
+        )
+        self._lock = threading.Lock()
+
+        self._admitted = 0
+        self._running = 0
+        self._peak = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._admitted >= self.workers + self.queue_size:
+                self._rejected += 1
+                raise OffloadRejectedError(
+                    f"{self._admitted} calls in flight, offload queue is full"
+                )
+            self._admitted += 1
+            self._submitted += 1
+            self._peak = max(self._peak, self._admitted)
+
+        # Context variables, e.g. loguru's contextualize, follow the call
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, self._call, fn, *args)
+        except RuntimeError:
+            self._release(started=False)
+            raise
+        return await asyncio.wrap_future(future)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> OffloadStatsModel:
+        with self._lock:
+            return OffloadStatsModel(
+                workers=self.workers,
+                queue_size=self.queue_size,
+                running=self._running,
+                queued=self._admitted - self._running,
+                peak=self._peak,
+                submitted=self._submitted,
+                completed=self._completed,
+                rejected=self._rejected,
+            )
+
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        # Released here and not by the awaiting request, a cancelled request
+        # keeps its slot until the thread is actually free again
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            self._release(started=True)
+
+    def _release(self, started: bool) -> None:
+        with self._lock:
+            self._admitted -= 1
+            if started:
+                self._running -= 1
+                self._completed += 1
+
+
+class StreamLimit:
+    # Admits streamed responses for the whole life of their body, the offload
+    # only sees the handler that starts one. Work feeding a stream, e.g. a
+    # COPY writing into a pipe, runs on threads of its own, one per stream
+    def __init__(self, limit: int = 5):
+        self.limit = limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=limit, thread_name_prefix="stream"
+        )
+        self._lock = threading.Lock()
+
+        self._open = 0
+        self._peak = 0
+        self._admitted = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def admit(self) -> None:
+        with self._lock:
+            if self._open >= self.limit:
+                self._rejected += 1
+                raise OffloadRejectedError(f"{self._open} streams open, limit reached")
+            self._open += 1
+            self._admitted += 1
+            self._peak = max(self._peak, self._open)
+
+    def release(self) -> None:
+        with self._lock:
+            self._open -= 1
+            self._completed += 1
+
+    def submit(self, fn: Callable[..., T], *args) -> Future:
+        return self._executor.submit(fn, *args)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> StreamStatsModel:
+        with self._lock:
+            return StreamStatsModel(
+                limit=self.limit,
+                open=self._open,
+                peak=self._peak,
+                admitted=self._admitted,
+                completed=self._completed,
+                rejected=self._rejected,
+            )
+
+
+class AdmittedResponse(Response):
+    # Sends the wrapped response and gives its stream slot back once the body
+    # is sent, failed or the client went away
+    def __init__(self, response: Response, release: Callable[[], None]):
+        self.response = response
+        self.release = release
+        self.status_code = response.status_code
+        self.raw_headers = response.raw_headers
+        self.background = response.background
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            self.response.background = self.background
+            await self.response(scope, receive, send)
+        finally:
+            self.release()
+
+
+def create_offload(workers: int | None = None) -> Offload:
+    return Offload(
+        workers=workers or OFFLOAD_CONFIG["workers"],
+        queue_size=OFFLOAD_CONFIG["queue_size"],
+    )
+
+
+def create_stream_limit() -> StreamLimit:
+    return StreamLimit(limit=OFFLOAD_CONFIG["streams"])
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import Response
+
+
+def dump_model(model: BaseModel) -> bytes:
+    return to_json(model)
+
+
+class ModelResponse(Response):
+    # Writes the bytes pydantic-core produces instead of going through dicts
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return dump_model(content)
@@ -0,0 +1,98 @@
+import argparse
+import time
+
+from app.models.dao.article_model_dao import ARTICLE_COLUMNS, ArticleRows
+from app.models.dto.article_model_dto import ArticleModelDTO, ArticlesModelDTO
+from app.util.converter import (
+    convert_articles_model_dao_to_articles_model_dto,
+    dump_articles_page,
+    validate_article_rows,
+)
+from app.util.responses import dump_model
+
+
+def build_rows(size: int) -> ArticleRows:
+    return ArticleRows(
+        (
+            id,
+            f"https://cdn.example.com/articles/{id}.jpg",
+            f"First {id}",
+            "Last",
+            id + 0.99,
+        )
+        for id in range(1, size + 1)
+    )
+
+
+def per_row_models(rows) -> bytes:
+    # The converter before batch conversion: one validated DTO appended per tuple
+    articles = ArticlesModelDTO(articles=[])
+    for row in rows:
+        articles.articles.append(
+            ArticleModelDTO(
+                id=row[0],
+                imageUrl=row[1],
+                first_name=row[2],
+                last_name=row[3],
+                price=row[4],
+            )
+        )
+    return dump_model(articles)
+
+
+def batch_models(rows) -> bytes:
+    return dump_model(convert_articles_model_dao_to_articles_model_dto(rows))
+
+
+def trusted_construct(rows) -> bytes:
+    columns = getattr(rows, "columns", ARTICLE_COLUMNS)
+    articles = [
+        ArticleModelDTO.model_construct(**dict(zip(columns, row))) for row in rows
+    ]
+    return dump_model(ArticlesModelDTO.model_construct(articles=articles, next=None))
+
+
+def batch_rows(rows) -> bytes:
+    return dump_articles_page(validate_article_rows(rows))
+
+
+STRATEGIES = {
+    "per-row models (before)": per_row_models,
+    "batch model validation": batch_models,
+    "trusted model_construct": trusted_construct,
+    "batch row validation": batch_rows,
+}
+
+
+def measure(function, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert result rows to a JSON response body with each strategy"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows = build_rows(size)
+        assert len({function(rows[:100]) for function in STRATEGIES.values()}) == 1
+        baseline = None
+        print(f"{size} rows")
+        for name, function in STRATEGIES.items():
+            elapsed = measure(function, rows, args.repeat)
+            baseline = baseline or elapsed
+            print(f"  {name:26} {elapsed * 1000:10.1f} ms  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from benchmarks.loadtest.runner import compare, run
+from benchmarks.loadtest.seed import seed_articles, seed_articles_over_http
+from benchmarks.loadtest.workload import PROFILES
+
+
+def write(result: dict, output: str | None):
+    text = json.dumps(result, indent=2)
+    if output:
+        with open(output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+def seed_command(args):
+    if args.url:
+        created = seed_articles_over_http(args.url, args.articles)
+        print(f"articles: {created} created", file=sys.stderr)
+        return
+    before, after = seed_articles(args.articles, args.reset)
+    print(f"articles: {before} -> {after}", file=sys.stderr)
+
+
+def run_command(args):
+    result = asyncio.run(
+        run(
+            args.url,
+            args.profile,
+            args.concurrency,
+            args.duration,
+            args.warmup,
+            args.seed,
+            args.timeout,
+        )
+    )
+    write(result, args.output)
+    print(
+        f"{args.profile}: {result['rps']} rps, "
+        f"p50 {result['latency_ms']['p50']} ms, "
+        f"p99 {result['latency_ms']['p99']} ms, "
+        f"{result['errors']} errors",
+        file=sys.stderr,
+    )
+
+
+def compare_command(args):
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+    write(compare(before, after), args.output)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest",
+        description="Seed the database and load test a running PyShop API",
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    seed = subparsers.add_parser(
+        "seed", help="Top the articles table up to a number of articles"
+    )
+    seed.add_argument("--articles", type=int, default=10000)
+    seed.add_argument(
+        "--reset", action="store_true", help="Empty the table and restart ids first"
+    )
+    seed.add_argument(
+        "--url",
+        help="Add the articles through a running server instead, "
+        "e.g. one on the memory or sqlite storage",
+    )
+    seed.set_defaults(run=seed_command)
+
+    load = subparsers.add_parser("run", help="Drive a workload, print a JSON report")
+    load.add_argument("--url", default="http://localhost:8000")
+    load.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    load.add_argument("--concurrency", type=int, default=32)
+    load.add_argument("--duration", type=float, default=30.0, help="Seconds measured")
+    load.add_argument(
+        "--warmup", type=float, default=5.0, help="Seconds run before measuring"
+    )
+    load.add_argument("--seed", type=int, default=1)
+    load.add_argument("--timeout", type=float, default=10.0)
+    load.add_argument("--output", help="Write the report here instead of stdout")
+    load.set_defaults(run=run_command)
+
+    diff = subparsers.add_parser("compare", help="Compare two reports")
+    diff.add_argument("before")
+    diff.add_argument("after")
+    diff.add_argument("--output")
+    diff.set_defaults(run=compare_command)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import asyncio
+import contextlib
+import json
+import math
+import platform
+import random
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from benchmarks.loadtest.workload import OPERATIONS, PROFILES, WorkerState
+
+
+class Sample:
+    __slots__ = ("operation", "status", "latency", "error")
+
+    def __init__(self, operation: str, status: int, latency: float, error: str | None):
+        self.operation = operation
+        self.status = status
+        self.latency = latency
+        self.error = error
+
+    @property
+    def failed(self) -> bool:
+        # 4xx are answers to the workload (e.g. a deleted id), not server errors
+        return self.error is not None or self.status >= 500
+
+
+def percentile(latencies: list[float], p: float) -> float:
+    # Nearest rank on sorted latencies
+    if not latencies:
+        return 0.0
+    return latencies[max(math.ceil(p / 100 * len(latencies)) - 1, 0)]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    latencies = sorted(sample.latency for sample in samples)
+    errors = sum(sample.failed for sample in samples)
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 6) if samples else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            "mean": (
+                round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0
+            ),
+        },
+        "status_codes": {
+            str(status): count
+            for status, count in sorted(
+                Counter(sample.status for sample in samples).items()
+            )
+        },
+    }
+
+
+def report(samples: list[Sample], elapsed: float, config: dict) -> dict:
+    by_operation = defaultdict(list)
+    for sample in samples:
+        by_operation[sample.operation].append(sample)
+    errors = Counter(sample.error for sample in samples if sample.error)
+    return {
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "elapsed": round(elapsed, 3),
+        **summarize(samples, elapsed),
+        "exceptions": dict(errors.most_common()),
+        "operations": {
+            operation: summarize(by_operation[operation], elapsed)
+            for operation in sorted(by_operation)
+        },
+    }
+
+
+async def article_ids(client: httpx.AsyncClient) -> list[int]:
+    # Ids need not be contiguous, reads pick from the ones that exist
+    response = await client.get("/articles", params={"stream": "ndjson"})
+    response.raise_for_status()
+    ids = sorted(json.loads(line)["id"] for line in response.text.splitlines())
+    if not ids:
+        raise SystemExit("No articles found, seed the database first")
+    return ids
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    state: WorkerState,
+    profile: dict[str, int],
+    measure_from: float,
+    stop_at: float,
+    samples: list[Sample],
+):
+    operations = list(profile)
+    weights = list(profile.values())
+    while True:
+        started = time.perf_counter()
+        if started >= stop_at:
+            return
+        operation = state.rng.choices(operations, weights)[0]
+        status, error = 0, None
+        try:
+            response = await OPERATIONS[operation](client, state)
+            status = response.status_code
+        except Exception as e:
+            error = type(e).__name__
+        finished = time.perf_counter()
+        if started >= measure_from:
+            samples.append(Sample(operation, status, finished - started, error))
+
+
+async def cleanup(client: httpx.AsyncClient, states: list[WorkerState]):
+    # Drops the articles the run created so the next run starts from the
+    # same catalog
+    for state in states:
+        for id in state.created:
+            try:
+                await client.delete(f"/article/{id}")
+            except httpx.HTTPError:
+                pass
+        state.created.clear()
+
+
+async def run(
+    url: str,
+    profile: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+    timeout: float,
+) -> dict:
+    # One client per worker, so each keeps its own connection and cookies
+    # like a separate user would (e.g. read-your-writes pinning)
+    async with contextlib.AsyncExitStack() as stack:
+        clients = [
+            await stack.enter_async_context(
+                httpx.AsyncClient(
+                    base_url=url,
+                    timeout=timeout,
+                    limits=httpx.Limits(max_connections=1),
+                )
+            )
+            for _ in range(concurrency)
+        ]
+        ids = await article_ids(clients[0])
+        states = [
+            WorkerState(random.Random(seed * 1000 + index), ids)
+            for index in range(concurrency)
+        ]
+        samples: list[Sample] = []
+        measure_from = time.perf_counter() + warmup
+        stop_at = measure_from + duration
+        try:
+            await asyncio.gather(
+                *(
+                    worker(
+                        client,
+                        state,
+                        PROFILES[profile],
+                        measure_from,
+                        stop_at,
+                        samples,
+                    )
+                    for client, state in zip(clients, states)
+                )
+            )
+            elapsed = time.perf_counter() - measure_from
+        finally:
+            await cleanup(clients[0], states)
+
+    return report(
+        samples,
+        elapsed,
+        {
+            "url": url,
+            "profile": profile,
+            "concurrency": concurrency,
+            "duration": duration,
+            "warmup": warmup,
+            "seed": seed,
+            "timeout": timeout,
+            "articles": len(ids),
+        },
+    )
+
+
+def compare(before: dict, after: dict) -> dict:
+    def delta(a: float, b: float) -> dict:
+        return {
+            "before": a,
+            "after": b,
+            "change": round((b - a) / a * 100, 2) if a else None,
+        }
+
+    def totals(a: dict, b: dict) -> dict:
+        return {
+            "rps": delta(a["rps"], b["rps"]),
+            "error_rate": delta(a["error_rate"], b["error_rate"]),
+            **{
+                f"latency_{key}_ms": delta(a["latency_ms"][key], b["latency_ms"][key])
+                for key in ("p50", "p95", "p99")
+            },
+        }
+
+    return {
+        "total": totals(before, after),
+        "operations": {
+            operation: totals(before["operations"][operation], stats)
+            for operation, stats in after["operations"].items()
+            if operation in before["operations"]
+        },
+    }
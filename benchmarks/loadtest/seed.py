@@ -0,0 +1,55 @@
+import httpx
+import psycopg2
+
+from app.database.db_connection import DATABASE_CONFIG
+
+# Rows are a pure function of their position, so every seeded database holds
+# the same catalog: 500 last names, prices spread over 0-999.99
+SEED_ARTICLES = """
+INSERT INTO articles (first_name, last_name, imageUrl, price)
+SELECT
+    'Load' || n,
+    'Name' || (n %% 500),
+    'https://cdn.example.com/articles/' || n || '.jpg',
+    (n * 7919 %% 100000) / 100.0
+FROM generate_series(%s, %s) AS n
+"""
+
+
+def seed_articles(count: int, reset: bool = False) -> tuple[int, int]:
+    # Tops the table up to count articles, returns (before, after)
+    connection = psycopg2.connect(**DATABASE_CONFIG)
+    try:
+        with connection:
+            cursor = connection.cursor()
+            if reset:
+                cursor.execute("TRUNCATE articles RESTART IDENTITY")
+            cursor.execute("SELECT count(*) FROM articles")
+            before = cursor.fetchone()[0]
+            if before < count:
+                cursor.execute(SEED_ARTICLES, (before + 1, count))
+            cursor.execute("ANALYZE articles")
+        return before, max(before, count)
+    finally:
+        connection.close()
+
+
+def seed_articles_over_http(url: str, count: int, batch_size: int = 1000) -> int:
+    # For storage backends without a database server: the same articles as
+    # SEED_ARTICLES, added through the bulk endpoint of a running server
+    created = 0
+    with httpx.Client(base_url=url, timeout=60.0) as client:
+        for start in range(1, count + 1, batch_size):
+            batch = [
+                {
+                    "first_name": f"Load{n}",
+                    "last_name": f"Name{n % 500}",
+                    "imageUrl": f"https://cdn.example.com/articles/{n}.jpg",
+                    "price": n * 7919 % 100000 / 100,
+                }
+                for n in range(start, min(start + batch_size, count + 1))
+            ]
+            response = client.post("/articles/bulk", json=batch)
+            response.raise_for_status()
+            created += response.json()["created"]
+    return created
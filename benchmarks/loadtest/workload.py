@@ -0,0 +1,195 @@
+import random
+
+import httpx
+
+# Request weights per profile. Writes only touch articles the same worker
+# created, so the seeded catalog stays the same between runs
+PROFILES = {
+    "read": {
+        "health": 1,
+        "get_article": 40,
+        "list_articles": 12,
+        "list_filtered": 10,
+        "search": 10,
+        "lookup": 8,
+        "export": 1,
+        "stream": 1,
+        "metrics": 1,
+    },
+    "mixed": {
+        "health": 1,
+        "get_article": 30,
+        "list_articles": 10,
+        "list_filtered": 8,
+        "search": 8,
+        "lookup": 6,
+        "create": 8,
+        "update": 6,
+        "delete": 4,
+        "bulk_create": 1,
+        "import": 1,
+        "export": 1,
+        "stream": 1,
+        "metrics": 1,
+    },
+    "write": {
+        "create": 10,
+        "update": 8,
+        "delete": 6,
+        "bulk_create": 1,
+        "import": 1,
+    },
+}
+
+
+class WorkerState:
+    def __init__(self, rng: random.Random, ids: list[int]):
+        self.rng = rng
+        self.ids = ids
+        self.created: list[int] = []
+
+    def seeded_id(self) -> int:
+        return self.rng.choice(self.ids)
+
+    def article(self) -> dict:
+        n = self.rng.randint(1, 1_000_000)
+        return {
+            "imageUrl": f"https://cdn.example.com/load/{n}.jpg",
+            "first_name": f"Written{n}",
+            "last_name": f"Name{n % 500}",
+            "price": round(self.rng.uniform(0, 1000), 2),
+        }
+
+
+async def health(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    return await client.get("/health")
+
+
+async def get_article(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    return await client.get(f"/article/{state.seeded_id()}")
+
+
+async def list_articles(
+    client: httpx.AsyncClient, state: WorkerState
+) -> httpx.Response:
+    # Every other call follows the cursor to the second page, which is not
+    # served from the same cache entry as the first
+    response = await client.get("/articles", params={"limit": 100})
+    if state.rng.random() < 0.5 or response.status_code != 200:
+        return response
+    next = response.json().get("next")
+    if not next:
+        return response
+    return await client.get("/articles", params={"limit": 100, "after": next})
+
+
+async def list_filtered(
+    client: httpx.AsyncClient, state: WorkerState
+) -> httpx.Response:
+    low = state.rng.randint(0, 900)
+    return await client.get(
+        "/articles",
+        params={
+            "limit": 50,
+            "min_price": low,
+            "max_price": low + 100,
+            "sort": state.rng.choice(["price", "name", "id"]),
+            "order": state.rng.choice(["asc", "desc"]),
+        },
+    )
+
+
+async def search(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    q = state.rng.choice(
+        [f"load{state.rng.randint(1, 999)}", f"name{state.rng.randint(0, 499)}"]
+    )
+    return await client.get("/articles/search", params={"q": q, "limit": 20})
+
+
+async def lookup(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    ids = [state.seeded_id() for _ in range(20)]
+    return await client.post("/articles/lookup", json={"ids": ids})
+
+
+async def create(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    response = await client.post("/article", json=state.article())
+    if response.status_code == 200:
+        state.created.append(response.json()["id"])
+    return response
+
+
+async def update(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    if not state.created:
+        return await create(client, state)
+    id = state.rng.choice(state.created)
+    return await client.put(f"/article/{id}", json=state.article())
+
+
+async def delete(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    if not state.created:
+        return await create(client, state)
+    id = state.created.pop(state.rng.randrange(len(state.created)))
+    return await client.delete(f"/article/{id}")
+
+
+async def bulk_create(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    response = await client.post(
+        "/articles/bulk", json=[state.article() for _ in range(10)]
+    )
+    if response.status_code == 200:
+        state.created.extend(
+            result["id"] for result in response.json()["results"] if result["id"]
+        )
+    return response
+
+
+async def import_catalog(
+    client: httpx.AsyncClient, state: WorkerState
+) -> httpx.Response:
+    # Rewrites articles of this worker, so imports never grow the table
+    if not state.created:
+        return await create(client, state)
+    lines = ["id,imageUrl,first_name,last_name,price"]
+    for id in state.created[-10:]:
+        article = state.article()
+        lines.append(
+            f"{id},{article['imageUrl']},{article['first_name']},"
+            f"{article['last_name']},{article['price']}"
+        )
+    return await client.post(
+        "/articles/import",
+        files={"file": ("load.csv", "\n".join(lines).encode(), "text/csv")},
+    )
+
+
+async def export(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    low = state.seeded_id()
+    return await client.get(
+        "/articles/export", params={"min_id": low, "max_id": low + 500}
+    )
+
+
+async def stream(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    return await client.get("/articles", params={"stream": "ndjson"})
+
+
+async def metrics(client: httpx.AsyncClient, state: WorkerState) -> httpx.Response:
+    return await client.get("/metrics")
+
+
+OPERATIONS = {
+    "health": health,
+    "get_article": get_article,
+    "list_articles": list_articles,
+    "list_filtered": list_filtered,
+    "search": search,
+    "lookup": lookup,
+    "create": create,
+    "update": update,
+    "delete": delete,
+    "bulk_create": bulk_create,
+    "import": import_catalog,
+    "export": export,
+    "stream": stream,
+    "metrics": metrics,
+}
@@ -0,0 +1,69 @@
+import argparse
+import statistics
+import time
+
+import psycopg2
+
+from app.database.db_connection import DATABASE_CONFIG, ConnectionPool
+from app.database.prepared_statements import PreparingConnection
+from app.services.articles_service import ArticlesService
+
+
+def plain_connection():
+    return psycopg2.connect(**DATABASE_CONFIG)
+
+
+def preparing_connection():
+    return psycopg2.connect(**DATABASE_CONFIG, connection_factory=PreparingConnection)
+
+
+def measure(connect, ids: list[int], repeat: int) -> list[float]:
+    pool = ConnectionPool(min_size=1, max_size=1, connect=connect)
+    pool.open()
+    service = ArticlesService(pool)
+    try:
+        timings = []
+        for _ in range(repeat):
+            for id in ids:
+                started = time.perf_counter()
+                service.get_article(id)
+                timings.append(time.perf_counter() - started)
+        return timings
+    finally:
+        pool.close()
+
+
+def percentile(timings: list[float], fraction: float) -> float:
+    return sorted(timings)[int(len(timings) * fraction)] * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare get_article latency with and without prepared statements "
+        "(needs the database from DATABASE_CONFIG)"
+    )
+    parser.add_argument("--ids", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ids = list(range(1, args.ids + 1))
+    measure(preparing_connection, ids[:10], 1)
+
+    before = measure(plain_connection, ids, args.repeat)
+    after = measure(preparing_connection, ids, args.repeat)
+
+    print(f"get_article calls per variant: {len(before)}")
+    for label, timings in (("plain SQL", before), ("PREPARE/EXECUTE", after)):
+        print(
+            f"{label:16} p50 {percentile(timings, 0.5):7.1f} us   "
+            f"p99 {percentile(timings, 0.99):7.1f} us   "
+            f"mean {statistics.mean(timings) * 1_000_000:7.1f} us"
+        )
+    print(
+        f"p50 saved: {percentile(before, 0.5) - percentile(after, 0.5):.1f} us "
+        f"({percentile(before, 0.5) / percentile(after, 0.5):.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import json
+import timeit
+
+from starlette.responses import JSONResponse
+
+from app.models.dto.article_model_dto import ArticleModelDTO, ArticlesModelDTO
+from app.util.responses import ModelResponse
+
+
+def build_payload(size: int) -> ArticlesModelDTO:
+    return ArticlesModelDTO(
+        articles=[
+            ArticleModelDTO(
+                id=id,
+                imageUrl=f"https://cdn.example.com/articles/{id}.jpg",
+                first_name=f"First {id}",
+                last_name=f"Last {id % 500}",
+                price=id % 1000 + 0.99,
+            )
+            for id in range(1, size + 1)
+        ]
+    )
+
+
+def round_trip_response(payload: ArticlesModelDTO) -> bytes:
+    return JSONResponse(content=json.loads(payload.model_dump_json())).body
+
+
+def model_response(payload: ArticlesModelDTO) -> bytes:
+    return ModelResponse(content=payload).body
+
+
+def measure(function, payload, number: int, repeat: int) -> float:
+    timings = timeit.repeat(lambda: function(payload), number=number, repeat=repeat)
+    return min(timings) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the JSON round trip with direct pydantic-core bytes"
+    )
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = build_payload(args.size)
+    assert round_trip_response(payload) == model_response(payload)
+
+    before = measure(round_trip_response, payload, args.number, args.repeat)
+    after = measure(model_response, payload, args.number, args.repeat)
+
+    print(f"articles per response: {args.size}")
+    print(f"json.loads + JSONResponse: {before * 1000:8.2f} ms/request")
+    print(f"ModelResponse:             {after * 1000:8.2f} ms/request")
+    print(
+        f"saved per request:         {(before - after) * 1000:8.2f} ms ({before / after:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import fnmatch
+
+import pytest
+
+from app.cache.article_cache import (
+    InMemoryArticleCache,
+    InvalidationLog,
+    RedisArticleCache,
+)
+from app.models.dao.article_model_dao import ArticleModelDAO
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, px=None):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in self.values if fnmatch.fnmatch(key, match)]
+
+
+def make_article(id: int) -> ArticleModelDAO:
+    return ArticleModelDAO(id=id, first_name="John", last_name="Doe", price=100)
+
+
+##################################################################### Tests for InMemoryArticleCache ########################################################################
+
+
+def test_in_memory_cache_counts_hits_and_misses():
+    cache = InMemoryArticleCache(max_size=2)
+    cache.set(1, make_article(1))
+
+    assert cache.get(1).id == 1
+    assert cache.get(2) is None
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryArticleCache(max_size=2)
+    cache.set(1, make_article(1))
+    cache.set(2, make_article(2))
+    cache.get(1)
+    cache.set(3, make_article(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+    assert cache.stats().evictions == 1
+
+
+def test_in_memory_cache_expires_entries_after_ttl():
+    clock = FakeClock()
+    cache = InMemoryArticleCache(max_size=2, ttl=10, clock=clock)
+    cache.set(1, make_article(1))
+
+    clock.now = 10
+
+    assert cache.get(1) is None
+    assert cache.stats().expirations == 1
+    assert cache.stats().size == 0
+
+
+def test_in_memory_cache_delete_and_clear():
+    cache = InMemoryArticleCache(max_size=2)
+    cache.set(1, make_article(1))
+    cache.set(2, make_article(2))
+
+    cache.delete(1)
+    assert cache.get(1) is None
+
+    cache.clear()
+    assert cache.get(2) is None
+
+
+def test_in_memory_cache_skips_set_after_invalidation_since_generation():
+    cache = InMemoryArticleCache(max_size=2)
+    generation = cache.generation()
+    cache.delete(1)
+
+    cache.set(1, make_article(1), generation)
+    cache.set(2, make_article(2), generation)
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+
+    cache.set(1, make_article(1), cache.generation())
+    assert cache.get(1) is not None
+
+    generation = cache.generation()
+    cache.clear()
+    cache.set(2, make_article(2), generation)
+    assert cache.get(2) is None
+
+
+def test_invalidation_log_treats_forgotten_ids_as_changed():
+    log = InvalidationLog(max_size=1)
+    generation = log.generation()
+    log.invalidate(1)
+    log.invalidate(2)
+
+    assert log.changed_since(1, generation)
+    assert log.changed_since(3, generation)
+    assert not log.changed_since(3, log.generation())
+
+
+def test_in_memory_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        InMemoryArticleCache(max_size=0)
+
+
+##################################################################### Tests for RedisArticleCache ########################################################################
+
+
+def test_redis_cache_round_trips_articles():
+    cache = RedisArticleCache(FakeRedis())
+    cache.set(1, make_article(1))
+
+    assert cache.get(1) == make_article(1)
+    assert cache.get(2) is None
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+def test_redis_cache_clear_only_removes_own_keys():
+    client = FakeRedis()
+    client.set("other", "value")
+    cache = RedisArticleCache(client)
+    cache.set(1, make_article(1))
+
+    cache.clear()
+
+    assert cache.get(1) is None
+    assert client.get("other") == "value"
+
+
+def test_redis_cache_skips_set_after_invalidation_since_generation():
+    client = FakeRedis()
+    cache = RedisArticleCache(client)
+    generation = cache.generation()
+    cache.delete(1)
+
+    cache.set(1, make_article(1), generation)
+
+    assert client.values == {}
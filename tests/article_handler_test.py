@@ -1,13 +1,26 @@
+import asyncio
+import json
+
 import pytest
+from starlette.responses import Response
 from starlette.testclient import TestClient
 
 from app.handlers.article_handler import ArticleHandler
+from app import main
 from app.main import app
+from app.models.dao.article_model_dao import (
+    ArticleFilterDAO,
+    ArticleInsertResultDAO,
+    ArticleModelDAO,
+)
 from app.models.dto.article_model_dto import (
     ArticlesModelDTO,
     ArticleModelDTO,
     ArticleModelDTOEndpoint,
 )
+from app.util.converter import convert_article_model_dao_to_article_model_dto
+from app.util.cursor import decode_article_cursor, decode_cursor, encode_cursor
+from app.util.offload import OffloadRejectedError
 
 client = TestClient(app)
 
@@ -54,7 +67,7 @@ def test_get_articles_handler_returns_success_when_articles_exist(
     assert response.status_code == 200
     assert response.body.decode() == (
         '{"articles":[{"id":1,"imageUrl":"http://example.com/image.jpg",'
-        '"first_name":"John","last_name":"Doe","price":100.0}]}'
+        '"first_name":"John","last_name":"Doe","price":100.0}],"next":null}'
     )
 
 
@@ -159,7 +172,9 @@ def test_create_article_handler_success(article_handler, mocker):
     mocker.patch.object(
         article_handler.service,
         "create_article",
-        return_value=None,
+        return_value=ArticleModelDAO(
+            id=7, first_name="John", last_name="Doe", price=100
+        ),
     )
 
     response = article_handler.create_article_handler(article)
@@ -167,7 +182,7 @@ def test_create_article_handler_success(article_handler, mocker):
     assert response.status_code == 200
     assert (
         response.body.decode()
-        == '{"imageUrl":"","first_name":"John","last_name":"Doe","price":100.0}'
+        == '{"id":7,"imageUrl":"","first_name":"John","last_name":"Doe","price":100.0}'
     )
 
 
@@ -195,16 +210,35 @@ def test_update_article_handler_returns_success_when_updated(article_handler, mo
     mocker.patch.object(
         article_handler.service,
         "update_article",
-        return_value=None,
+        return_value=ArticleModelDAO(
+            id=1, first_name="Jane", last_name="Doe", price=100
+        ),
     )
 
     response = article_handler.update_article_handler(1, article)
 
     assert response.status_code == 200
     assert response.body.decode() == (
-        '{"imageUrl":"",' '"first_name":"Jane","last_name":"Doe","price":100.0}'
+        '{"id":1,"imageUrl":"",' '"first_name":"Jane","last_name":"Doe","price":100.0}'
+    )
+
+
+def test_update_article_handler_returns_not_found_when_no_row_matched(
+    article_handler, mocker
+):
+    article = ArticleModelDTOEndpoint(first_name="Jane", last_name="Doe", price=100)
+
+    mocker.patch.object(
+        article_handler.service,
+        "update_article",
+        return_value=None,
     )
 
+    response = article_handler.update_article_handler(999, article)
+
+    assert response.status_code == 404
+    assert response.body.decode() == '{"message":"Article not found"}'
+
 
 def test_update_article_handler_returns_internal_server_error_on_exception(
     article_handler, mocker
@@ -230,7 +264,9 @@ def test_delete_article_handler_returns_success_when_deleted(article_handler, mo
     mocker.patch.object(
         article_handler.service,
         "delete_article",
-        return_value=None,
+        return_value=ArticleModelDAO(
+            id=1, first_name="John", last_name="Doe", price=100
+        ),
     )
 
     response = article_handler.delete_article_handler(1)
@@ -248,12 +284,6 @@ def test_delete_article_handler_returns_not_found_when_id_is_invalid(
         return_value=None,
     )
 
-    mocker.patch.object(
-        article_handler.service,
-        "exists_article_with_id",
-        return_value=False,
-    )
-
     response = article_handler.delete_article_handler(999)
 
     assert response.status_code == 404
@@ -273,3 +303,428 @@ def test_delete_article_handler_returns_internal_server_error_on_exception(
 
     assert response.status_code == 500
     assert response.body.decode() == '{"message":"Internal Server Error"}'
+
+
+##################################################################### Tests for get_articles_handler pagination ########################################################################
+
+
+def test_get_articles_handler_returns_next_cursor_when_more_articles_exist(
+    article_handler, mocker
+):
+    articles_dao = [
+        (1, "http://example.com/image1.jpg", "John", "Doe", 100),
+        (2, "http://example.com/image2.jpg", "Jane", "Doe", 150),
+        (3, "http://example.com/image3.jpg", "Jake", "Doe", 200),
+    ]
+    get_all_articles = mocker.patch.object(
+        article_handler.service, "get_all_articles", return_value=articles_dao
+    )
+
+    response = article_handler.get_articles_handler(limit=2)
+    body = json.loads(response.body)
+
+    get_all_articles.assert_called_once_with(3, None)
+    assert response.status_code == 200
+    assert [article["id"] for article in body["articles"]] == [1, 2]
+    assert decode_article_cursor(body["next"]) == 2
+
+
+def test_get_articles_handler_returns_no_next_cursor_on_last_page(
+    article_handler, mocker
+):
+    articles_dao = [(3, "http://example.com/image3.jpg", "Jake", "Doe", 200)]
+    get_all_articles = mocker.patch.object(
+        article_handler.service, "get_all_articles", return_value=articles_dao
+    )
+
+    response = article_handler.get_articles_handler(
+        limit=2, after=encode_cursor({"id": 2})
+    )
+
+    get_all_articles.assert_called_once_with(3, 2)
+    assert response.status_code == 200
+    assert json.loads(response.body)["next"] is None
+
+
+def test_get_articles_handler_returns_bad_request_on_invalid_cursor(
+    article_handler, mocker
+):
+    get_all_articles = mocker.patch.object(article_handler.service, "get_all_articles")
+
+    response = article_handler.get_articles_handler(limit=2, after="not-a-cursor")
+
+    assert response.status_code == 400
+    get_all_articles.assert_not_called()
+
+
+##################################################################### Tests for stream_articles_handler ########################################################################
+
+
+def stream_body(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect()).decode()
+
+
+def test_stream_articles_handler_streams_ndjson(article_handler, mocker):
+    mocker.patch.object(
+        article_handler.service,
+        "iter_articles",
+        return_value=iter(
+            [
+                [(1, "http://example.com/image1.jpg", "John", "Doe", 100)],
+                [(2, "http://example.com/image2.jpg", "Jane", "Doe", 150)],
+            ]
+        ),
+    )
+
+    response = article_handler.stream_articles_handler("ndjson")
+
+    assert response.media_type == "application/x-ndjson"
+    assert stream_body(response) == (
+        '{"id":1,"imageUrl":"http://example.com/image1.jpg","first_name":"John","last_name":"Doe","price":100.0}\n'
+        '{"id":2,"imageUrl":"http://example.com/image2.jpg","first_name":"Jane","last_name":"Doe","price":150.0}\n'
+    )
+
+
+def test_stream_articles_handler_streams_json_array(article_handler, mocker):
+    mocker.patch.object(
+        article_handler.service,
+        "iter_articles",
+        return_value=iter(
+            [
+                [(1, "http://example.com/image1.jpg", "John", "Doe", 100)],
+                [(2, "http://example.com/image2.jpg", "Jane", "Doe", 150)],
+            ]
+        ),
+    )
+
+    response = article_handler.stream_articles_handler("json")
+
+    body = json.loads(stream_body(response))
+    assert [article["id"] for article in body["articles"]] == [1, 2]
+
+
+def test_stream_articles_handler_streams_empty_catalog(article_handler, mocker):
+    mocker.patch.object(article_handler.service, "iter_articles", return_value=iter([]))
+
+    response = article_handler.stream_articles_handler("json")
+
+    assert stream_body(response) == '{"articles":[]}'
+
+
+def test_stream_articles_handler_returns_internal_server_error_on_exception(
+    article_handler, mocker
+):
+    mocker.patch.object(
+        article_handler.service,
+        "iter_articles",
+        side_effect=Exception("Database error"),
+    )
+
+    response = article_handler.stream_articles_handler("ndjson")
+
+    assert response.status_code == 500
+
+
+##################################################################### Tests for conditional GET ########################################################################
+
+
+def test_get_article_handler_returns_not_modified_for_matching_etag(
+    article_handler, mocker
+):
+    article = ArticleModelDAO(id=1, first_name="John", last_name="Doe", price=100)
+    mocker.patch.object(article_handler.service, "get_article", return_value=article)
+    etag = article_handler.get_article_handler(1).headers["etag"]
+
+    response = article_handler.get_article_handler(1, if_none_match=etag)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.body == b""
+
+
+def test_get_article_handler_reuses_rendered_body_for_cached_article(
+    article_handler, mocker
+):
+    article = ArticleModelDAO(id=1, first_name="John", last_name="Doe", price=100)
+    mocker.patch.object(article_handler.service, "get_article", return_value=article)
+    convert = mocker.patch(
+        "app.handlers.article_handler.convert_article_model_dao_to_article_model_dto",
+        wraps=convert_article_model_dao_to_article_model_dto,
+    )
+
+    first = article_handler.get_article_handler(1)
+    second = article_handler.get_article_handler(1)
+
+    assert first.body == second.body
+    convert.assert_called_once()
+
+
+def test_get_articles_handler_returns_not_modified_for_matching_etag(
+    article_handler, mocker
+):
+    articles_dao = [(1, "http://example.com/image.jpg", "John", "Doe", 100)]
+    mocker.patch.object(
+        article_handler.service, "get_all_articles", return_value=articles_dao
+    )
+    etag = article_handler.get_articles_handler(limit=10).headers["etag"]
+
+    response = article_handler.get_articles_handler(limit=10, if_none_match=etag)
+
+    assert response.status_code == 304
+
+
+##################################################################### Tests for create_articles_handler ########################################################################
+
+
+def test_create_articles_handler_reports_result_per_item(article_handler, mocker):
+    articles = [
+        ArticleModelDTOEndpoint(first_name="John", last_name="Doe", price=100),
+        ArticleModelDTOEndpoint(first_name="Jane", last_name="Doe", price=150),
+    ]
+    mocker.patch.object(
+        article_handler.service,
+        "create_articles",
+        return_value=[
+            ArticleInsertResultDAO(id=7),
+            ArticleInsertResultDAO(error="value too long"),
+        ],
+    )
+
+    response = article_handler.create_articles_handler(articles)
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {
+        "created": 1,
+        "failed": 1,
+        "results": [
+            {"index": 0, "id": 7, "error": None},
+            {"index": 1, "id": None, "error": "value too long"},
+        ],
+    }
+
+
+def test_create_articles_handler_returns_bad_request_for_empty_list(
+    article_handler, mocker
+):
+    create_articles = mocker.patch.object(article_handler.service, "create_articles")
+
+    response = article_handler.create_articles_handler([])
+
+    assert response.status_code == 400
+    create_articles.assert_not_called()
+
+
+def test_create_articles_handler_returns_internal_server_error_on_exception(
+    article_handler, mocker
+):
+    mocker.patch.object(
+        article_handler.service,
+        "create_articles",
+        side_effect=Exception("Database error"),
+    )
+
+    response = article_handler.create_articles_handler(
+        [ArticleModelDTOEndpoint(first_name="John", last_name="Doe", price=100)]
+    )
+
+    assert response.status_code == 500
+
+
+##################################################################### Tests for get_articles_handler filters ########################################################################
+
+
+def test_get_articles_handler_passes_filters_and_returns_keyset_cursor(
+    article_handler, mocker
+):
+    articles_dao = [
+        (5, "", "John", "Doe", 20.5),
+        (2, "", "Jane", "Doe", 15),
+        (9, "", "Jake", "Doe", 10),
+    ]
+    get_all_articles = mocker.patch.object(
+        article_handler.service, "get_all_articles", return_value=articles_dao
+    )
+    filters = ArticleFilterDAO(min_price=10, sort="price", order="desc")
+
+    response = article_handler.get_articles_handler(2, None, None, filters)
+    body = json.loads(response.body)
+
+    get_all_articles.assert_called_once_with(3, None, filters)
+    assert [article["id"] for article in body["articles"]] == [5, 2]
+    assert decode_cursor(body["next"]) == {"price": 15.0, "id": 2}
+
+
+def test_get_articles_handler_decodes_keyset_cursor_for_sort(article_handler, mocker):
+    get_all_articles = mocker.patch.object(
+        article_handler.service, "get_all_articles", return_value=[]
+    )
+    filters = ArticleFilterDAO(sort="name")
+    cursor = encode_cursor({"last_name": "Doe", "first_name": "Jo", "id": 4})
+
+    article_handler.get_articles_handler(2, cursor, None, filters)
+
+    get_all_articles.assert_called_once_with(3, ("Doe", "Jo", 4), filters)
+
+
+def test_get_articles_handler_rejects_cursor_of_other_sort(article_handler, mocker):
+    get_all_articles = mocker.patch.object(article_handler.service, "get_all_articles")
+
+    response = article_handler.get_articles_handler(
+        2, encode_cursor({"id": 4}), None, ArticleFilterDAO(sort="price")
+    )
+
+    assert response.status_code == 400
+    get_all_articles.assert_not_called()
+
+
+##################################################################### Tests for lookup_articles_handler ########################################################################
+
+
+def test_lookup_articles_handler_keeps_requested_order_and_lists_missing(
+    article_handler, mocker
+):
+    get_articles = mocker.patch.object(
+        article_handler.service,
+        "get_articles",
+        return_value={
+            1: ArticleModelDAO(id=1, first_name="John", last_name="Doe", price=100),
+            3: ArticleModelDAO(id=3, first_name="Jake", last_name="Doe", price=7),
+        },
+    )
+
+    response = article_handler.lookup_articles_handler([3, 2, 1, 3])
+    body = json.loads(response.body)
+
+    get_articles.assert_called_once_with([3, 2, 1])
+    assert response.status_code == 200
+    assert [article["id"] for article in body["articles"]] == [3, 1]
+    assert body["missing"] == [2]
+
+
+def test_lookup_articles_handler_returns_internal_server_error_on_exception(
+    article_handler, mocker
+):
+    mocker.patch.object(
+        article_handler.service, "get_articles", side_effect=Exception("Database error")
+    )
+
+    response = article_handler.lookup_articles_handler([1])
+
+    assert response.status_code == 500
+
+
+##################################################################### Tests for search_articles_handler ########################################################################
+
+
+def test_search_articles_handler_returns_ranked_page_and_offset_cursor(
+    article_handler, mocker
+):
+    search_articles = mocker.patch.object(
+        article_handler.service,
+        "search_articles",
+        return_value=[
+            (5, "", "John", "Doe", 20.5),
+            (2, "", "Jo", "Doe", 15),
+            (9, "", "Joe", "Doe", 10),
+        ],
+    )
+
+    response = article_handler.search_articles_handler("jo doe", 2)
+    body = json.loads(response.body)
+
+    search_articles.assert_called_once_with("jo:* & doe:*", 3, 0)
+    assert response.status_code == 200
+    assert [article["id"] for article in body["articles"]] == [5, 2]
+    assert decode_cursor(body["next"]) == {"offset": 2}
+
+
+def test_search_articles_handler_returns_empty_page_without_matches(
+    article_handler, mocker
+):
+    mocker.patch.object(article_handler.service, "search_articles", return_value=[])
+
+    response = article_handler.search_articles_handler("nobody", 2)
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {"articles": [], "next": None}
+
+
+def test_search_articles_handler_stops_at_result_cap(article_handler, mocker):
+    search_articles = mocker.patch.object(
+        article_handler.service, "search_articles", return_value=[]
+    )
+
+    article_handler.search_articles_handler("jo", 20, encode_cursor({"offset": 990}))
+    search_articles.assert_called_once_with("jo:*", 11, 990)
+
+    response = article_handler.search_articles_handler(
+        "jo", 20, encode_cursor({"offset": 1000})
+    )
+    assert json.loads(response.body) == {"articles": [], "next": None}
+    response = article_handler.search_articles_handler(
+        "jo", 20, encode_cursor({"offset": 5000})
+    )
+    assert json.loads(response.body) == {"articles": [], "next": None}
+    assert search_articles.call_count == 1
+
+
+def test_search_articles_handler_has_no_next_page_past_result_cap(
+    article_handler, mocker
+):
+    mocker.patch.object(
+        article_handler.service,
+        "search_articles",
+        return_value=[(id, "", "Jo", "Doe", 1.0) for id in range(11)],
+    )
+
+    response = article_handler.search_articles_handler(
+        "jo", 20, encode_cursor({"offset": 990})
+    )
+    body = json.loads(response.body)
+
+    assert len(body["articles"]) == 10
+    assert body["next"] is None
+
+
+@pytest.mark.parametrize("q, after", [("'&!", None), ("jo", "not-a-cursor")])
+def test_search_articles_handler_rejects_bad_input(article_handler, mocker, q, after):
+    search_articles = mocker.patch.object(article_handler.service, "search_articles")
+
+    response = article_handler.search_articles_handler(q, 20, after)
+
+    assert response.status_code == 400
+    search_articles.assert_not_called()
+
+
+##################################################################### Tests for offloaded endpoints ########################################################################
+
+
+def test_endpoint_returns_service_unavailable_when_offload_is_full(mocker):
+    mocker.patch.object(
+        main.offload, "run", mocker.AsyncMock(side_effect=OffloadRejectedError("full"))
+    )
+
+    response = client.get("/article/1")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_group_commit_writes_are_admitted_apart_from_reads(mocker):
+    write_offload = mocker.Mock()
+    write_offload.run = mocker.AsyncMock(side_effect=OffloadRejectedError("full"))
+    mocker.patch.object(main, "write_offload", write_offload)
+    read = mocker.patch.object(
+        main.offload, "run", mocker.AsyncMock(return_value=Response(status_code=204))
+    )
+
+    response = client.put(
+        "/article/1", json={"first_name": "John", "last_name": "Doe", "price": 1}
+    )
+
+    assert response.status_code == 503
+    assert client.get("/article/1").status_code == 204
+    read.assert_awaited_once()
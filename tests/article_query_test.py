@@ -0,0 +1,124 @@
+import psycopg2
+import pytest
+
+from app.database.db_connection import DATABASE_CONFIG
+from app.models.dao.article_model_dao import ArticleFilterDAO
+from app.util.article_query import (
+    SEARCH_QUERY,
+    article_sort_key,
+    build_articles_query,
+    build_search_terms,
+)
+
+
+def test_build_articles_query_turns_filters_into_parameters():
+    query, params = build_articles_query(
+        ArticleFilterDAO(min_price=10, max_price=20, last_name="Doe"), limit=11
+    )
+
+    assert query == (
+        "SELECT id, imageUrl, first_name, last_name, price FROM articles "
+        "WHERE price >= %s AND price <= %s AND last_name = %s ORDER BY id ASC LIMIT %s"
+    )
+    assert params == [10, 20, "Doe", 11]
+
+
+def test_build_articles_query_continues_descending_sort_after_keyset():
+    query, params = build_articles_query(
+        ArticleFilterDAO(sort="price", order="desc"), limit=5, after=(9.5, 12)
+    )
+
+    assert query.endswith(
+        "WHERE (price, id) < (%s, %s) ORDER BY price DESC, id DESC LIMIT %s"
+    )
+    assert params == [9.5, 12, 5]
+
+
+def test_article_sort_key_uses_sort_columns():
+    row = {"id": 3, "imageUrl": "", "first_name": "Jo", "last_name": "Doe", "price": 1}
+
+    assert article_sort_key(row, "name") == {
+        "last_name": "Doe",
+        "first_name": "Jo",
+        "id": 3,
+    }
+
+
+@pytest.mark.parametrize(
+    "q, terms",
+    [
+        ("John", "john:*"),
+        ("  jo   DOE ", "jo:* & doe:*"),
+        ("o'brien & !x", "o:* & brien:* & x:*"),
+        ("' & | !", None),
+        ("a b c d e f g h i j", "a:* & b:* & c:* & d:* & e:* & f:* & g:* & h:*"),
+    ],
+)
+def test_build_search_terms_keeps_only_words_as_prefixes(q, terms):
+    assert build_search_terms(q) == terms
+
+
+##################################################################### Index usage against a real database ########################################################################
+
+
+@pytest.fixture
+def database_cursor():
+    try:
+        connection = psycopg2.connect(**DATABASE_CONFIG, connect_timeout=2)
+    except psycopg2.OperationalError:
+        pytest.skip("No database available")
+
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT count(*) FROM pg_indexes WHERE tablename = 'articles' "
+        "AND indexname IN ('ix_articles_price_id', 'ix_articles_last_name_first_name_id')"
+    )
+    if cursor.fetchone()[0] != 2:
+        connection.close()
+        pytest.skip("Article indexes missing, run alembic upgrade head")
+
+    # Small test tables are cheaper to scan sequentially, this checks that the
+    # filters can be served by the indexes at all
+    cursor.execute("SET enable_seqscan = off")
+    yield cursor
+    connection.rollback()
+    connection.close()
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        (ArticleFilterDAO(min_price=10, max_price=20), "ix_articles_price_id"),
+        (ArticleFilterDAO(sort="price", order="desc"), "ix_articles_price_id"),
+        (
+            ArticleFilterDAO(last_name="Doe", sort="name"),
+            "ix_articles_last_name_first_name_id",
+        ),
+        (ArticleFilterDAO(last_name="Doe"), "ix_articles_last_name_first_name_id"),
+    ],
+)
+def test_common_filters_use_indexes(database_cursor, filters, index):
+    query, params = build_articles_query(filters, limit=101)
+
+    database_cursor.execute("EXPLAIN " + query, params)
+    plan = "\n".join(row[0] for row in database_cursor.fetchall())
+
+    assert index in plan
+    assert "Seq Scan" not in plan
+
+
+def test_search_uses_gin_index(database_cursor):
+    database_cursor.execute(
+        "SELECT count(*) FROM pg_indexes WHERE tablename = 'articles' "
+        "AND indexname = 'ix_articles_search_vector'"
+    )
+    if database_cursor.fetchone()[0] != 1:
+        pytest.skip("Search index missing, run alembic upgrade head")
+
+    database_cursor.execute(
+        "EXPLAIN " + SEARCH_QUERY, (build_search_terms("jo doe"), 1000, 21, 0)
+    )
+    plan = "\n".join(row[0] for row in database_cursor.fetchall())
+
+    assert "ix_articles_search_vector" in plan
+    assert "Seq Scan" not in plan
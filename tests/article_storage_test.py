@@ -0,0 +1,180 @@
+import pytest
+
+from app.cache.article_cache import InMemoryArticleCache
+from app.models.dao.article_model_dao import ArticleFilterDAO, ArticleModelDAO
+from app.services.articles_service import ArticlesService
+from app.storage import factory
+from app.storage.article_storage import (
+    ArticleDataError,
+    search_rank,
+    search_words,
+)
+from app.storage.factory import create_article_storage
+from app.storage.memory_storage import InMemoryArticleStorage
+from app.storage.postgres_storage import PostgresArticleStorage
+from app.storage.sqlite_storage import SqliteArticleStorage
+from app.util.article_query import build_search_terms
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request):
+    storage = (
+        InMemoryArticleStorage()
+        if request.param == "memory"
+        else SqliteArticleStorage()
+    )
+    yield storage
+    storage.close()
+
+
+def insert_articles(storage, *names_and_prices):
+    return [
+        storage.insert((first_name, last_name, f"{first_name}.jpg", price))[0]
+        for first_name, last_name, price in names_and_prices
+    ]
+
+
+##################################################################### Tests for single articles ########################################################################
+
+
+def test_storage_inserts_gets_updates_and_deletes_article(storage):
+    row = storage.insert(("John", "Doe", "john.jpg", 10.0))
+
+    assert row == (row[0], "john.jpg", "John", "Doe", 10.0)
+    assert storage.exists(row[0])
+    assert storage.get(row[0]) == row
+    assert storage.update(row[0], ("Jane", "Doe", None, 12.5)) == (
+        row[0],
+        None,
+        "Jane",
+        "Doe",
+        12.5,
+    )
+    assert storage.delete(row[0]) == (row[0], None, "Jane", "Doe", 12.5)
+    assert not storage.exists(row[0])
+    assert storage.get(row[0]) is None
+
+
+def test_storage_returns_none_for_missing_articles(storage):
+    assert storage.update(99, ("Jane", "Doe", None, 1.0)) is None
+    assert storage.delete(99) is None
+
+
+def test_storage_rejects_values_longer_than_the_column(storage):
+    with pytest.raises(ArticleDataError):
+        storage.insert(("J" * 256, "Doe", None, 1.0))
+
+
+##################################################################### Tests for list_page ########################################################################
+
+
+def test_storage_pages_by_id_after_cursor(storage):
+    ids = insert_articles(
+        storage, ("A", "Doe", 1.0), ("B", "Doe", 2.0), ("C", "Doe", 3.0)
+    )
+    storage.delete(ids[1])
+
+    assert [row[0] for row in storage.list_page(1, 0)] == [ids[0]]
+    assert [row[0] for row in storage.list_page(10, ids[0])] == [ids[2]]
+    assert [row[0] for row in storage.list_page()] == [ids[0], ids[2]]
+
+
+def test_storage_filters_sorts_and_continues_after_keyset(storage):
+    ids = insert_articles(
+        storage,
+        ("A", "Doe", 5.0),
+        ("B", "Roe", 7.0),
+        ("C", "Doe", 7.0),
+        ("D", "Doe", 50.0),
+    )
+    filters = ArticleFilterDAO(max_price=10, sort="price", order="desc")
+
+    first = storage.list_page(2, None, filters)
+    rest = storage.list_page(2, (first[-1][4], first[-1][0]), filters)
+
+    assert [row[0] for row in first] == [ids[2], ids[1]]
+    assert [row[0] for row in rest] == [ids[0]]
+    assert [
+        row[0]
+        for row in storage.list_page(None, None, ArticleFilterDAO(last_name="Roe"))
+    ] == [ids[1]]
+
+
+##################################################################### Tests for search ########################################################################
+
+
+def test_storage_search_needs_every_word_and_ranks_first_names_higher(storage):
+    ids = insert_articles(
+        storage,
+        ("Anna", "Smith", 1.0),
+        ("Anna Smithers", "Lee", 1.0),
+        ("Anna", "Jones", 1.0),
+    )
+
+    rows = storage.search(build_search_terms("smi ann"), 10)
+
+    assert [row[0] for row in rows] == [ids[1], ids[0]]
+    assert [row[0] for row in storage.search(build_search_terms("smi ann"), 10, 1)] == [
+        ids[0]
+    ]
+
+
+def test_search_rank_matches_word_prefixes_only():
+    words = search_words((1, None, "Mary-Ann", "O'Neil", 1.0))
+
+    assert search_rank(words, ["ann"]) == 1.0
+    assert search_rank(words, ["neil"]) == 0.4
+    assert search_rank(words, ["ary"]) == 0.0
+
+
+##################################################################### Tests for bulk operations ########################################################################
+
+
+def test_storage_insert_many_reports_rejected_rows_per_item(storage):
+    results = storage.insert_many(
+        [("A", "Doe", None, 1.0), ("B" * 300, "Doe", None, 1.0), ("C", "Doe", None, 1)]
+    )
+
+    assert [result.id is not None for result in results] == [True, False, True]
+    assert "too long" in results[1].error
+    assert len(storage.list_page()) == 2
+
+
+def test_storage_get_many_and_iter_batches(storage):
+    ids = insert_articles(storage, *[(f"N{i}", "Doe", float(i)) for i in range(5)])
+
+    assert sorted(row[0] for row in storage.get_many([ids[3], 999, ids[1]])) == [
+        ids[1],
+        ids[3],
+    ]
+    assert [len(batch) for batch in storage.iter_batches(2)] == [2, 2, 1]
+
+
+##################################################################### Tests for the storage factory ########################################################################
+
+
+def test_create_article_storage_selects_configured_backend(monkeypatch):
+    monkeypatch.setitem(factory.STORAGE_CONFIG, "backend", "memory")
+    assert isinstance(create_article_storage(None), InMemoryArticleStorage)
+
+    monkeypatch.setitem(factory.STORAGE_CONFIG, "backend", "postgres")
+    assert isinstance(create_article_storage(object()), PostgresArticleStorage)
+
+    monkeypatch.setitem(factory.STORAGE_CONFIG, "backend", "mongo")
+    with pytest.raises(ValueError):
+        create_article_storage(None)
+
+
+def test_articles_service_runs_on_memory_storage_without_pool():
+    service = ArticlesService(
+        None, InMemoryArticleCache(), storage=InMemoryArticleStorage()
+    )
+
+    created = service.create_article(
+        ArticleModelDAO(id=0, first_name="John", last_name="Doe", price=1.0)
+    )
+
+    assert service.get_article(created.id) == created
+    assert service.get_articles([created.id, 99]) == {created.id: created}
+    assert service.delete_article(created.id) == created
+    assert service.get_article(created.id) is None
@@ -1,8 +1,13 @@
+import psycopg2
 import pytest
 from unittest.mock import MagicMock, patch
 
-from app.models.dao.article_model_dao import ArticleModelDAO
+from app.cache.article_cache import InMemoryArticleCache
+from app.cache.single_flight import SingleFlight
+from app.models.dao.article_model_dao import ArticleFilterDAO, ArticleModelDAO
 from app.services.articles_service import ArticlesService
+from app.storage.memory_storage import InMemoryArticleStorage
+from app.util.article_query import SEARCH_QUERY
 
 
 @pytest.fixture
@@ -23,6 +28,13 @@ def mock_connection(mock_cursor):
     return connection
 
 
+@pytest.fixture
+def mock_pool(mock_connection):
+    pool = MagicMock()
+    pool.connection.return_value.__enter__.return_value = mock_connection
+    return pool
+
+
 ##################################################################### Tests for exists_article_with_id ########################################################################
 
 
@@ -57,9 +69,7 @@ def test_exists_article_with_id_raises_exception_on_database_error(articles_serv
 ##################################################################### Tests for get_all_articles ########################################################################
 
 
-def test_get_all_articles_returns_non_empty_list_on_success(
-    mock_connection, mock_cursor
-):
+def test_get_all_articles_returns_non_empty_list_on_success(mock_pool, mock_cursor):
     mock_cursor.fetchall.return_value = [
         {
             "id": 1,
@@ -76,7 +86,7 @@ def test_get_all_articles_returns_non_empty_list_on_success(
             "price": 150,
         },
     ]
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.get_all_articles()
 
     assert len(result) > 0
@@ -91,20 +101,18 @@ def test_get_all_articles_returns_non_empty_list_on_success(
 
 
 def test_get_all_articles_returns_empty_list_when_no_articles_exist(
-    mock_connection, mock_cursor
+    mock_pool, mock_cursor
 ):
     mock_cursor.fetchall.return_value = []
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.get_all_articles()
 
     assert len(result) == 0
 
 
-def test_get_all_articles_raises_exception_on_database_error(
-    mock_connection, mock_cursor
-):
+def test_get_all_articles_raises_exception_on_database_error(mock_pool, mock_cursor):
     mock_cursor.execute.side_effect = Exception("Database error")
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.get_all_articles()
 
     assert isinstance(result, Exception)
@@ -113,7 +121,7 @@ def test_get_all_articles_raises_exception_on_database_error(
 ##################################################################### Tests for get_article ########################################################################
 
 
-def test_get_article_returns_article(mock_connection, mock_cursor):
+def test_get_article_returns_article(mock_pool, mock_cursor):
     mock_cursor.fetchone.return_value = {
         "id": 1,
         "first_name": "John",
@@ -121,7 +129,7 @@ def test_get_article_returns_article(mock_connection, mock_cursor):
         "imageUrl": "http://example.com/image.jpg",
         "price": 100,
     }
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.get_article(1)
 
     assert result["first_name"] == "John"
@@ -130,11 +138,9 @@ def test_get_article_returns_article(mock_connection, mock_cursor):
     assert result["price"] == 100
 
 
-def test_get_article_raises_database_error_returns_exception(
-    mock_connection, mock_cursor
-):
+def test_get_article_raises_database_error_returns_exception(mock_pool, mock_cursor):
     mock_cursor.execute.side_effect = Exception("Database error")
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.get_article(1)
 
     assert isinstance(result, Exception)
@@ -143,9 +149,15 @@ def test_get_article_raises_database_error_returns_exception(
 ##################################################################### Tests for create_article ########################################################################
 
 
-def test_create_article_succeeds_with_valid_data(mock_connection, mock_cursor):
-    mock_cursor.rowcount = 1
-    articles_service = ArticlesService(mock_connection)
+def test_create_article_succeeds_with_valid_data(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = (
+        7,
+        "http://example.com/image.jpg",
+        "John",
+        "Doe",
+        100,
+    )
+    articles_service = ArticlesService(mock_pool)
 
     article = ArticleModelDAO(
         id=1,
@@ -157,12 +169,19 @@ def test_create_article_succeeds_with_valid_data(mock_connection, mock_cursor):
 
     result = articles_service.create_article(article)
 
-    assert result == 1
+    assert result == ArticleModelDAO(
+        id=7,
+        first_name="John",
+        last_name="Doe",
+        imageUrl="http://example.com/image.jpg",
+        price=100,
+    )
+    assert "RETURNING id" in mock_cursor.execute.call_args.args[0]
 
 
-def test_create_article_returns_exception_on_db_error(mock_connection, mock_cursor):
+def test_create_article_returns_exception_on_db_error(mock_pool, mock_cursor):
     mock_cursor.execute.side_effect = Exception("Database error")
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
 
     article = ArticleModelDAO(
         id=1,
@@ -180,9 +199,15 @@ def test_create_article_returns_exception_on_db_error(mock_connection, mock_curs
 ##################################################################### Tests for create_article ########################################################################
 
 
-def test_update_article_succeeds_with_valid_data(mock_connection, mock_cursor):
-    mock_cursor.rowcount = 1
-    articles_service = ArticlesService(mock_connection)
+def test_update_article_succeeds_with_valid_data(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = (
+        1,
+        "http://example.com/updated_image.jpg",
+        "Updated John",
+        "Updated Doe",
+        200,
+    )
+    articles_service = ArticlesService(mock_pool)
     article = ArticleModelDAO(
         id=1,
         first_name="Updated John",
@@ -192,14 +217,15 @@ def test_update_article_succeeds_with_valid_data(mock_connection, mock_cursor):
     )
     result = articles_service.update_article(1, article)
 
-    assert result == 1
+    assert result.id == 1
+    assert result.first_name == "Updated John"
 
 
-def test_update_article_when_article_does_not_exist_returns_zero(
-    mock_connection, mock_cursor
+def test_update_article_when_article_does_not_exist_returns_none(
+    mock_pool, mock_cursor
 ):
-    mock_cursor.rowcount = 0
-    articles_service = ArticlesService(mock_connection)
+    mock_cursor.fetchone.return_value = None
+    articles_service = ArticlesService(mock_pool)
     article = ArticleModelDAO(
         id=1,
         first_name="Nonexistent John",
@@ -209,14 +235,12 @@ def test_update_article_when_article_does_not_exist_returns_zero(
     )
     result = articles_service.update_article(999, article)
 
-    assert result == 0
+    assert result is None
 
 
-def test_update_article_when_error_raised_returns_exception(
-    mock_connection, mock_cursor
-):
+def test_update_article_when_error_raised_returns_exception(mock_pool, mock_cursor):
     mock_cursor.execute.side_effect = Exception("Database error")
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     article = ArticleModelDAO(
         id=1,
         first_name="Error John",
@@ -232,19 +256,237 @@ def test_update_article_when_error_raised_returns_exception(
 ##################################################################### Tests for create_article ########################################################################
 
 
-def test_delete_article_succeeds_with_valid_data(mock_connection, mock_cursor):
-    mock_cursor.rowcount = 1
-    articles_service = ArticlesService(mock_connection)
+def test_delete_article_succeeds_with_valid_data(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = (1, "", "John", "Doe", 100)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.delete_article(1)
 
-    assert result == 1
+    assert result.id == 1
+    mock_cursor.execute.assert_called_once()
 
 
-def test_delete_article_when_error_raised_returns_exception(
-    mock_connection, mock_cursor
+def test_delete_article_when_article_does_not_exist_returns_none(
+    mock_pool, mock_cursor
 ):
+    mock_cursor.fetchone.return_value = None
+    articles_service = ArticlesService(mock_pool)
+
+    assert articles_service.delete_article(999) is None
+
+
+def test_delete_article_when_error_raised_returns_exception(mock_pool, mock_cursor):
     mock_cursor.execute.side_effect = Exception("Database error")
-    articles_service = ArticlesService(mock_connection)
+    articles_service = ArticlesService(mock_pool)
     result = articles_service.delete_article(1)
 
     assert isinstance(result, Exception)
+
+
+##################################################################### Tests for get_all_articles filters ########################################################################
+
+
+def test_get_all_articles_with_filters_runs_parameterized_query(mock_pool, mock_cursor):
+    mock_cursor.fetchall.return_value = []
+    articles_service = ArticlesService(mock_pool)
+
+    articles_service.get_all_articles(
+        11, (9.5, 4), ArticleFilterDAO(max_price=20, sort="price")
+    )
+
+    query, params = mock_cursor.execute.call_args.args
+    assert query == (
+        "SELECT id, imageUrl, first_name, last_name, price FROM articles "
+        "WHERE price <= %s AND (price, id) > (%s, %s) ORDER BY price ASC, id ASC LIMIT %s"
+    )
+    assert params == [20, 9.5, 4, 11]
+
+
+##################################################################### Tests for search_articles ########################################################################
+
+
+def test_search_articles_caps_matches_and_pages_within_them(mock_pool, mock_cursor):
+    mock_cursor.fetchall.return_value = [(1, "", "John", "Doe", 10)]
+    articles_service = ArticlesService(mock_pool)
+
+    articles = articles_service.search_articles("jo:*", 21, 40)
+
+    assert mock_cursor.execute.call_args.args == (SEARCH_QUERY, ("jo:*", 1000, 21, 40))
+    assert articles == [(1, "", "John", "Doe", 10)]
+
+
+def test_get_article_goes_through_single_flight(mock_pool, mock_cursor):
+    single_flight = SingleFlight()
+    mock_cursor.fetchone.return_value = (1, "", "John", "Doe", 100)
+    articles_service = ArticlesService(mock_pool, single_flight=single_flight)
+
+    articles_service.get_article(1)
+    articles_service.get_all_articles(10, None, ArticleFilterDAO(sort="price"))
+
+    assert single_flight.stats().executions == 2
+
+
+def test_create_article_goes_through_group_commit_writer(mock_pool, mock_connection):
+    writer = MagicMock()
+    writer.submit.return_value = (7, "", "John", "Doe", 100)
+    articles_service = ArticlesService(mock_pool, writer=writer)
+
+    article = articles_service.create_article(
+        ArticleModelDAO(id=0, first_name="John", last_name="Doe", price=100)
+    )
+
+    writer.submit.assert_called_once_with("article_insert", ("John", "Doe", "", 100))
+    assert article.id == 7
+    mock_connection.commit.assert_not_called()
+
+
+##################################################################### Tests for get_articles ########################################################################
+
+
+def test_get_articles_queries_cache_misses_in_one_statement(mock_pool, mock_cursor):
+    cache = InMemoryArticleCache()
+    cache.set(2, ArticleModelDAO(id=2, first_name="Jane", last_name="Doe", price=5))
+    mock_cursor.fetchall.return_value = [(3, "", "Jake", "Doe", 7)]
+    articles_service = ArticlesService(mock_pool, cache)
+
+    articles = articles_service.get_articles([3, 2, 4])
+
+    mock_cursor.execute.assert_called_once_with(
+        "SELECT id, imageUrl, first_name, last_name, price FROM articles WHERE id = ANY(%s)",
+        ([3, 4],),
+    )
+    assert sorted(articles) == [2, 3]
+    assert articles[3].first_name == "Jake"
+    assert cache.get(3) == articles[3]
+
+
+def test_get_articles_skips_database_when_all_cached(mock_pool, mock_cursor):
+    cache = InMemoryArticleCache()
+    cache.set(2, ArticleModelDAO(id=2, first_name="Jane", last_name="Doe", price=5))
+    articles_service = ArticlesService(mock_pool, cache)
+
+    assert list(articles_service.get_articles([2])) == [2]
+    mock_cursor.execute.assert_not_called()
+
+
+##################################################################### Tests for iter_articles ########################################################################
+
+
+def test_iter_articles_yields_batches_from_named_cursor(
+    mock_pool, mock_connection, mock_cursor
+):
+    mock_cursor.fetchmany.side_effect = [
+        [(1, "http://example.com/image.jpg", "John", "Doe", 100)],
+        [(2, "http://example.com/image2.jpg", "Jane", "Doe", 150)],
+        [],
+    ]
+    articles_service = ArticlesService(mock_pool)
+
+    batches = list(articles_service.iter_articles(batch_size=1))
+
+    assert len(batches) == 2
+    mock_connection.cursor.assert_called_once_with(name="articles_stream")
+    mock_cursor.fetchmany.assert_called_with(1)
+
+
+##################################################################### Tests for the article cache ########################################################################
+
+
+def test_get_article_is_served_from_cache_after_first_read(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = (
+        1,
+        "http://example.com/image.jpg",
+        "John",
+        "Doe",
+        100,
+    )
+    articles_service = ArticlesService(mock_pool, InMemoryArticleCache())
+
+    first = articles_service.get_article(1)
+    second = articles_service.get_article(1)
+
+    assert first == second
+    mock_cursor.execute.assert_called_once()
+
+
+def test_update_and_delete_article_invalidate_cache(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = None
+    cache = InMemoryArticleCache()
+    cache.set(1, ArticleModelDAO(id=1, first_name="John", last_name="Doe", price=1))
+    cache.set(2, ArticleModelDAO(id=2, first_name="Jane", last_name="Doe", price=2))
+    articles_service = ArticlesService(mock_pool, cache)
+    article = ArticleModelDAO(id=0, first_name="Jake", last_name="Doe", price=3)
+
+    articles_service.update_article(1, article)
+    articles_service.delete_article(2)
+
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+
+
+def test_get_article_does_not_cache_row_replaced_while_it_loaded():
+    cache = InMemoryArticleCache()
+    storage = InMemoryArticleStorage()
+    articles_service = ArticlesService(None, cache, storage=storage)
+    id = storage.insert(("John", "Doe", None, 1.0))[0]
+    read = storage.get
+
+    def read_then_concurrent_update(id):
+        row = read(id)
+        articles_service.update_article(
+            id, ArticleModelDAO(id=0, first_name="Jake", last_name="Doe", price=3)
+        )
+        return row
+
+    storage.get = read_then_concurrent_update
+    assert articles_service.get_article(id).first_name == "John"
+    assert cache.get(id) is None
+
+    storage.get = read
+    assert articles_service.get_article(id).first_name == "Jake"
+    assert cache.get(id).first_name == "Jake"
+
+
+##################################################################### Tests for create_articles ########################################################################
+
+
+def make_articles(count: int) -> list[ArticleModelDAO]:
+    return [
+        ArticleModelDAO(id=0, first_name=f"John {index}", last_name="Doe", price=100)
+        for index in range(count)
+    ]
+
+
+def test_create_articles_inserts_all_rows_in_one_statement(
+    mock_pool, mock_connection, mock_cursor
+):
+    with patch(
+        "app.storage.postgres_storage.execute_values", return_value=[(1,), (2,)]
+    ) as execute_values:
+        articles_service = ArticlesService(mock_pool)
+        result = articles_service.create_articles(make_articles(2))
+
+    assert [item.id for item in result] == [1, 2]
+    execute_values.assert_called_once()
+    mock_connection.commit.assert_called_once()
+
+
+def test_create_articles_reports_rejected_rows_per_item(
+    mock_pool, mock_connection, mock_cursor
+):
+    rejected = psycopg2.DataError("value too long")
+
+    def execute(query, params=None):
+        if params and params[0] == "John 1":
+            raise rejected
+
+    mock_cursor.execute.side_effect = execute
+    mock_cursor.fetchone.side_effect = [(1,), (3,)]
+
+    with patch("app.storage.postgres_storage.execute_values", side_effect=rejected):
+        articles_service = ArticlesService(mock_pool)
+        result = articles_service.create_articles(make_articles(3))
+
+    assert [item.id for item in result] == [1, None, 3]
+    assert result[1].error == "value too long"
+    mock_connection.rollback.assert_called_once()
+    mock_connection.commit.assert_called_once()
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from app.handlers.async_article_handler import AsyncArticleHandler
+from app.models.dao.article_model_dao import ArticleModelDAO
+from app.models.dto.article_model_dto import ArticleModelDTOEndpoint
+
+
+@pytest.fixture
+def article_handler(article_service_mock):
+    return AsyncArticleHandler(article_service_mock)
+
+
+@pytest.fixture
+def article_service_mock(mocker):
+    return mocker.AsyncMock()
+
+
+##################################################################### Tests for get_articles_handler ########################################################################
+
+
+def test_get_articles_handler_returns_success_when_articles_exist(article_handler):
+    article_handler.service.get_all_articles.return_value = [
+        (1, "http://example.com/image.jpg", "John", "Doe", 100)
+    ]
+
+    response = asyncio.run(article_handler.get_articles_handler())
+
+    assert response.status_code == 200
+    assert response.body.decode() == (
+        '{"articles":[{"id":1,"imageUrl":"http://example.com/image.jpg",'
+        '"first_name":"John","last_name":"Doe","price":100.0}],"next":null}'
+    )
+
+
+def test_get_articles_handler_returns_internal_server_error_on_exception(
+    article_handler,
+):
+    article_handler.service.get_all_articles.side_effect = Exception("Database error")
+
+    response = asyncio.run(article_handler.get_articles_handler())
+
+    assert response.status_code == 500
+    assert response.body.decode() == '{"message":"Internal Server Error"}'
+
+
+##################################################################### Tests for search_articles_handler ########################################################################
+
+
+def test_search_articles_handler_awaits_search(article_handler):
+    article_handler.service.search_articles.return_value = [
+        (1, "http://example.com/image.jpg", "John", "Doe", 100)
+    ]
+
+    response = asyncio.run(article_handler.search_articles_handler("john", 20))
+
+    article_handler.service.search_articles.assert_awaited_once_with("john:*", 21, 0)
+    assert response.status_code == 200
+    assert response.body.decode() == (
+        '{"articles":[{"id":1,"imageUrl":"http://example.com/image.jpg",'
+        '"first_name":"John","last_name":"Doe","price":100.0}],"next":null}'
+    )
+
+
+##################################################################### Tests for get_article_handler ########################################################################
+
+
+def test_get_article_handler_returns_success_when_article_exist(article_handler):
+    article_handler.service.get_article.return_value = ArticleModelDAO(
+        id=1, first_name="John", last_name="Doe", price=100
+    )
+
+    response = asyncio.run(article_handler.get_article_handler(1))
+
+    assert response.status_code == 200
+    assert response.body.decode() == (
+        '{"id":1,"imageUrl":"","first_name":"John","last_name":"Doe","price":100.0}'
+    )
+
+
+def test_get_article_handler_returns_not_found_when_no_article_exist(
+    article_handler,
+):
+    article_handler.service.get_article.return_value = None
+
+    response = asyncio.run(article_handler.get_article_handler(100))
+
+    assert response.status_code == 404
+    assert response.body.decode() == '{"message":"Article not found"}'
+
+
+##################################################################### Tests for write handlers ########################################################################
+
+
+def test_create_article_handler_success(article_handler):
+    article = ArticleModelDTOEndpoint(first_name="John", last_name="Doe", price=100)
+    article_handler.service.create_article.return_value = ArticleModelDAO(
+        id=7, first_name="John", last_name="Doe", price=100
+    )
+
+    response = asyncio.run(article_handler.create_article_handler(article))
+
+    assert response.status_code == 200
+    assert response.body.decode() == (
+        '{"id":7,"imageUrl":"","first_name":"John","last_name":"Doe","price":100.0}'
+    )
+    article_handler.service.create_article.assert_awaited_once()
+
+
+def test_update_article_handler_returns_internal_server_error_on_exception(
+    article_handler,
+):
+    article = ArticleModelDTOEndpoint(first_name="Jane", last_name="Doe", price=100)
+    article_handler.service.update_article.side_effect = Exception("Database error")
+
+    response = asyncio.run(article_handler.update_article_handler(1, article))
+
+    assert response.status_code == 500
+
+
+def test_delete_article_handler_returns_not_found_when_id_is_invalid(
+    article_handler,
+):
+    article_handler.service.delete_article.return_value = None
+
+    response = asyncio.run(article_handler.delete_article_handler(999))
+
+    assert response.status_code == 404
+    article_handler.service.delete_article.assert_awaited_once_with(999)
+    article_handler.service.exists_article_with_id.assert_not_awaited()
+
+
+def test_update_article_handler_returns_not_found_when_no_row_matched(
+    article_handler,
+):
+    article = ArticleModelDTOEndpoint(first_name="Jane", last_name="Doe", price=100)
+    article_handler.service.update_article.return_value = None
+
+    response = asyncio.run(article_handler.update_article_handler(999, article))
+
+    assert response.status_code == 404
@@ -0,0 +1,174 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.dao.article_model_dao import ArticleModelDAO
+from app.services.async_articles_service import AsyncArticlesService
+
+
+@pytest.fixture
+def mock_cursor():
+    cursor = MagicMock()
+    cursor.execute = AsyncMock()
+    cursor.fetchone = AsyncMock()
+    cursor.fetchall = AsyncMock()
+    return cursor
+
+
+@pytest.fixture
+def mock_connection(mock_cursor):
+    connection = MagicMock()
+    connection.cursor.return_value = mock_cursor
+    connection.commit = AsyncMock()
+    return connection
+
+
+@pytest.fixture
+def mock_pool(mock_connection):
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = mock_connection
+    return pool
+
+
+##################################################################### Tests for exists_article_with_id ########################################################################
+
+
+def test_exists_article_with_id_returns_true_when_article_exists(
+    mock_pool, mock_cursor
+):
+    mock_cursor.fetchone.return_value = (1,)
+    articles_service = AsyncArticlesService(mock_pool)
+
+    assert asyncio.run(articles_service.exists_article_with_id(1)) is True
+
+
+def test_exists_article_with_id_returns_false_on_database_error(mock_pool, mock_cursor):
+    mock_cursor.execute.side_effect = Exception("Database error")
+    articles_service = AsyncArticlesService(mock_pool)
+
+    assert asyncio.run(articles_service.exists_article_with_id(1)) is False
+
+
+##################################################################### Tests for get_all_articles ########################################################################
+
+
+def test_get_all_articles_returns_rows(mock_pool, mock_cursor):
+    mock_cursor.fetchall.return_value = [
+        (1, "http://example.com/image.jpg", "John", "Doe", 100)
+    ]
+    articles_service = AsyncArticlesService(mock_pool)
+
+    result = asyncio.run(articles_service.get_all_articles())
+
+    assert result == [(1, "http://example.com/image.jpg", "John", "Doe", 100)]
+
+
+def test_get_all_articles_raises_exception_on_database_error(mock_pool, mock_cursor):
+    mock_cursor.execute.side_effect = Exception("Database error")
+    articles_service = AsyncArticlesService(mock_pool)
+
+    with pytest.raises(Exception, match="Database error"):
+        asyncio.run(articles_service.get_all_articles())
+
+
+##################################################################### Tests for get_article ########################################################################
+
+
+def test_get_article_returns_article(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = (
+        1,
+        "http://example.com/image.jpg",
+        "John",
+        "Doe",
+        100,
+    )
+    articles_service = AsyncArticlesService(mock_pool)
+
+    result = asyncio.run(articles_service.get_article(1))
+
+    assert isinstance(result, ArticleModelDAO)
+    assert result.first_name == "John"
+    assert result.price == 100
+
+
+def test_get_article_returns_none_when_article_does_not_exist(mock_pool, mock_cursor):
+    mock_cursor.fetchone.return_value = None
+    articles_service = AsyncArticlesService(mock_pool)
+
+    assert asyncio.run(articles_service.get_article(999)) is None
+
+
+##################################################################### Tests for write methods ########################################################################
+
+
+def test_create_article_commits(mock_pool, mock_connection, mock_cursor):
+    mock_cursor.fetchone.return_value = (7, "", "John", "Doe", 100)
+    articles_service = AsyncArticlesService(mock_pool)
+    article = ArticleModelDAO(id=0, first_name="John", last_name="Doe", price=100)
+
+    result = asyncio.run(articles_service.create_article(article))
+
+    assert result.id == 7
+    mock_connection.commit.assert_awaited_once()
+
+
+def test_update_article_when_article_does_not_exist_returns_none(
+    mock_pool, mock_cursor
+):
+    mock_cursor.fetchone.return_value = None
+    articles_service = AsyncArticlesService(mock_pool)
+    article = ArticleModelDAO(id=0, first_name="John", last_name="Doe", price=100)
+
+    assert asyncio.run(articles_service.update_article(999, article)) is None
+
+
+def test_delete_article_raises_exception_on_database_error(mock_pool, mock_cursor):
+    mock_cursor.execute.side_effect = Exception("Database error")
+    articles_service = AsyncArticlesService(mock_pool)
+
+    with pytest.raises(Exception, match="Database error"):
+        asyncio.run(articles_service.delete_article(1))
+
+
+##################################################################### Tests for get_articles ########################################################################
+
+
+def test_get_articles_fetches_all_ids_at_once(mock_pool, mock_cursor):
+    mock_cursor.fetchall.return_value = [
+        (1, "", "John", "Doe", 100),
+        (3, "", "Jake", "Doe", 7),
+    ]
+    articles_service = AsyncArticlesService(mock_pool)
+
+    articles = asyncio.run(articles_service.get_articles([3, 2, 1]))
+
+    mock_cursor.execute.assert_awaited_once()
+    assert mock_cursor.execute.call_args.args[1] == ([3, 2, 1],)
+    assert {id: article.first_name for id, article in articles.items()} == {
+        1: "John",
+        3: "Jake",
+    }
+
+
+##################################################################### Tests for create_articles ########################################################################
+
+
+def test_create_articles_inserts_pages_of_multi_row_values(
+    mock_pool, mock_connection, mock_cursor
+):
+    mock_cursor.fetchall.side_effect = [[(1,), (2,)], [(3,)]]
+    articles_service = AsyncArticlesService(mock_pool)
+    articles = [
+        ArticleModelDAO(id=0, first_name=f"John {index}", last_name="Doe", price=100)
+        for index in range(3)
+    ]
+
+    result = asyncio.run(articles_service.create_articles(articles, page_size=2))
+
+    assert [item.id for item in result] == [1, 2, 3]
+    assert mock_cursor.execute.await_count == 2
+    first_query, first_params = mock_cursor.execute.await_args_list[0].args
+    assert first_query.count("(%s, %s, %s, %s)") == 2
+    assert len(first_params) == 8
+    mock_connection.commit.assert_awaited_once()
@@ -0,0 +1,145 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from app.handlers.async_catalog_handler import AsyncCatalogHandler
+from app.handlers.catalog_handler import CatalogHandler
+from app.models.dao.catalog_model_dao import CatalogImportResultDAO, CatalogRowErrorDAO
+
+
+@pytest.fixture
+def catalog_service_mock(mocker):
+    return mocker.Mock()
+
+
+@pytest.fixture
+def catalog_handler(catalog_service_mock):
+    return CatalogHandler(catalog_service_mock)
+
+
+@pytest.fixture
+def import_result():
+    return CatalogImportResultDAO(
+        rows_read=4,
+        rows_rejected=1,
+        inserted=2,
+        updated=1,
+        seconds=0.5,
+        errors=[CatalogRowErrorDAO(line=3, error="price: Field required")],
+    )
+
+
+##################################################################### Tests for import_articles_handler ########################################################################
+
+
+def test_import_articles_handler_reports_import_result(
+    catalog_handler, catalog_service_mock, import_result
+):
+    catalog_service_mock.import_articles.return_value = import_result
+
+    response = catalog_handler.import_articles_handler(
+        io.BytesIO(b"first_name,last_name,price\n"), filename="catalog.csv"
+    )
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == {
+        "rows_read": 4,
+        "rows_imported": 3,
+        "rows_rejected": 1,
+        "inserted": 2,
+        "updated": 1,
+        "seconds": 0.5,
+        "rows_per_second": 8.0,
+        "errors": [{"line": 3, "error": "price: Field required"}],
+    }
+    assert catalog_service_mock.import_articles.call_args.args[1] == "csv"
+
+
+def test_import_articles_handler_returns_bad_request_for_unknown_format(
+    catalog_handler, catalog_service_mock
+):
+    response = catalog_handler.import_articles_handler(
+        io.BytesIO(b""), filename="catalog.xml"
+    )
+
+    assert response.status_code == 400
+    catalog_service_mock.import_articles.assert_not_called()
+
+
+def test_import_articles_handler_returns_internal_server_error_on_exception(
+    catalog_handler, catalog_service_mock
+):
+    catalog_service_mock.import_articles.side_effect = Exception("Database error")
+
+    response = catalog_handler.import_articles_handler(io.BytesIO(b""), "ndjson")
+
+    assert response.status_code == 500
+
+
+def test_async_import_articles_handler_reports_import_result(mocker, import_result):
+    service = mocker.Mock()
+    service.import_articles = mocker.AsyncMock(return_value=import_result)
+    handler = AsyncCatalogHandler(service)
+
+    response = asyncio.run(
+        handler.import_articles_handler(io.BytesIO(b""), "ndjson", "catalog.csv")
+    )
+
+    assert response.status_code == 200
+    assert service.import_articles.call_args.args[1] == "ndjson"
+
+
+##################################################################### Tests for export_articles_handler ########################################################################
+
+
+def stream_body(response):
+    async def collect():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def test_export_articles_handler_streams_copy_output(
+    catalog_handler, catalog_service_mock
+):
+    def export_articles(file, columns, *filters):
+        file.write(b",".join(column.encode() for column in columns) + b"\n")
+        file.write(b"1,9.5\n")
+        return 1
+
+    catalog_service_mock.export_articles.side_effect = export_articles
+
+    response = catalog_handler.export_articles_handler("id,price", min_price=5)
+    body = stream_body(response)
+
+    assert response.status_code == 200
+    assert response.media_type == "text/csv"
+    assert body == b"id,price\n1,9.5\n"
+    assert catalog_service_mock.export_articles.call_args.args[1:] == (
+        ("id", "price"),
+        5,
+        None,
+        None,
+        None,
+    )
+
+
+def test_export_articles_handler_returns_bad_request_for_unknown_columns(
+    catalog_handler, catalog_service_mock
+):
+    response = catalog_handler.export_articles_handler("id,secret")
+
+    assert response.status_code == 400
+    catalog_service_mock.export_articles.assert_not_called()
+
+
+def test_export_articles_handler_returns_internal_server_error_on_exception(
+    catalog_handler, catalog_service_mock
+):
+    catalog_service_mock.export_articles.side_effect = Exception("Database error")
+
+    response = catalog_handler.export_articles_handler()
+
+    assert response.status_code == 500
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import uuid
+from unittest.mock import MagicMock
+
+import psycopg2
+import pytest
+
+from app.database.async_db_connection import (
+    close_async_pool,
+    create_async_pool,
+    open_async_pool,
+)
+from app.database.db_connection import DATABASE_CONFIG, ConnectionPool
+from app.services.async_catalog_service import AsyncCatalogService
+from app.services.catalog_service import (
+    COPY_INTO_STAGING_TABLE,
+    MERGE_STAGING_TABLE,
+    CatalogService,
+)
+
+
+@pytest.fixture
+def mock_cursor():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_connection(mock_cursor):
+    connection = MagicMock()
+    connection.cursor.return_value = mock_cursor
+    return connection
+
+
+@pytest.fixture
+def mock_pool(mock_connection):
+    pool = MagicMock()
+    pool.connection.return_value.__enter__.return_value = mock_connection
+    return pool
+
+
+@pytest.fixture
+def database_cursor():
+    try:
+        connection = psycopg2.connect(**DATABASE_CONFIG, connect_timeout=2)
+    except psycopg2.OperationalError:
+        pytest.skip("No database available")
+
+    connection.autocommit = True
+    yield connection.cursor()
+    connection.close()
+
+
+##################################################################### Tests for import_articles ########################################################################
+
+
+def test_import_articles_copies_valid_rows_and_merges_once(
+    mock_pool, mock_connection, mock_cursor
+):
+    copied = []
+    mock_cursor.copy_expert.side_effect = lambda sql, stream: copied.append(
+        stream.read()
+    )
+    mock_cursor.fetchone.return_value = (1, 1)
+    cache = MagicMock()
+    lines = [
+        '{"id": 4, "first_name": "John", "last_name": "Doe", "price": 1}\n',
+        '{"first_name": "Jane", "last_name": "Doe", "price": 2}\n',
+        '{"first_name": "Jim"}\n',
+    ]
+
+    result = CatalogService(mock_pool, cache).import_articles(lines, "ndjson")
+
+    assert copied == ["4,,John,Doe,1.0\n,,Jane,Doe,2.0\n"]
+    assert mock_cursor.copy_expert.call_args.args[0] == COPY_INTO_STAGING_TABLE
+    executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+    assert executed.count(MERGE_STAGING_TABLE) == 1
+    assert (result.rows_read, result.rows_rejected) == (3, 1)
+    assert (result.inserted, result.updated) == (1, 1)
+    mock_connection.commit.assert_called_once()
+    cache.clear.assert_called_once()
+
+
+def test_import_articles_raises_read_error_instead_of_copy_error(
+    mock_pool, mock_connection, mock_cursor
+):
+    def copy_expert(sql, stream):
+        try:
+            stream.read()
+        except Exception:
+            raise psycopg2.DatabaseError("error in .read() call")
+
+    mock_cursor.copy_expert.side_effect = copy_expert
+
+    def lines():
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        yield
+
+    with pytest.raises(UnicodeDecodeError):
+        CatalogService(mock_pool).import_articles(lines(), "csv")
+
+    mock_connection.commit.assert_not_called()
+
+
+def test_sync_and_async_import_store_missing_image_url_alike(database_cursor):
+    async def import_async(lines):
+        pool = create_async_pool()
+        await open_async_pool(pool)
+        try:
+            return await AsyncCatalogService(pool).import_articles(lines, "ndjson")
+        finally:
+            await close_async_pool(pool)
+
+    name = uuid.uuid4().hex
+    line = json.dumps(
+        {"imageUrl": None, "first_name": name, "last_name": "Doe", "price": 1.0}
+    )
+    pool = ConnectionPool(min_size=0, max_size=1)
+    try:
+        CatalogService(pool).import_articles([line], "ndjson")
+        asyncio.run(import_async([line]))
+
+        database_cursor.execute(
+            "SELECT imageUrl FROM articles WHERE first_name = %s", (name,)
+        )
+        assert database_cursor.fetchall() == [("",), ("",)]
+    finally:
+        database_cursor.execute("DELETE FROM articles WHERE first_name = %s", (name,))
+        pool.close()
+
+
+##################################################################### Tests for export_articles ########################################################################
+
+
+def test_export_articles_copies_filtered_query_into_file(
+    mock_pool, mock_connection, mock_cursor
+):
+    mock_cursor.mogrify.return_value = b"SELECT ... WHERE price >= 2.5"
+    mock_cursor.rowcount = 3
+    file = MagicMock()
+
+    rows = CatalogService(mock_pool).export_articles(file, ("id",), min_price=2.5)
+
+    assert rows == 3
+    query, params = mock_cursor.mogrify.call_args.args
+    assert query.startswith('SELECT id AS "id" FROM articles WHERE price >= %s')
+    assert params == [2.5]
+    mock_cursor.copy_expert.assert_called_once_with(
+        "COPY (SELECT ... WHERE price >= 2.5) TO STDOUT WITH (FORMAT csv, HEADER)",
+        file,
+    )
@@ -0,0 +1,135 @@
+import io
+
+import pytest
+
+from app.models.dao.article_model_dao import ARTICLE_COLUMNS
+from app.util.catalog import (
+    CatalogFormatError,
+    CatalogReader,
+    CopyPipe,
+    CopyStream,
+    build_export_query,
+    decode_lines,
+    detect_catalog_format,
+    parse_export_columns,
+)
+
+
+def test_detect_catalog_format_prefers_explicit_format():
+    assert detect_catalog_format("csv", "catalog.ndjson") == "csv"
+    assert detect_catalog_format(None, "catalog.JSONL") == "ndjson"
+
+
+@pytest.mark.parametrize("format, filename", [(None, "catalog.txt"), (None, None)])
+def test_detect_catalog_format_rejects_unknown_format(format, filename):
+    with pytest.raises(CatalogFormatError):
+        detect_catalog_format(format, filename)
+
+
+def test_catalog_reader_validates_csv_rows():
+    lines = decode_lines(
+        io.BytesIO(
+            b"\xef\xbb\xbfid,imageUrl,first_name,last_name,price\n"
+            b"7,http://x,John,Doe,10.5\n"
+            b',,"Doe, Jane",Doe,3\n'
+            b",,Jim,Doe,\n"
+        )
+    )
+    reader = CatalogReader(lines, "csv")
+
+    rows = list(reader)
+
+    assert rows == [
+        (7, "http://x", "John", "Doe", 10.5),
+        (None, "", "Doe, Jane", "Doe", 3.0),
+    ]
+    assert reader.rows_read == 3
+    assert reader.rows_rejected == 1
+    assert reader.errors[0].line == 4
+    assert reader.errors[0].error.startswith("price:")
+
+
+def test_catalog_reader_rejects_bad_ndjson_lines():
+    lines = [
+        '{"first_name": "John", "last_name": "Doe", "price": 1}\n',
+        "\n",
+        "{broken\n",
+        "[1, 2]\n",
+        '{"first_name": "' + "x" * 256 + '", "last_name": "Doe", "price": 1}\n',
+    ]
+    reader = CatalogReader(lines, "ndjson")
+
+    rows = list(reader)
+
+    assert rows == [(None, "", "John", "Doe", 1.0)]
+    assert [error.line for error in reader.errors] == [3, 4, 5]
+    assert reader.errors[0].error.startswith("Invalid JSON")
+    assert reader.errors[1].error == "Row is not an object"
+
+
+def test_catalog_reader_caps_reported_errors():
+    reader = CatalogReader(["{}\n"] * 5, "ndjson", max_reported_errors=2)
+
+    assert list(reader) == []
+    assert reader.rows_rejected == 5
+    assert len(reader.errors) == 2
+
+
+def test_copy_stream_encodes_rows_as_csv_in_chunks():
+    rows = [(None, "", "a,b", "Doe", 1.5), (3, "x", 'say "hi"', "Doe", 2.0)]
+    stream = CopyStream(rows, batch_size=1)
+
+    chunks = []
+    while chunk := stream.read(8):
+        chunks.append(chunk)
+
+    assert all(len(chunk) <= 8 for chunk in chunks)
+    assert "".join(chunks) == ',,"a,b",Doe,1.5\n3,x,"say ""hi""",Doe,2.0\n'
+
+
+def test_parse_export_columns_defaults_to_all_columns():
+    assert parse_export_columns(None) == ARTICLE_COLUMNS
+    assert parse_export_columns(" id, price ") == ("id", "price")
+
+
+@pytest.mark.parametrize("columns", ["id,password", "id;DROP TABLE articles", ","])
+def test_parse_export_columns_rejects_unknown_columns(columns):
+    with pytest.raises(CatalogFormatError):
+        parse_export_columns(columns)
+
+
+def test_build_export_query_applies_range_filters():
+    query, params = build_export_query(("id", "imageUrl"), min_price=1.5, max_id=10)
+
+    assert query == (
+        'SELECT id AS "id", imageUrl AS "imageUrl" FROM articles '
+        "WHERE price >= %s AND id <= %s ORDER BY id"
+    )
+    assert params == [1.5, 10]
+
+
+def test_copy_pipe_joins_writes_into_chunks():
+    pipe = CopyPipe(chunk_size=4)
+    for row in (b"id\n", b"1\n", b"2\n", b"3\n"):
+        pipe.write(row)
+    pipe.finish()
+
+    assert list(pipe) == [b"id\n1\n", b"2\n3\n"]
+
+
+def test_copy_pipe_raises_writer_error_to_reader():
+    pipe = CopyPipe()
+    pipe.write(b"id\n")
+    pipe.finish(RuntimeError("copy failed"))
+
+    with pytest.raises(RuntimeError):
+        list(pipe)
+
+
+def test_copy_pipe_write_fails_once_reader_closed():
+    pipe = CopyPipe(chunk_size=1, max_chunks=1)
+    pipe.write(b"1\n")
+    pipe.close()
+
+    with pytest.raises(Exception):
+        pipe.write(b"2\n")
@@ -0,0 +1,167 @@
+import gzip
+import json
+
+import brotli
+import pytest
+import zstandard
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.cache.compressed_cache import CompressedBodyCache
+from app.util.compression import (
+    CompressionMiddleware,
+    ResponseCompressor,
+    compress_body,
+    negotiate_encoding,
+)
+
+BODY = json.dumps([{"id": i, "first_name": "John"} for i in range(200)]).encode()
+
+
+@pytest.fixture
+def compressor():
+    return ResponseCompressor(
+        ["zstd", "br", "gzip"], {"zstd": 3, "br": 4, "gzip": 6}, min_size=100
+    )
+
+
+@pytest.fixture
+def client(compressor):
+    def page(request):
+        return Response(BODY, media_type="application/json", headers={"ETag": '"a"'})
+
+    def not_modified(request):
+        return Response(status_code=304, headers={"ETag": '"a"'})
+
+    def small(request):
+        return Response(b"{}", media_type="application/json")
+
+    def text(request):
+        return Response(BODY, media_type="text/plain")
+
+    def stream(request):
+        return StreamingResponse(
+            iter([BODY, b"", BODY]), media_type="application/x-ndjson"
+        )
+
+    app = Starlette(
+        routes=[
+            Route("/page", page),
+            Route("/not-modified", not_modified),
+            Route("/small", small),
+            Route("/text", text),
+            Route("/stream", stream),
+        ]
+    )
+    return TestClient(CompressionMiddleware(app, compressor=compressor))
+
+
+def get(client, path, accept_encoding):
+    # Raw bytes, the test client would decode them otherwise
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+##################################################################### Tests for negotiate_encoding ########################################################################
+
+
+def test_negotiate_encoding_prefers_client_weights_then_server_order():
+    encodings = ["zstd", "br", "gzip"]
+
+    assert negotiate_encoding("gzip, br", encodings) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", encodings) == "gzip"
+    assert negotiate_encoding("*", encodings) == "zstd"
+    assert negotiate_encoding("br;q=0, *;q=0.1", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("identity", encodings) is None
+    assert negotiate_encoding(None, encodings) is None
+
+
+##################################################################### Tests for CompressedBodyCache ########################################################################
+
+
+def test_compressed_cache_evicts_least_recently_used_beyond_max_bytes():
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.set('"a"', "gzip", b"12345")
+    cache.set('"b"', "gzip", b"12345")
+    cache.get('"a"', "gzip")
+    cache.set('"c"', "gzip", b"12345")
+
+    assert cache.get('"b"', "gzip") is None
+    assert cache.get('"a"', "gzip") == b"12345"
+    assert cache.get('"a"', "br") is None
+    assert cache.bytes == 10
+    assert cache.evictions == 1
+
+
+##################################################################### Tests for CompressionMiddleware ########################################################################
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("br", brotli.decompress),
+        (
+            "zstd",
+            lambda body: zstandard.ZstdDecompressor().decompressobj().decompress(body),
+        ),
+    ],
+)
+def test_middleware_compresses_in_negotiated_encoding(client, encoding, decompress):
+    response, body = get(client, "/page", encoding)
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-length"] == str(len(body))
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"a"'
+    assert decompress(body) == BODY
+
+
+def test_middleware_compresses_etagged_body_once_per_encoding(client, compressor):
+    for _ in range(3):
+        get(client, "/page", "gzip")
+    get(client, "/page", "br")
+
+    stats = compressor.stats()
+    assert stats.responses == 4
+    assert (stats.cache_hits, stats.cache_misses, stats.cache_size) == (2, 2, 2)
+
+
+def test_middleware_leaves_small_uncompressible_and_unaccepted_bodies(client):
+    response, body = get(client, "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert body == b"{}"
+
+    response, body = get(client, "/text", "gzip")
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+
+    response, body = get(client, "/not-modified", "gzip")
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    response, body = get(client, "/page", "identity")
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"a"'
+    assert body == BODY
+
+
+def test_middleware_compresses_streams_chunk_by_chunk(client, compressor):
+    response, body = get(client, "/stream", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body) == BODY + BODY
+    assert compressor.stats().streams == 1
+    assert compressor.stats().bytes_in == 2 * len(BODY)
+
+
+def test_compress_body_round_trips_large_bodies_on_threads(client, compressor):
+    compressor.offload_size = 1
+
+    response, body = get(client, "/page", "gzip")
+
+    assert gzip.decompress(body) == BODY
+    assert compress_body(BODY, "gzip", 1) != compress_body(BODY, "gzip", 9)
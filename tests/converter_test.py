@@ -2,14 +2,21 @@ import unittest
 
 import pytest
 
-from app.models.dao.article_model_dao import ArticlesModelDAO, ArticleModelDAO
+from app.models.dao.article_model_dao import (
+    ArticleRows,
+    ArticlesModelDAO,
+    ArticleModelDAO,
+)
 from app.models.dto.article_model_dto import (
     ArticleModelDTOEndpoint,
     ArticlesModelDTO,
     ArticleModelDTO,
 )
 from app.util.converter import (
+    columns_from_description,
     convert_articles_model_dao_to_articles_model_dto,
+    dump_articles_page,
+    validate_article_rows,
     convert_list_to_article_model_dto,
     convert_article_model_dto_endpoint_to_article_model_dao,
 )
@@ -91,3 +98,52 @@ def test_conversion_from_dto_endpoint_to_dao_succeeds(article_model_dto_endpoint
     assert result.last_name == "Doe"
     assert result.imageUrl == "http://example.com/image4.jpg"
     assert result.price == 250
+
+
+def test_columns_from_description_maps_folded_column_names():
+    description = [("id",), ("imageurl",), ("first_name",), ("last_name",), ("price",)]
+
+    assert columns_from_description(description) == (
+        "id",
+        "imageUrl",
+        "first_name",
+        "last_name",
+        "price",
+    )
+
+
+def test_conversion_maps_columns_by_name_not_position():
+    rows = ArticleRows(
+        [(100, "Doe", "John", 1, "http://example.com/image1.jpg")],
+        columns=("price", "last_name", "first_name", "id", "imageUrl"),
+    )
+
+    result = convert_articles_model_dao_to_articles_model_dto(rows)
+
+    assert result.articles[0].id == 1
+    assert result.articles[0].first_name == "John"
+    assert result.articles[0].imageUrl == "http://example.com/image1.jpg"
+    assert result.articles[0].price == 100
+
+
+def test_validate_article_rows_dumps_same_json_as_dto():
+    rows = [
+        (1, "http://example.com/image1.jpg", "John", "Doe", 100),
+        (2, None, "Jane", "Doe", "150.5"),
+    ]
+
+    validated = validate_article_rows(rows)
+
+    assert dump_articles_page(validated, "cursor") == (
+        ArticlesModelDTO(
+            articles=convert_articles_model_dao_to_articles_model_dto(rows).articles,
+            next="cursor",
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def test_validate_article_rows_raises_on_bad_data():
+    with pytest.raises(Exception):
+        validate_article_rows([("", None, " ", " ", " ")])
@@ -0,0 +1,50 @@
+import pytest
+
+from app.util.cursor import (
+    InvalidCursorError,
+    decode_article_cursor,
+    decode_cursor,
+    decode_keyset_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor({"id": 42})
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == {"id": 42}
+    assert decode_article_cursor(cursor) == 42
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-a-cursor", encode_cursor({"id": "1"}), encode_cursor({})]
+)
+def test_decode_article_cursor_rejects_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_article_cursor(cursor)
+
+
+def test_decode_keyset_cursor_returns_sort_values_in_order():
+    cursor = encode_cursor({"id": 7, "price": 9.5})
+
+    assert decode_keyset_cursor(cursor, ("price", "id")) == (9.5, 7)
+
+
+@pytest.mark.parametrize(
+    "values", [{"id": 7}, {"price": 9.5, "id": "7"}, {"price": True, "id": 7}]
+)
+def test_decode_keyset_cursor_rejects_cursor_of_other_sort(values):
+    with pytest.raises(InvalidCursorError):
+        decode_keyset_cursor(encode_cursor(values), ("price", "id"))
+
+
+def test_decode_offset_cursor_returns_offset():
+    assert decode_offset_cursor(encode_cursor({"offset": 40})) == 40
+
+
+@pytest.mark.parametrize("values", [{}, {"offset": -1}, {"offset": "40"}, {"id": 4}])
+def test_decode_offset_cursor_rejects_invalid_cursor(values):
+    with pytest.raises(InvalidCursorError):
+        decode_offset_cursor(encode_cursor(values))
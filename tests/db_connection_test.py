@@ -1,5 +1,16 @@
 from unittest.mock import patch, MagicMock
-from app.database.db_connection import create_connection, close_connection
+
+import psycopg2.extensions
+import pytest
+
+from app.database.db_connection import (
+    ConnectionPool,
+    PoolClosedError,
+    PoolTimeoutError,
+    close_connection,
+    close_pool,
+    create_connection,
+)
 
 
 @patch("app.database.db_connection.psycopg2.connect")
@@ -26,3 +37,125 @@ def test_connection_closed_successfully():
 
 def test_close_connection_with_none_does_nothing():
     close_connection(None)
+
+
+##################################################################### Tests for ConnectionPool ########################################################################
+
+
+def make_connection():
+    connection = MagicMock()
+    connection.closed = 0
+    connection.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    )
+    return connection
+
+
+def test_pool_open_creates_min_size_connections():
+    pool = ConnectionPool(min_size=2, max_size=4, connect=make_connection)
+    pool.open()
+
+    stats = pool.stats()
+
+    assert stats.size == 2
+    assert stats.idle == 2
+    assert stats.in_use == 0
+
+
+def test_pool_reuses_returned_connection():
+    connect = MagicMock(side_effect=make_connection)
+    pool = ConnectionPool(min_size=0, max_size=2, connect=connect)
+
+    with pool.connection() as first:
+        assert pool.stats().in_use == 1
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert connect.call_count == 1
+    assert pool.stats().checkouts == 2
+
+
+def test_pool_times_out_when_exhausted():
+    pool = ConnectionPool(min_size=0, max_size=1, timeout=0.01, connect=make_connection)
+
+    with pool.connection():
+        with pytest.raises(PoolTimeoutError, match="after 0.02s"):
+            pool.checkout(timeout=0.02)
+
+    stats = pool.stats()
+    assert stats.timeouts == 1
+    assert stats.in_use == 0
+
+
+def test_pool_rolls_back_on_exception():
+    connection = make_connection()
+    pool = ConnectionPool(min_size=0, max_size=1, connect=lambda: connection)
+
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("boom")
+
+    connection.rollback.assert_called_once()
+    assert pool.stats().idle == 1
+
+
+def test_pool_discards_connection_failing_health_check():
+    broken = make_connection()
+    broken.cursor.return_value.execute.side_effect = Exception("server closed")
+    healthy = make_connection()
+    pool = ConnectionPool(
+        min_size=0,
+        max_size=1,
+        health_check_after=0,
+        connect=MagicMock(side_effect=[broken, healthy]),
+    )
+    pool.checkin(pool.checkout())
+
+    with pool.connection() as connection:
+        assert connection is healthy
+
+    broken.close.assert_called_once()
+    assert pool.stats().discarded == 1
+
+
+def test_pool_discards_broken_connection_without_waiting_for_health_check():
+    broken = make_connection()
+    healthy = make_connection()
+    pool = ConnectionPool(
+        min_size=0, max_size=1, connect=MagicMock(side_effect=[broken, healthy])
+    )
+    pool.checkin(pool.checkout())
+    broken.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+    )
+
+    with pool.connection() as connection:
+        assert connection is healthy
+
+    broken.cursor.assert_not_called()
+    assert pool.stats().discarded == 1
+
+
+def test_pool_checkout_after_close_raises():
+    pool = ConnectionPool(min_size=0, max_size=1, connect=make_connection)
+    close_pool(pool)
+
+    with pytest.raises(PoolClosedError):
+        pool.checkout()
+
+
+def test_pool_returns_connection_when_generator_is_closed_early():
+    pool = ConnectionPool(min_size=0, max_size=1, connect=make_connection)
+
+    def rows():
+        with pool.connection():
+            yield 1
+            yield 2
+
+    iterator = rows()
+    next(iterator)
+    iterator.close()
+
+    assert pool.stats().in_use == 0
+    assert pool.stats().idle == 1
@@ -0,0 +1,26 @@
+import pytest
+
+from app.util.etag import etag_matches, make_etag
+
+
+def test_make_etag_is_strong_and_stable():
+    etag = make_etag(b'{"id":1}')
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(b'{"id":1}')
+    assert etag != make_etag(b'{"id":2}')
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ("*", True),
+        ('"other"', False),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, '"abc"') is expected
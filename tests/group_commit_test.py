@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.database.group_commit import (
+    AsyncGroupCommitWriter,
+    GroupCommitClosedError,
+    GroupCommitWriter,
+)
+
+
+def failing_execute(query, params=None, **kwargs):
+    if params and params[0] == "bad":
+        raise ValueError("value too long")
+
+
+@pytest.fixture
+def mock_cursor():
+    cursor = MagicMock()
+    cursor.execute.side_effect = failing_execute
+    cursor.fetchone.side_effect = lambda: ("row",)
+    return cursor
+
+
+@pytest.fixture
+def mock_connection(mock_cursor):
+    connection = MagicMock()
+    connection.cursor.return_value = mock_cursor
+    return connection
+
+
+@pytest.fixture
+def mock_pool(mock_connection):
+    pool = MagicMock()
+    pool.connection.return_value.__enter__.return_value = mock_connection
+    return pool
+
+
+##################################################################### Tests for GroupCommitWriter ########################################################################
+
+
+def test_group_commit_writer_commits_concurrent_writes_once(mock_pool, mock_connection):
+    writer = GroupCommitWriter(mock_pool, max_batch=3, max_wait=5)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        rows = list(
+            executor.map(
+                lambda name: writer.submit("article_delete", (name,)), ["a", "b", "c"]
+            )
+        )
+    writer.close()
+
+    assert rows == [("row",)] * 3
+    mock_connection.commit.assert_called_once()
+    stats = writer.stats()
+    assert (stats.batches, stats.writes, stats.largest_batch) == (1, 3, 3)
+
+
+def test_group_commit_writer_fails_only_rejected_write(mock_pool, mock_cursor):
+    writer = GroupCommitWriter(mock_pool, max_batch=2, max_wait=5)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        good = executor.submit(writer.submit, "article_delete", ("good",))
+        bad = executor.submit(writer.submit, "article_delete", ("bad",))
+        assert good.result() == ("row",)
+        with pytest.raises(ValueError):
+            bad.result()
+    writer.close()
+
+    executed = [call.args[0] for call in mock_cursor.execute.call_args_list]
+    assert executed.count("ROLLBACK TO SAVEPOINT group_write") == 1
+    assert writer.stats().failed == 1
+
+
+def test_group_commit_writer_fails_whole_batch_when_commit_fails(
+    mock_pool, mock_connection
+):
+    mock_connection.commit.side_effect = Exception("Connection lost")
+    writer = GroupCommitWriter(mock_pool, max_batch=1)
+
+    with pytest.raises(Exception, match="Connection lost"):
+        writer.submit("article_delete", ("a",))
+    writer.close()
+
+    with pytest.raises(GroupCommitClosedError):
+        writer.submit("article_delete", ("a",))
+
+
+##################################################################### Tests for AsyncGroupCommitWriter ########################################################################
+
+
+def test_async_group_commit_writer_batches_until_max_batch():
+    cursor = MagicMock()
+    cursor.execute = AsyncMock(side_effect=failing_execute)
+    cursor.fetchone = AsyncMock(return_value=("row",))
+    connection = MagicMock()
+    connection.cursor.return_value = cursor
+    connection.commit = AsyncMock()
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__.return_value = connection
+    writer = AsyncGroupCommitWriter(pool, max_batch=2, max_wait=0.05)
+
+    async def main():
+        results = await asyncio.gather(
+            writer.submit("article_delete", ("good",)),
+            writer.submit("article_delete", ("bad",)),
+            writer.submit("article_delete", ("late",)),
+            return_exceptions=True,
+        )
+        await writer.close()
+        return results
+
+    good, bad, late = asyncio.run(main())
+
+    assert good == late == ("row",)
+    assert isinstance(bad, ValueError)
+    assert connection.commit.await_count == 2
+    assert writer.stats().batches == 2
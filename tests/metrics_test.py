@@ -0,0 +1,111 @@
+import asyncio
+import threading
+
+from starlette.testclient import TestClient
+
+from app.main import app
+from app.models.stats.single_flight_stats_model import SingleFlightStatsModel
+from app.util.metrics import (
+    SERVICE_DURATION,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    StatsCollector,
+    timed,
+)
+
+
+##################################################################### Tests for metric types ########################################################################
+
+
+def test_counter_sums_increments_from_all_threads():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("requests_total", "Requests", ("route",)))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(("/a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{route="/a"} 4000\n'
+    )
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    histogram = registry.register(
+        Histogram("duration_seconds", "Duration", ("route",), buckets=(0.1, 1.0))
+    )
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(('/"x"',), value)
+
+    assert registry.render().splitlines()[2:] == [
+        'duration_seconds_bucket{route="/\\"x\\"",le="0.1"} 2',
+        'duration_seconds_bucket{route="/\\"x\\"",le="1.0"} 3',
+        'duration_seconds_bucket{route="/\\"x\\"",le="+Inf"} 4',
+        'duration_seconds_sum{route="/\\"x\\""} 3.65',
+        'duration_seconds_count{route="/\\"x\\""} 4',
+    ]
+
+
+def test_stats_collector_publishes_numeric_fields_as_gauges():
+    registry = MetricsRegistry()
+    registry.register(
+        StatsCollector(
+            "pyshop_single_flight",
+            "Coalesced reads",
+            lambda: SingleFlightStatsModel(
+                requests=3, executions=1, collapsed=2, in_flight=0
+            ),
+        )
+    )
+
+    assert "pyshop_single_flight_collapsed 2" in registry.render().splitlines()
+
+
+##################################################################### Tests for timed ########################################################################
+
+
+def test_timed_records_sync_and_async_calls():
+    @timed("test")
+    def blocking():
+        return 1
+
+    @timed("test")
+    async def awaiting():
+        return 2
+
+    assert blocking() == 1
+    assert asyncio.run(awaiting()) == 2
+
+    samples = {(labels, value) for _, labels, value in SERVICE_DURATION.collect()}
+    assert (((("service", "test"), ("method", "blocking"))), 1) in samples
+    assert (((("service", "test"), ("method", "awaiting"))), 1) in samples
+
+
+##################################################################### Tests for /metrics ########################################################################
+
+
+def test_metrics_endpoint_labels_requests_by_route_template():
+    client = TestClient(app)
+    client.get("/health")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'pyshop_http_requests_total{method="GET",route="/health",status="200"}'
+        in response.text
+    )
+    assert 'route="unmatched",status="404"' in response.text
+    assert "pyshop_offload_workers" in response.text
@@ -0,0 +1,118 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from starlette.responses import StreamingResponse
+
+from app.util.offload import (
+    AdmittedResponse,
+    Offload,
+    OffloadRejectedError,
+    StreamLimit,
+)
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+##################################################################### Tests for Offload ########################################################################
+
+
+def test_offload_runs_call_on_worker_thread_with_context():
+    offload = Offload(workers=2, queue_size=0)
+
+    def blocking(value):
+        return value, request_id.get(), threading.current_thread().name
+
+    async def main():
+        request_id.set("abc")
+        return await offload.run(blocking, 42)
+
+    value, context_value, thread = asyncio.run(main())
+    offload.close()
+
+    assert (value, context_value) == (42, "abc")
+    assert thread.startswith("offload")
+    assert offload.stats().completed == 1
+
+
+def test_offload_rejects_calls_beyond_workers_and_queue():
+    offload = Offload(workers=1, queue_size=1)
+    release = threading.Event()
+
+    async def main():
+        admitted = [
+            asyncio.ensure_future(offload.run(release.wait, 5)) for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        with pytest.raises(OffloadRejectedError):
+            await offload.run(release.wait, 5)
+        stats = offload.stats()
+        release.set()
+        await asyncio.gather(*admitted)
+        return stats
+
+    stats = asyncio.run(main())
+    offload.close()
+
+    assert (stats.running, stats.queued, stats.rejected) == (1, 1, 1)
+    assert offload.stats().completed == 2
+    assert offload.stats().queued == 0
+
+
+def test_offload_propagates_exceptions():
+    offload = Offload(workers=1, queue_size=0)
+
+    def failing():
+        raise ValueError("Database error")
+
+    with pytest.raises(ValueError):
+        asyncio.run(offload.run(failing))
+    offload.close()
+
+    assert offload.stats().running == 0
+
+
+##################################################################### Tests for StreamLimit ########################################################################
+
+
+def test_stream_limit_rejects_streams_beyond_limit_until_released():
+    streams = StreamLimit(limit=1)
+
+    streams.admit()
+    with pytest.raises(OffloadRejectedError):
+        streams.admit()
+    streams.release()
+    streams.admit()
+    streams.close()
+
+    stats = streams.stats()
+    assert (stats.open, stats.admitted, stats.rejected) == (1, 2, 1)
+
+
+def test_admitted_response_releases_slot_when_client_goes_away():
+    streams = StreamLimit(limit=1)
+    sent = []
+
+    def body():
+        while True:
+            yield b"chunk"
+
+    async def send(message):
+        sent.append(message)
+        # The slot stays taken while the body is sent
+        assert streams.stats().open == 1
+        await asyncio.sleep(0.01)
+
+    async def receive():
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    streams.admit()
+    response = AdmittedResponse(StreamingResponse(body()), streams.release)
+    asyncio.run(response({"type": "http"}, receive, send))
+    streams.close()
+
+    assert sent[1]["body"] == b"chunk"
+    assert streams.stats().open == 0
+    assert streams.stats().completed == 1
@@ -0,0 +1,180 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import psycopg
+import psycopg2.errors
+import psycopg2.extensions
+import pytest
+
+from app.database import prepared_statements
+from app.database.prepared_statements import (
+    PLAIN_STATEMENTS,
+    PreparingConnection,
+    execute_prepared,
+    execute_prepared_async,
+    invalidate_prepared_statements,
+)
+
+
+@pytest.fixture
+def preparing_cursor():
+    connection = MagicMock(spec=PreparingConnection)
+    connection.prepared = set()
+    connection.prepared_generation = prepared_statements.prepared_generation()
+    connection.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    )
+    cursor = MagicMock()
+    cursor.connection = connection
+    return cursor
+
+
+def executed(cursor) -> list[str]:
+    return [call.args[0] for call in cursor.execute.call_args_list]
+
+
+def test_plain_statements_use_positional_placeholders():
+    assert PLAIN_STATEMENTS["article_update"].startswith(
+        "UPDATE articles SET first_name = %s, last_name = %s, imageUrl = %s, price = %s WHERE id = %s"
+    )
+    assert "$" not in "".join(PLAIN_STATEMENTS.values())
+
+
+def test_execute_prepared_runs_plain_sql_on_other_connections():
+    cursor = MagicMock()
+
+    execute_prepared(cursor, "article_get", (1,))
+
+    cursor.execute.assert_called_once_with(PLAIN_STATEMENTS["article_get"], (1,))
+
+
+def test_execute_prepared_prepares_once_per_connection(preparing_cursor):
+    execute_prepared(preparing_cursor, "article_get", (1,))
+    execute_prepared(preparing_cursor, "article_get", (2,))
+
+    assert executed(preparing_cursor) == [
+        "PREPARE article_get AS SELECT id, imageUrl, first_name, last_name, price FROM articles WHERE id = $1",
+        "EXECUTE article_get(%s)",
+        "EXECUTE article_get(%s)",
+    ]
+
+
+def test_execute_prepared_deallocates_after_invalidation(preparing_cursor):
+    execute_prepared(preparing_cursor, "article_list_all")
+    invalidate_prepared_statements()
+    execute_prepared(preparing_cursor, "article_list_all")
+
+    assert executed(preparing_cursor)[2:] == [
+        "DEALLOCATE ALL",
+        "PREPARE article_list_all AS SELECT id, imageUrl, first_name, last_name, price FROM articles ORDER BY id",
+        "EXECUTE article_list_all",
+    ]
+
+
+def test_execute_prepared_prepares_again_when_cached_plan_is_stale(preparing_cursor):
+    preparing_cursor.connection.prepared.add("article_get")
+    preparing_cursor.execute.side_effect = [
+        psycopg2.errors.FeatureNotSupported("cached plan must not change result type"),
+        None,
+        None,
+        None,
+    ]
+
+    execute_prepared(preparing_cursor, "article_get", (1,))
+
+    preparing_cursor.connection.rollback.assert_called_once()
+    assert executed(preparing_cursor)[1:3] == [
+        "DEALLOCATE article_get",
+        "PREPARE article_get AS SELECT id, imageUrl, first_name, last_name, price FROM articles WHERE id = $1",
+    ]
+
+
+def test_execute_prepared_retries_first_statement_after_invalidation(
+    preparing_cursor,
+):
+    connection = preparing_cursor.connection
+    stale = psycopg2.errors.FeatureNotSupported(
+        "cached plan must not change result type"
+    )
+
+    def execute(sql, params=None):
+        # DEALLOCATE ALL opens a transaction like any other statement
+        connection.get_transaction_status.return_value = (
+            psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+        if sql.startswith("EXECUTE") and stale.args:
+            error, stale.args = stale, ()
+            raise error
+
+    preparing_cursor.execute.side_effect = execute
+    invalidate_prepared_statements()
+
+    execute_prepared(preparing_cursor, "article_get", (1,))
+
+    connection.rollback.assert_called_once()
+    assert executed(preparing_cursor)[-1] == "EXECUTE article_get(%s)"
+
+
+def test_execute_prepared_drops_stale_statement_inside_open_transaction(
+    preparing_cursor,
+):
+    connection = preparing_cursor.connection
+    connection.prepared.add("article_get")
+    connection.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    )
+    preparing_cursor.execute.side_effect = psycopg2.errors.FeatureNotSupported(
+        "cached plan must not change result type"
+    )
+
+    with pytest.raises(psycopg2.errors.FeatureNotSupported):
+        execute_prepared(preparing_cursor, "article_get", (1,))
+
+    connection.rollback.assert_not_called()
+    assert "article_get" not in connection.prepared
+
+    # The caller rolled back its transaction, the next use starts afresh
+    connection.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    )
+    preparing_cursor.execute.side_effect = None
+    preparing_cursor.execute.reset_mock()
+    execute_prepared(preparing_cursor, "article_get", (1,))
+
+    assert executed(preparing_cursor)[:2] == [
+        "DEALLOCATE ALL",
+        "PREPARE article_get AS SELECT id, imageUrl, first_name, last_name, price FROM articles WHERE id = $1",
+    ]
+
+
+def test_execute_prepared_async_asks_psycopg_to_prepare():
+    cursor = AsyncMock()
+
+    asyncio.run(execute_prepared_async(cursor, "article_delete", (3,)))
+
+    cursor.execute.assert_awaited_once_with(
+        PLAIN_STATEMENTS["article_delete"], (3,), prepare=True
+    )
+
+
+def test_execute_prepared_async_deallocates_after_stale_plan_in_transaction():
+    cursor = AsyncMock()
+    connection = cursor.connection
+    connection.info.transaction_status = psycopg.pq.TransactionStatus.INTRANS
+    cursor.execute.side_effect = psycopg.errors.FeatureNotSupported(
+        "cached plan must not change result type"
+    )
+
+    with pytest.raises(psycopg.errors.FeatureNotSupported):
+        asyncio.run(execute_prepared_async(cursor, "article_get", (1,)))
+    connection.rollback.assert_not_awaited()
+
+    connection.info.transaction_status = psycopg.pq.TransactionStatus.IDLE
+    cursor.execute.side_effect = None
+    cursor.execute.reset_mock()
+    asyncio.run(execute_prepared_async(cursor, "article_get", (1,)))
+
+    assert [call.args[0] for call in cursor.execute.await_args_list] == [
+        "DEALLOCATE ALL",
+        PLAIN_STATEMENTS["article_get"],
+    ]
@@ -0,0 +1,114 @@
+import psycopg2
+import pytest
+
+from app.database import query_log
+from app.database.db_connection import DATABASE_CONFIG
+from app.database.query_log import InstrumentedCursor, QueryLog, statement_kind
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+##################################################################### Tests for statement_kind ########################################################################
+
+
+@pytest.mark.parametrize(
+    "statement, kind",
+    [
+        ("SELECT 1", "read"),
+        ("EXECUTE article_get(%s)", "read"),
+        ("EXECUTE article_insert(%s, %s, %s, %s)", "write"),
+        ("WITH query AS (SELECT 1) SELECT * FROM query", "read"),
+        ("WITH upserted AS (INSERT INTO articles DEFAULT VALUES) SELECT 1", "write"),
+        ("DELETE FROM articles WHERE id = %s", "write"),
+        ("PREPARE article_get AS SELECT 1", "other"),
+        ("SAVEPOINT bulk_article", "other"),
+    ],
+)
+def test_statement_kind(statement, kind):
+    assert statement_kind(statement) == kind
+
+
+##################################################################### Tests for QueryLog ########################################################################
+
+
+def test_query_log_aggregates_duration_and_rows_per_statement():
+    log = QueryLog(slow_threshold=1.0)
+
+    assert log.record("SELECT 1", 0.2, 3) == (False, False)
+    assert log.record("SELECT 1", 0.4, 5) == (False, False)
+
+    (stats,) = log.stats().statements
+    assert (stats.calls, stats.total_time, stats.max_time, stats.rows) == (
+        2,
+        pytest.approx(0.6),
+        0.4,
+        8,
+    )
+
+
+def test_query_log_rate_limits_plan_capture():
+    clock = FakeClock()
+    log = QueryLog(slow_threshold=0.1, explain_interval=10.0, clock=clock)
+
+    assert log.record("PREPARE x AS SELECT 1", 0.5, -1, False) == (True, False)
+    assert log.record("SELECT 1", 0.5, 1, True) == (True, True)
+    assert log.record("SELECT 1", 0.5, 1, True) == (True, False)
+    clock.now = 10.0
+    assert log.record("SELECT 1", 0.5, 1, True) == (True, True)
+    assert log.stats().slow_queries == 4
+
+
+def test_query_log_keeps_only_top_n_slowest():
+    log = QueryLog(slow_threshold=0.1, top_n=2)
+
+    for duration in (0.3, 0.1, 0.5, 0.2):
+        log.slow(f"SELECT {duration}", duration, 1)
+
+    assert [entry.duration for entry in log.stats().slowest] == [0.5, 0.3]
+
+
+##################################################################### InstrumentedCursor against a real database ########################################################################
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    try:
+        connection = psycopg2.connect(
+            **DATABASE_CONFIG, connect_timeout=2, cursor_factory=InstrumentedCursor
+        )
+    except psycopg2.OperationalError:
+        pytest.skip("No database available")
+    monkeypatch.setattr(query_log, "QUERY_LOG", QueryLog(slow_threshold=0.0))
+    yield connection
+    connection.rollback()
+    connection.close()
+
+
+def test_instrumented_cursor_captures_plan_of_slow_select(connection):
+    cursor = connection.cursor()
+
+    cursor.execute("SELECT n FROM generate_series(1, %s) AS n", (3,))
+
+    assert cursor.fetchall() == [(1,), (2,), (3,)]
+    (slow,) = query_log.QUERY_LOG.stats().slowest
+    assert slow.rows == 3
+    assert "Function Scan" in slow.plan
+    assert "actual time" in slow.plan
+
+
+def test_instrumented_cursor_never_explains_writes(connection):
+    cursor = connection.cursor()
+
+    cursor.execute("CREATE TEMPORARY TABLE query_log_test (id int)")
+    cursor.execute("INSERT INTO query_log_test VALUES (1)")
+    cursor.execute("SELECT count(*) FROM query_log_test")
+
+    assert cursor.fetchone() == (1,)
+    plans = {slow.statement: slow.plan for slow in query_log.QUERY_LOG.stats().slowest}
+    assert plans["INSERT INTO query_log_test VALUES (1)"] is None
@@ -0,0 +1,26 @@
+from app.cache.rendered_cache import RenderedResponseCache
+
+
+def test_rendered_cache_returns_entry_for_same_source_object():
+    cache = RenderedResponseCache()
+    source = object()
+    cache.set(1, source, b"{}", '"etag"')
+
+    assert cache.get(1, source) == (b"{}", '"etag"')
+
+
+def test_rendered_cache_misses_for_replaced_source_object():
+    cache = RenderedResponseCache()
+    cache.set(1, object(), b"{}", '"etag"')
+
+    assert cache.get(1, object()) is None
+
+
+def test_rendered_cache_is_bounded():
+    cache = RenderedResponseCache(max_size=1)
+    first, second = object(), object()
+    cache.set(1, first, b"1", '"1"')
+    cache.set(2, second, b"2", '"2"')
+
+    assert cache.get(1, first) is None
+    assert cache.get(2, second) == (b"2", '"2"')
@@ -0,0 +1,179 @@
+from unittest.mock import MagicMock
+
+import psycopg2
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.cache.article_cache import InMemoryArticleCache
+from app.database.replicas import (
+    PRIMARY_COOKIE,
+    Replica,
+    ReplicaRouter,
+    ReadYourWritesMiddleware,
+    note_write,
+    pinned_to_primary,
+    replica_name,
+)
+from app.services.articles_service import ArticlesService
+from app.storage.postgres_storage import PostgresArticleStorage
+
+
+def mock_pool(name: str, lag: float = 0.0):
+    connection = MagicMock(name=name)
+    connection.cursor.return_value.fetchone.return_value = (lag,)
+    pool = MagicMock()
+    pool.connection.return_value.__enter__.return_value = connection
+    pool.checkout.return_value = connection
+    return pool
+
+
+@pytest.fixture
+def primary():
+    return mock_pool("primary")
+
+
+@pytest.fixture
+def router(primary):
+    router = ReplicaRouter(
+        primary,
+        [Replica("a", mock_pool("a")), Replica("b", mock_pool("b", lag=0.5))],
+        max_lag=1.0,
+    )
+    router.check()
+    return router
+
+
+def read(router) -> str:
+    with router.connection() as connection:
+        return connection._mock_name
+
+
+##################################################################### Tests for ReplicaRouter ########################################################################
+
+
+def test_router_reads_from_replicas_round_robin(router):
+    assert [read(router) for _ in range(4)] == ["a", "b", "a", "b"]
+    assert router.stats().replica_reads == 4
+    assert router.stats().primary_reads == 0
+
+
+def test_router_takes_lagging_and_failing_replicas_out_of_rotation(router):
+    router.replicas[0].pool.connection.side_effect = psycopg2.OperationalError("down")
+    replica_connection = router.replicas[1].pool.connection.return_value.__enter__()
+    replica_connection.cursor.return_value.fetchone.return_value = (3.0,)
+    router.check()
+
+    assert [read(router) for _ in range(2)] == ["primary", "primary"]
+    stats = router.stats()
+    assert stats.healthy == 0
+    assert stats.replicas[0].last_error == "down"
+    assert stats.replicas[1].last_error == "3.0s behind the primary"
+
+    router.replicas[0].pool.connection.side_effect = None
+    router.check()
+
+    assert read(router) == "a"
+
+
+def test_router_falls_back_to_primary_when_replica_fails(router):
+    router.replicas[0].pool.checkout.side_effect = psycopg2.OperationalError("gone")
+
+    assert read(router) == "primary"
+    assert read(router) == "b"
+    assert read(router) == "b"
+    assert router.stats().fallbacks == 1
+    assert router.stats().replicas[0].failures == 1
+
+
+def test_router_marks_replica_down_when_query_loses_connection(router):
+    with pytest.raises(psycopg2.OperationalError):
+        with router.connection():
+            raise psycopg2.OperationalError("server closed the connection")
+
+    replica = router.replicas[0]
+    replica.pool.checkin.assert_called_once_with(
+        replica.pool.checkout.return_value, rollback=True
+    )
+    assert not replica.healthy
+
+
+def test_replica_name_leaves_out_password():
+    assert (
+        replica_name("host=replica1 port=5433 dbname=PyShop password=secret")
+        == "replica1:5433/PyShop"
+    )
+
+
+##################################################################### Tests for read-your-writes ########################################################################
+
+
+def test_clients_read_from_primary_after_their_writes(router):
+    def write(request):
+        note_write()
+        return JSONResponse({"pinned": pinned_to_primary(), "read": read(router)})
+
+    def get(request):
+        return JSONResponse({"pinned": pinned_to_primary(), "read": read(router)})
+
+    app = ReadYourWritesMiddleware(
+        Starlette(routes=[Route("/write", write), Route("/read", get)]), window=60
+    )
+    client = TestClient(app)
+    other = TestClient(app)
+
+    assert client.get("/read").json() == {"pinned": False, "read": "a"}
+    response = client.get("/write")
+    assert response.json() == {"pinned": True, "read": "primary"}
+    assert PRIMARY_COOKIE in response.headers["set-cookie"]
+    assert client.get("/read").json() == {"pinned": True, "read": "primary"}
+    assert other.get("/read").json() == {"pinned": False, "read": "b"}
+    assert router.stats().pinned_reads == 2
+
+
+def test_clients_cannot_pin_themselves_past_the_window(router):
+    def get(request):
+        return JSONResponse({"pinned": pinned_to_primary()})
+
+    app = ReadYourWritesMiddleware(Starlette(routes=[Route("/read", get)]), window=0)
+    client = TestClient(app, cookies={PRIMARY_COOKIE: "1e18"})
+
+    assert client.get("/read").json() == {"pinned": False}
+
+
+##################################################################### Tests for PostgresArticleStorage with replicas ########################################################################
+
+
+def test_storage_reads_from_replicas_and_writes_to_primary(router, primary):
+    storage = PostgresArticleStorage(primary, replicas=router)
+    replica_cursor = router.replicas[0].pool.checkout.return_value.cursor.return_value
+    replica_cursor.fetchone.return_value = (1, "", "John", "Doe", 1.0)
+    primary_cursor = primary.connection.return_value.__enter__.return_value.cursor()
+    primary_cursor.fetchone.return_value = (1, "", "John", "Doe", 2.0)
+
+    assert storage.get(1) == (1, "", "John", "Doe", 1.0)
+    assert storage.update(1, ("John", "Doe", "", 2.0)) == (1, "", "John", "Doe", 2.0)
+    assert router.stats().primary_reads == 0
+    primary.connection.return_value.__enter__.return_value.commit.assert_called_once()
+
+
+def test_service_does_not_cache_rows_read_from_replicas(router, primary):
+    replica_cursor = router.replicas[0].pool.checkout.return_value.cursor.return_value
+    replica_cursor.fetchone.return_value = (1, "", "John", "Doe", 1.0)
+    cache = InMemoryArticleCache()
+    service = ArticlesService(
+        primary, cache, storage=PostgresArticleStorage(primary, replicas=router)
+    )
+
+    assert service.get_article(1).first_name == "John"
+    assert cache.get(1) is None
+
+    primary_cursor = primary.connection.return_value.__enter__.return_value.cursor()
+    primary_cursor.fetchone.return_value = (2, "", "Jane", "Doe", 1.0)
+    for replica in router.replicas:
+        replica.healthy = False
+
+    assert service.get_article(2).first_name == "Jane"
+    assert cache.get(2).first_name == "Jane"
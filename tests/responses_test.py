@@ -0,0 +1,27 @@
+import json
+
+from starlette.responses import JSONResponse
+
+from app.models.dto.article_model_dto import ArticleModelDTO, ArticlesModelDTO
+from app.util.responses import ModelResponse, dump_model
+
+
+def test_model_response_writes_pydantic_json_bytes():
+    article = ArticleModelDTO(id=1, first_name="Jöhn", last_name="Doe", price=100)
+
+    response = ModelResponse(content=article, status_code=201)
+
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert response.body == dump_model(article)
+    assert response.headers["content-length"] == str(len(response.body))
+
+
+def test_model_response_matches_json_round_trip_output():
+    articles = ArticlesModelDTO(
+        articles=[ArticleModelDTO(id=1, first_name="Jöhn", last_name="Doe", price=1)]
+    )
+
+    round_trip = JSONResponse(content=json.loads(articles.model_dump_json()))
+
+    assert ModelResponse(content=articles).body == round_trip.body
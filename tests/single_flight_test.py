@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.cache.single_flight import AsyncSingleFlight, SingleFlight
+
+
+##################################################################### Tests for SingleFlight ########################################################################
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def query(id):
+        calls.append(id)
+        started.set()
+        release.wait(5)
+        return {"id": id}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(single_flight.do, ("article", 1), query, 1)
+        started.wait(5)
+        followers = [
+            executor.submit(single_flight.do, ("article", 1), query, 1)
+            for _ in range(3)
+        ]
+        deadline = time.monotonic() + 5
+        while single_flight.stats().collapsed < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats().model_dump() == {
+        "requests": 4,
+        "executions": 1,
+        "collapsed": 3,
+        "in_flight": 0,
+    }
+
+
+def test_single_flight_shares_errors_and_runs_again_afterwards():
+    single_flight = SingleFlight()
+
+    def failing():
+        raise ValueError("Database error")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", failing)
+
+    assert single_flight.do("key", lambda: 42) == 42
+    assert single_flight.stats().executions == 2
+
+
+##################################################################### Tests for AsyncSingleFlight ########################################################################
+
+
+def test_async_single_flight_collapses_identical_keys_only():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def query(id):
+        calls.append(id)
+        await asyncio.sleep(0.01)
+        return id
+
+    async def main():
+        return await asyncio.gather(
+            *[single_flight.do(("article", id), query, id) for id in (1, 1, 2, 1)]
+        )
+
+    assert asyncio.run(main()) == [1, 1, 2, 1]
+    assert sorted(calls) == [1, 2]
+    assert single_flight.stats().collapsed == 2
+    assert single_flight.stats().in_flight == 0
+
+
+def test_async_single_flight_survives_cancelled_caller():
+    single_flight = AsyncSingleFlight()
+
+    async def query():
+        await asyncio.sleep(0.01)
+        return "rows"
+
+    async def main():
+        first = asyncio.ensure_future(single_flight.do("key", query))
+        second = asyncio.ensure_future(single_flight.do("key", query))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "rows"